@@ -2,20 +2,14 @@
 
 from django.db import models
 from django.utils import timezone
-from imagekit.models import ImageSpecField
-from imagekit.processors import ResizeToFill
+
+from hr_storage.fields import ContentAddressedImageField
 
 
 class CarouselSlide(models.Model):
     title = models.CharField(max_length=255)
     caption = models.TextField(blank=True)
-    image = models.ImageField(upload_to="hr_about/")
-    image_thumb = ImageSpecField(
-        source="image",
-        processors=[ResizeToFill(220, 220)],
-        format="JPEG",
-        options={"quality": 80}
-    )
+    image = ContentAddressedImageField(upload_to="hr_about/")
     order = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(default=timezone.now)
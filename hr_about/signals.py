@@ -18,3 +18,4 @@ def enqueue_about_slide_variants(sender, instance: CarouselSlide, **kwargs):
         return
 
     schedule_image_variants("about", instance.image.name)
+    schedule_image_variants("about_thumb", instance.image.name)
@@ -7,16 +7,24 @@ from django.shortcuts import render
 
 from hr_about.models import CarouselSlide, PullQuote
 from hr_common.utils.unified_logging import log_event
+from hr_core.fragment_cache import cached_fragment
+from hr_core.srcset_registry import registry
 
 logger = logging.getLogger(__name__)
 
 
+@cached_fragment("about.carousel")
 def get_carousel_partial(request):
-    slides = CarouselSlide.objects.filter(is_active=True).order_by("order", "id")
-    log_event(logger, logging.INFO, "about.carousel.rendered", count=slides.count(),)
+    slides = list(CarouselSlide.objects.filter(is_active=True).order_by("order", "id"))
+    # Thumbnails come from the variant manifest: one query for the whole strip, no storage probes.
+    urls = [slide.image.url for slide in slides if slide.image]
+    registry.prime("about", urls[:1])
+    registry.prime("about_thumb", urls)
+    log_event(logger, logging.INFO, "about.carousel.rendered", count=len(slides),)
     return render(request, "hr_about/_about_carousel.html", {"slides": slides})
 
 
+@cached_fragment("about.quotes")
 def get_quotes_partial(request):
     quotes = PullQuote.objects.filter(is_active=True).order_by("order", "id")
     log_event(logger, logging.INFO, "about.quotes.rendered", count=quotes.count(),)
@@ -3,6 +3,9 @@
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
+
+from hr_access.services import login_throttle
 
 User = get_user_model()
 
@@ -15,12 +18,38 @@ class CustomBackend(ModelBackend):
         ident = username.strip()
         ident_ci = ident.casefold()
 
+        # Throttled attempts never reach the hasher (hr_access.services.login_throttle).
+        if request is not None and login_throttle.is_throttled(request, ident):
+            login_throttle.note_throttled(request)
+            return None
+
         if "@" in ident:
             user = User.objects.filter(email__iexact=ident).first()
         else:
             user = User.objects.filter(username_ci=ident_ci).first()
 
-        if user and user.check_password(password) and self.user_can_authenticate(user):
+        if user is None:
+            # Hash anyway so an unknown account costs (and takes) the same as a wrong password.
+            make_password(password)
+        elif self._check_password(user, password) and self.user_can_authenticate(user):
+            if request is not None:
+                login_throttle.clear_failures(request, ident)
             return user
 
+        if request is not None:
+            login_throttle.record_failure(request, ident)
         return None
+
+    @staticmethod
+    def _check_password(user, password: str) -> bool:
+        """
+        check_password that upgrades the stored hash when the hasher or its
+        iteration count changed, without User.set_password (a rehash is not
+        a password change: password_changed_at stays put).
+        """
+
+        def rehash(raw_password):
+            user.password = make_password(raw_password)
+            user.save(update_fields=["password"])
+
+        return check_password(password, user.password, setter=rehash)
@@ -189,9 +189,20 @@ class AccountAuthenticationForm(AuthenticationForm):
     Backend determines which.
     """
 
+    error_messages = {
+        **AuthenticationForm.error_messages,
+        "throttled": _("Too many sign-in attempts. Please wait a few minutes and try again."),
+    }
+
     def clean_username(self):
         return (self.cleaned_data.get("username") or "").strip()
 
+    def get_invalid_login_error(self):
+        # Set by CustomBackend when hr_access.services.login_throttle refused the attempt.
+        if getattr(self.request, "login_throttled", False):
+            return ValidationError(self.error_messages["throttled"], code="throttled")
+        return super().get_invalid_login_error()
+
 
 # ------------------------------------------------------------
 # Admin edit form (existing users)
@@ -71,6 +71,13 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return f"{self.pk}-{self.email}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Role as loaded, so the role sync (hr_access.signals) can tell a change without re-reading the row.
+        instance._loaded_role = instance.__dict__.get("role")
+        return instance
+
     def clean(self):
         super().clean()
         norm = (self.username or "").strip().casefold()
@@ -1,26 +1,79 @@
 # hr_access/permissions.py
 
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+from hr_access.constants import GLOBAL_ADMIN_GROUP_NAME, SITE_ADMIN_GROUP_NAME
+
+SNAPSHOT_CACHE_TIMEOUT = 60 * 60
+SNAPSHOT_ATTR = "_hr_permission_snapshot"
+
+
+@dataclass(frozen=True)
+class PermissionSnapshot:
+    groups: frozenset[str]
+    is_site_admin: bool
+    is_global_admin: bool
+
+
+def _snapshot_key(user) -> str:
+    # updated_at moves on every save and on group changes (hr_access.signals), and request.user is
+    # reloaded each request, so a changed user never matches an old key, in any process.
+    stamp = int(user.updated_at.timestamp() * 1_000_000) if getattr(user, "updated_at", None) else 0
+    return f"access:perms:{user.pk}:{stamp}"
+
+
+def permission_snapshot(user) -> PermissionSnapshot:
+    """
+    Role/group facts for `user`, memoized on the instance (one request) and
+    in the cache (across requests). One group query per user per change.
+    """
+    snapshot = getattr(user, SNAPSHOT_ATTR, None)
+    if snapshot is not None:
+        return snapshot
+
+    key = _snapshot_key(user)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        groups = frozenset(user.groups.values_list("name", flat=True))
+        snapshot = PermissionSnapshot(
+            groups=groups,
+            is_site_admin=bool(user.is_superuser or getattr(user, "is_site_admin", False) or SITE_ADMIN_GROUP_NAME in groups),
+            is_global_admin=bool(getattr(user, "is_global_admin", False) or GLOBAL_ADMIN_GROUP_NAME in groups),
+        )
+        cache.set(key, snapshot, SNAPSHOT_CACHE_TIMEOUT)
+    setattr(user, SNAPSHOT_ATTR, snapshot)
+    return snapshot
+
+
+def forget_permission_snapshot(user) -> None:
+    """
+    Drop the memoized and cached snapshot for `user` (this process).
+    Other processes miss on their own once updated_at moves.
+    """
+    cache.delete(_snapshot_key(user))
+    user.__dict__.pop(SNAPSHOT_ATTR, None)
+
 
 # TODO move this into hr_core/utils/http as a decorator (and move the decorators into something like hr_core/decorators?)
 def is_site_admin(user) -> bool:
     """
     True for:
       - superusers
-      - users with custom property `is_site_admin` on your User model
-      - users in the 'Site admin' group
+      - users with the site-admin role (hr_access.User.is_site_admin)
+      - users in the site-admin group
+    Resolved through permission_snapshot(), so repeated checks cost nothing.
     """
     if not getattr(user, "is_authenticated", False):
         return False
 
-    if getattr(user, "is_superuser", False):
-        return True
-
-    # custom property on hr_access.User, if you add/use it
-    if bool(getattr(user, "is_site_admin", False)):
+    if getattr(user, "is_superuser", False) or bool(getattr(user, "is_site_admin", False)):
         return True
 
-    # group membership; Group.DoesNotExist won't be raised here, so no try/except needed
-    return user.groups.filter(name="Site admin").exists()
+    return permission_snapshot(user).is_site_admin
 
 
 #
@@ -0,0 +1,68 @@
+# hr_access/services/login_throttle.py
+
+"""
+Failed-login counters per client IP and per identifier (username/email),
+kept in the cache with a fixed window (LOGIN_THROTTLE_* settings).
+
+CustomBackend checks them before touching the password hasher, so a
+credential-stuffing burst costs a cache read per attempt once it trips the
+limit instead of a PBKDF2 run. A successful login clears the identifier's
+counter; the IP counter runs out its window.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from hr_common.utils.unified_logging import log_event
+
+logger = logging.getLogger(__name__)
+
+IP_KEY = "login_fail:ip:{}"
+IDENTIFIER_KEY = "login_fail:id:{}"
+
+
+def client_ip(request) -> str:
+    hops = getattr(settings, "TRUSTED_PROXY_COUNT", 0)
+    forwarded = [part.strip() for part in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if part.strip()]
+    if hops and len(forwarded) >= hops:
+        # Entries left of what our own proxies appended are client-controlled.
+        return forwarded[-hops]
+    return request.META.get("REMOTE_ADDR", "") or "unknown"
+
+
+def _keys(request, identifier: str) -> tuple[str, str]:
+    ident = hashlib.sha256(identifier.strip().casefold().encode("utf-8")).hexdigest()[:32]
+    return IP_KEY.format(client_ip(request)), IDENTIFIER_KEY.format(ident)
+
+
+def is_throttled(request, identifier: str) -> bool:
+    ip_key, ident_key = _keys(request, identifier)
+    counts = cache.get_many([ip_key, ident_key])
+    return counts.get(ident_key, 0) >= settings.LOGIN_THROTTLE_MAX_FAILURES_PER_IDENTIFIER or counts.get(ip_key, 0) >= settings.LOGIN_THROTTLE_MAX_FAILURES_PER_IP
+
+
+def record_failure(request, identifier: str) -> None:
+    for key in _keys(request, identifier):
+        # add() starts the window; incr() keeps its expiry.
+        cache.add(key, 0, timeout=settings.LOGIN_THROTTLE_WINDOW_SECONDS)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=settings.LOGIN_THROTTLE_WINDOW_SECONDS)
+
+
+def clear_failures(request, identifier: str) -> None:
+    cache.delete(_keys(request, identifier)[1])
+
+
+def note_throttled(request) -> None:
+    """
+    Flag the request so the login form can say why (AccountAuthenticationForm).
+    """
+    request.login_throttled = True
+    log_event(logger, logging.WARNING, "access.auth.login.throttled", ip=client_ip(request))
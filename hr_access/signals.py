@@ -11,10 +11,12 @@ from __future__ import annotations
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from django.db import transaction
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import m2m_changed, post_save
 from django.dispatch import receiver
+from django.utils import timezone
 
 from hr_access.constants import GLOBAL_ADMIN_GROUP_NAME, SITE_ADMIN_GROUP_NAME
+from hr_access.permissions import forget_permission_snapshot
 
 UserModel = get_user_model()
 
@@ -24,23 +26,6 @@ def _get_group(name: str) -> Group:
     return group
 
 
-@receiver(pre_save, sender=UserModel)
-def cache_old_role(sender, instance: UserModel, **_kwargs):
-    """
-    Cache the prior role on the instance so post_save can know if role changed
-    without an extra "old role" query after the save.
-    """
-    if not instance.pk:
-        instance._old_role = None
-        return
-
-    try:
-        old = sender.objects.only("role").get(pk=instance.pk)
-        instance._old_role = old.role
-    except sender.DoesNotExist:
-        instance._old_role = None
-
-
 @receiver(post_save, sender=UserModel)
 def sync_user_role_to_groups(sender, instance: UserModel, created: bool, update_fields=None, **_kwargs):
     """
@@ -67,13 +52,17 @@ def sync_user_role_to_groups(sender, instance: UserModel, created: bool, update_
     if update_fields is not None and "role" not in update_fields:
         return
 
-    old_role = getattr(instance, "_old_role", None)
+    # Role as loaded from the DB (User.from_db); None for instances that were not loaded.
+    old_role = getattr(instance, "_loaded_role", None)
     role_changed = created or (old_role is None) or (old_role != instance.role)
+    instance._loaded_role = instance.role
 
     # If role didn't change, skip. (Created users always sync once.)
     if not role_changed:
         return
 
+    forget_permission_snapshot(instance)
+
     site_admin_group = _get_group(SITE_ADMIN_GROUP_NAME)
     global_admin_group = _get_group(GLOBAL_ADMIN_GROUP_NAME)
 
@@ -109,3 +98,27 @@ def sync_user_role_to_groups(sender, instance: UserModel, created: bool, update_
         instance.groups.set(desired_groups)
 
     transaction.on_commit(_sync_groups)
+
+
+@receiver(m2m_changed, sender=UserModel.groups.through)
+def expire_permission_snapshots(sender, instance, action: str, reverse: bool, pk_set=None, **_kwargs):
+    """
+    Group membership feeds the cached permission snapshot
+    (hr_access.permissions). Touch updated_at on the affected users so their
+    snapshot key changes everywhere, not just in this process's cache.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    now = timezone.now()
+    if not reverse:
+        forget_permission_snapshot(instance)
+        instance.updated_at = now
+        user_ids = {instance.pk}
+    elif action == "pre_clear":
+        user_ids = set(instance.user_set.values_list("pk", flat=True))
+    else:
+        user_ids = set(pk_set or ())
+
+    if user_ids:
+        UserModel.objects.filter(pk__in=user_ids).update(updated_at=now)
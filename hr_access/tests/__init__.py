@@ -0,0 +1 @@
+# hr_access/tests/__init__.py
@@ -0,0 +1,102 @@
+# hr_access/tests/test_login_throttle.py
+
+# Tests for login throttling and hash-cost handling in CustomBackend.
+#
+# Strategy:
+#   - Logins go through the real sidebar endpoint (auth_login) so the form,
+#     backend and throttle are exercised together.
+#   - The hasher entry points imported by the backend are wrapped, so tests
+#     can see whether an attempt reached PBKDF2 at all.
+
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.urls import reverse
+
+from hr_access.models import User
+from hr_access.services.login_throttle import client_ip
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings):
+    settings.LOGIN_THROTTLE_MAX_FAILURES_PER_IDENTIFIER = 3
+    settings.LOGIN_THROTTLE_MAX_FAILURES_PER_IP = 10
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def member(db):
+    return User.objects.create_user(email="member@example.com", username="member", password="correct-horse")
+
+
+def _login(client, username, password, ip="203.0.113.7"):
+    return client.post(reverse("hr_access:auth_login"), {"username": username, "password": password}, REMOTE_ADDR=ip)
+
+
+@pytest.mark.django_db
+class TestThrottle:
+    def test_identifier_locked_after_failures_without_hashing(self, client, member):
+        for _ in range(3):
+            assert _login(client, "member", "wrong").status_code == 200
+
+        with patch("hr_access.auth_backend.check_password", wraps=check_password) as checked:
+            resp = _login(client, "member", "correct-horse")
+
+        assert resp.status_code == 200
+        assert b"Too many sign-in attempts" in resp.content
+        checked.assert_not_called()
+
+    def test_ip_limit_spans_identifiers(self, client, member, settings):
+        settings.LOGIN_THROTTLE_MAX_FAILURES_PER_IP = 2
+        _login(client, "someone", "x")
+        _login(client, "someone-else", "x")
+
+        assert b"Too many sign-in attempts" in _login(client, "member", "correct-horse").content
+        assert _login(client, "member", "correct-horse", ip="198.51.100.1").status_code == 204
+
+    def test_success_clears_identifier_failures(self, client, member):
+        _login(client, "member", "wrong")
+        _login(client, "member", "wrong")
+        assert _login(client, "member", "correct-horse").status_code == 204
+        client.logout()
+
+        _login(client, "member", "wrong")
+        _login(client, "member", "wrong")
+        assert _login(client, "member", "correct-horse").status_code == 204
+
+    def test_unknown_account_still_hashes(self, client, db):
+        with patch("hr_access.auth_backend.make_password", wraps=make_password) as hashed:
+            _login(client, "nobody-here", "whatever")
+
+        hashed.assert_called_once_with("whatever")
+
+
+@pytest.mark.django_db
+class TestRehash:
+    def test_outdated_hash_is_upgraded_without_touching_password_changed_at(self, client, member, settings):
+        settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.PBKDF2PasswordHasher", "django.contrib.auth.hashers.MD5PasswordHasher"]
+        User.objects.filter(pk=member.pk).update(password=make_password("correct-horse", hasher="md5"))
+        changed_at = User.objects.get(pk=member.pk).password_changed_at
+
+        assert _login(client, "member@example.com", "correct-horse").status_code == 204
+
+        member.refresh_from_db()
+        assert member.password.startswith("pbkdf2_sha256$")
+        assert member.password_changed_at == changed_at
+
+
+class TestClientIp:
+    def test_uses_entry_appended_by_trusted_proxy(self, settings):
+        settings.TRUSTED_PROXY_COUNT = 1
+        request = RequestFactory().post("/", HTTP_X_FORWARDED_FOR="10.9.9.9, 203.0.113.7", REMOTE_ADDR="172.18.0.2")
+        assert client_ip(request) == "203.0.113.7"
+
+    def test_ignores_header_without_proxy(self, settings):
+        settings.TRUSTED_PROXY_COUNT = 0
+        request = RequestFactory().post("/", HTTP_X_FORWARDED_FOR="10.9.9.9", REMOTE_ADDR="172.18.0.2")
+        assert client_ip(request) == "172.18.0.2"
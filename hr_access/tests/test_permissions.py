@@ -0,0 +1,77 @@
+# hr_access/tests/test_permissions.py
+
+# Tests for the cached permission snapshot and the role -> group sync.
+#
+# Strategy:
+#   - The default LocMemCache stands in for the shared cache; it is cleared
+#     per test so snapshots never leak between tests.
+#   - Query counts are asserted directly: the point of the snapshot is that
+#     repeated checks and role-neutral saves issue no extra queries.
+
+import pytest
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+
+from hr_access.constants import SITE_ADMIN_GROUP_NAME
+from hr_access.models import User
+from hr_access.permissions import is_site_admin, permission_snapshot
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def member(db, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        user = User.objects.create_user(email="member@example.com", username="member", password="pw")
+    return User.objects.get(pk=user.pk)
+
+
+@pytest.mark.django_db
+class TestPermissionSnapshot:
+    def test_repeated_checks_query_once(self, member, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            assert is_site_admin(member) is False
+            assert is_site_admin(member) is False
+
+        # Next request: a fresh instance of the unchanged user is served from the cache.
+        reloaded = User.objects.get(pk=member.pk)
+        with django_assert_num_queries(0):
+            assert is_site_admin(reloaded) is False
+
+    def test_group_change_expires_cached_snapshot(self, member):
+        assert permission_snapshot(member).is_site_admin is False
+
+        Group.objects.get_or_create(name=SITE_ADMIN_GROUP_NAME)[0].user_set.add(member)
+
+        assert is_site_admin(User.objects.get(pk=member.pk)) is True
+
+    def test_role_change_syncs_groups_and_snapshot(self, member, django_capture_on_commit_callbacks):
+        assert is_site_admin(member) is False
+
+        with django_capture_on_commit_callbacks(execute=True):
+            member.role = User.Role.SITE_ADMIN
+            member.save()
+
+        reloaded = User.objects.get(pk=member.pk)
+        assert reloaded.is_staff is True
+        assert SITE_ADMIN_GROUP_NAME in permission_snapshot(reloaded).groups
+
+
+@pytest.mark.django_db
+class TestRoleSync:
+    def test_save_without_role_change_reads_nothing(self, member, django_assert_num_queries):
+        # Previously a pre_save SELECT fetched the old role on every save.
+        member.first_name = "Changed"
+        with django_assert_num_queries(1):
+            member.save()
+
+    def test_loaded_role_is_tracked(self, member):
+        assert member._loaded_role == User.Role.USER
+        member.role = User.Role.SITE_ADMIN
+        member.save(update_fields=["role", "updated_at"])
+        assert member._loaded_role == User.Role.SITE_ADMIN
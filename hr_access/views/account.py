@@ -35,6 +35,7 @@ from hr_email.service import EmailProviderError, send_app_email
 from hr_shop.exceptions import EmailSendError, RateLimitExceeded
 from hr_shop.models import Order
 from hr_shop.services.customers import attach_customer_to_user
+from hr_shop.services.unclaimed_orders import unclaimed_order_count
 
 logger = logging.getLogger(__name__)
 
@@ -268,7 +269,7 @@ def account_change_password(request):
 def account_settings(request):
     email = request.user.email
     order_count = Order.objects.filter(user=request.user).count()
-    unclaimed_count = Order.objects.filter(user__isnull=True, email__iexact=email).count() if email else 0
+    unclaimed_count = unclaimed_order_count(email)
     log_event(logger, logging.INFO, "access.account_settings.rendered", order_count=order_count, unclaimed_count=unclaimed_count)
 
     return render(request, "hr_access/account/_account_settings_modal.html", {
@@ -12,7 +12,8 @@ from hr_access.forms import AccountAuthenticationForm
 from hr_common.utils.http.htmx import hx_trigger
 from hr_common.utils.http.messages import show_message
 from hr_common.utils.unified_logging import log_event
-from hr_shop.models import Order
+from hr_core.fragment_cache import cached_fragment
+from hr_shop.services.unclaimed_orders import unclaimed_order_count
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +44,7 @@ def auth_logout(request):
 
 
 @require_GET
+@cached_fragment("access.sidebar", private=True, anonymous_only=True)
 def account_get_sidebar_panel(request):
     """
     HTMX-loaded sidebar container that swaps between login panel and user panel.
@@ -57,7 +59,7 @@ def account_get_user_panel(request):
     User panel fragment (used by sidebar once authenticated).
     """
     email = request.user.email
-    unclaimed_count = Order.objects.filter(user__isnull=True, email__iexact=email).count() if email else 0
+    unclaimed_count = unclaimed_order_count(email)
 
     log_event(logger, logging.INFO, "access.user_panel.rendered", unclaimed_count=unclaimed_count)
     return render(request,"hr_access/_user_panel.html", {"unclaimed_count": unclaimed_count})
@@ -14,6 +14,7 @@ from hr_common.utils.http.htmx import hx_trigger
 from hr_common.utils.http.messages import show_message
 from hr_common.utils.unified_logging import log_event
 from hr_shop.models import Order, OrderItem
+from hr_shop.services.unclaimed_orders import refresh_unclaimed_order_count, unclaimed_order_count
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +37,7 @@ def account_get_orders(request):
     ctx = {
         "orders": order_list[:20],
         "has_more": len(order_list) > 20,
-        "unclaimed_count": (Order.objects.filter(user__isnull=True, email__iexact=email).count() if email else 0)
+        "unclaimed_count": unclaimed_order_count(email)
     }
 
     log_event(logger, logging.INFO, "access.orders.list_rendered", order_count=len(ctx["orders"]), has_more=ctx["has_more"])
@@ -103,6 +104,7 @@ def account_submit_claim_unclaimed_orders(request):
         qs = Order.objects.select_for_update().filter(id__in=target_ids, user__isnull=True, email__iexact=email)
         claimed_ids = list(qs.values_list("id", flat=True))
         claimed_count = qs.update(user=request.user)
+        refresh_unclaimed_order_count(email)
 
     log_event(logger, logging.INFO, "access.orders.claim.completed", claimed_count=claimed_count)
     return hx_trigger({
@@ -15,7 +15,7 @@ class PostQuerySet(models.QuerySet):
         return self.filter(status="draft")
 
     def frontpage(self):
-        return self.published().order_by(*self.model._meta.ordering)
+        return self.published().prefetch_related("tags").order_by(*self.model._meta.ordering)
 
 
 class PostManager(models.Manager):
@@ -11,6 +11,7 @@ from hr_access.permissions import is_site_admin
 from hr_bulletin.models import Post
 from hr_common.utils.pagination import paginate
 from hr_common.utils.unified_logging import log_event
+from hr_core.fragment_cache import cached_fragment, page_param
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +31,9 @@ def bulletin_list(request):
     return render(request, "hr_bulletin/list.html", ctx)
 
 
+# Scheduled posts go live and pins expire without a save.
 @require_GET
+@cached_fragment("bulletin.list", query_params={"page": page_param}, period=300)
 def bulletin_list_partial(request):
     page_number = request.GET.get("page", 1)
 
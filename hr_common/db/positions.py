@@ -0,0 +1,52 @@
+# hr_common/db/positions.py
+
+from collections.abc import Iterable, Sequence
+
+from django.db.models import Max, QuerySet
+
+
+def next_position(queryset: QuerySet, *, field: str = "position", exclude_pk=None) -> int:
+    """
+    Return the next free 1-based position within `queryset` using a single
+    aggregate query (MAX + 1), instead of loading every sibling position.
+    """
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+    current = queryset.aggregate(_max=Max(field))["_max"]
+    return (current or 0) + 1
+
+
+def assign_positions(objs: Iterable, *, start: int = 1, field: str = "position") -> list:
+    """
+    Assign contiguous positions in memory, starting at `start`.
+
+    Intended for unsaved instances headed for bulk_create(), which bypasses
+    Model.save() and would otherwise leave every row at position 0.
+    """
+    objs = list(objs)
+    for offset, obj in enumerate(objs):
+        setattr(obj, field, start + offset)
+    return objs
+
+
+def reorder(queryset: QuerySet, ordered_pks: Sequence, *, field: str = "position") -> int:
+    """
+    Rewrite positions for `queryset` so rows follow `ordered_pks` (1..n), in a
+    single bulk_update. Rows not listed keep their relative order and are
+    appended after the listed ones. Returns the number of rows updated.
+    """
+    ordered_pks = [int(pk) for pk in ordered_pks]
+    rank = {pk: i for i, pk in enumerate(ordered_pks)}
+
+    rows = list(queryset.only("pk", field).order_by(field, "pk"))
+    rows.sort(key=lambda obj: (rank.get(obj.pk, len(rank)), getattr(obj, field), obj.pk))
+
+    changed = []
+    for pos, obj in enumerate(rows, start=1):
+        if getattr(obj, field) != pos:
+            setattr(obj, field, pos)
+            changed.append(obj)
+
+    if changed:
+        queryset.model.objects.bulk_update(changed, [field])
+    return len(changed)
@@ -1,16 +1,103 @@
 # hr_common/security/secrets.py
 
 import os
+import re
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
 
+# File-backed secrets are re-stat'ed at most this often; in between, lookups
+# are a dict hit with no syscalls.
+STAT_INTERVAL_SECONDS = 5.0
+
+
+@dataclass
+class _Entry:
+    source: tuple[str | None, str | None]
+    stamp: tuple[int, int] | None
+    value: str | None
+    checked_at: float
+
+
+def _stamp(path: str) -> tuple[int, int]:
+    # st_ino catches atomic symlink swaps (Docker/k8s secret rotation) that keep the mtime.
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_ino
+
+
+class SecretProvider:
+    '''
+    In-process cache in front of <NAME>_FILE / <NAME> lookups.
+
+    Env values are cached until the env var itself changes. File values are
+    cached and revalidated by mtime/inode once every `stat_interval` seconds,
+    so a rotated secret file is picked up without a restart. `rotate()` drops
+    cached values immediately (e.g. from a deploy hook or a shell).
+    '''
+
+    def __init__(self, stat_interval: float = STAT_INTERVAL_SECONDS):
+        self.stat_interval = stat_interval
+        self._entries: dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> str | None:
+        file_path = os.environ.get(f'{name}_FILE')
+        source = (file_path, None if file_path else os.environ.get(name))
+        now = time.monotonic()
+
+        entry = self._entries.get(name)
+        if entry is not None and entry.source == source:
+            if not file_path or now - entry.checked_at < self.stat_interval:
+                return entry.value
+            stamp = _stamp(file_path)
+            if stamp == entry.stamp:
+                entry.checked_at = now
+                return entry.value
+
+        if file_path:
+            stamp = _stamp(file_path)
+            value = Path(file_path).read_text().strip()
+        else:
+            stamp, value = None, source[1]
+
+        with self._lock:
+            self._entries[name] = _Entry(source=source, stamp=stamp, value=value, checked_at=now)
+        return value
+
+    def rotate(self, name: str | None = None) -> None:
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+
+
+provider = SecretProvider()
+
 
 def read_secret(name: str) -> str | None:
     '''
     Read secret from either:
         - <NAME>_FILE (Docker secrets)
         - <NAME> (plain env var)
+
+    Served from the process-wide SecretProvider cache.
+    '''
+    return provider.get(name)
+
+
+def read_secret_list(name: str) -> tuple[str, ...]:
+    '''
+    Read a secret that may hold several values separated by commas or
+    newlines, e.g. the current and previous webhook signing secret during a
+    rollover. Order is preserved; blanks are dropped.
+    '''
+    return tuple(v for v in re.split(r'[\s,]+', read_secret(name) or '') if v)
+
+
+def rotate_secrets(name: str | None = None) -> None:
+    '''
+    Forget cached secret values so the next read goes back to the source.
     '''
-    file_path = os.getenv(f'{name}_FILE')
-    if file_path:
-        return Path(file_path).read_text().strip()
-    return os.getenv(name)
+    provider.rotate(name)
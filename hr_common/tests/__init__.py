@@ -0,0 +1 @@
+# hr_common/tests/__init__.py
@@ -0,0 +1,102 @@
+# hr_common/tests/test_logging.py
+
+# Tests for log_event redaction/sampling and the queued logging pipeline.
+
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from hr_common.utils.unified_logging import log_event, redact_payload
+from hr_config import log_queue
+
+
+class TestRedaction:
+    def test_nested_sensitive_keys_are_redacted(self):
+        out = redact_payload({"order_id": 7, "meta": {"api_key": "x", "items": [{"client_secret": "cs"}]}})
+
+        assert out == {"order_id": 7, "meta": {"api_key": "**redacted**", "items": [{"client_secret": "**redacted**"}]}}
+
+    def test_email_keys_keep_domain_fingerprint(self):
+        out = redact_payload({"customer_email": "Someone@Example.com"})
+
+        assert out["customer_email"].startswith("**redacted** (example.com, fp=")
+
+    def test_primitives_pass_through(self):
+        assert redact_payload("token") == "token"
+        assert redact_payload(3) == 3
+
+
+class TestSampling:
+    def test_sampled_out_event_skips_redaction(self, settings):
+        settings.LOG_SAMPLE_RATES = {"chatty.rendered": 0.0}
+        logger = logging.getLogger("hr_common.tests.sampling")
+        logger.setLevel(logging.INFO)
+
+        with patch("hr_common.utils.unified_logging.redact_payload") as redact:
+            log_event(logger, logging.INFO, "chatty.rendered", page=1)
+
+        redact.assert_not_called()
+
+    def test_warnings_are_never_sampled(self, settings, caplog):
+        settings.LOG_SAMPLE_RATES = {"chatty.rendered": 0.0}
+        logger = logging.getLogger("hr_common.tests.sampling")
+
+        with caplog.at_level(logging.INFO, logger=logger.name):
+            log_event(logger, logging.WARNING, "chatty.rendered", page=1)
+
+        assert any("chatty.rendered" in str(r.msg) for r in caplog.records)
+
+    def test_kept_events_carry_sample_rate(self, settings, caplog):
+        settings.LOG_SAMPLE_RATES = {"chatty.rendered": 1.0}
+        logger = logging.getLogger("hr_common.tests.sampling")
+
+        with caplog.at_level(logging.INFO, logger=logger.name):
+            log_event(logger, logging.INFO, "chatty.rendered", page=1)
+
+        assert any(isinstance(r.msg, dict) and r.msg.get("sample_rate") == 1.0 for r in caplog.records)
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def isolated_root():
+    root = logging.getLogger()
+    saved = root.handlers[:]
+    log_queue.uninstall_queue_logging()
+    for h in saved:
+        root.removeHandler(h)
+    target = _ListHandler()
+    root.addHandler(target)
+    yield target
+    log_queue.uninstall_queue_logging()
+    root.removeHandler(target)
+    for h in saved:
+        root.addHandler(h)
+
+
+class TestQueueLogging:
+    def test_records_are_written_by_listener(self, isolated_root):
+        assert log_queue.install_queue_logging()
+
+        logging.getLogger("hr_common.tests.queue").warning("hello %s", "world")
+        log_queue.stop_queue_logging()
+
+        assert [r.getMessage() for r in isolated_root.records] == ["hello world"]
+
+    def test_full_queue_drops_instead_of_blocking(self, isolated_root):
+        log_queue.install_queue_logging(maxsize=1)
+        log_queue.stop_queue_logging()
+        logger = logging.getLogger("hr_common.tests.queue")
+
+        logger.warning("one")
+        logger.warning("two")
+
+        assert log_queue._handler.dropped == 1
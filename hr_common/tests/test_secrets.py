@@ -0,0 +1,92 @@
+# hr_common/tests/test_secrets.py
+
+# Tests for the cached secret provider and the Stripe helpers built on it.
+
+import os
+from unittest.mock import patch
+
+import pytest
+import stripe
+
+from hr_common.security.secrets import SecretProvider
+from hr_core.services.payments import stripe_config
+
+
+@pytest.fixture
+def secret_file(tmp_path, monkeypatch):
+    path = tmp_path / "stripe_key"
+    path.write_text("sk_one\n")
+    monkeypatch.setenv("STRIPE_SECRET_KEY_FILE", str(path))
+    return path
+
+
+class TestSecretProvider:
+    def test_file_value_is_cached_between_stat_checks(self, secret_file):
+        provider = SecretProvider(stat_interval=60)
+        assert provider.get("STRIPE_SECRET_KEY") == "sk_one"
+
+        with patch("hr_common.security.secrets.os.stat") as stat:
+            assert provider.get("STRIPE_SECRET_KEY") == "sk_one"
+        stat.assert_not_called()
+
+    def test_changed_file_is_reloaded_after_interval(self, secret_file):
+        provider = SecretProvider(stat_interval=0)
+        provider.get("STRIPE_SECRET_KEY")
+
+        secret_file.write_text("sk_two\n")
+        st = secret_file.stat()
+        os.utime(secret_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        assert provider.get("STRIPE_SECRET_KEY") == "sk_two"
+
+    def test_rotate_forces_reread(self, secret_file):
+        provider = SecretProvider(stat_interval=60)
+        provider.get("STRIPE_SECRET_KEY")
+        secret_file.write_text("sk_two\n")
+
+        provider.rotate("STRIPE_SECRET_KEY")
+
+        assert provider.get("STRIPE_SECRET_KEY") == "sk_two"
+
+    def test_env_change_invalidates(self, monkeypatch):
+        provider = SecretProvider()
+        monkeypatch.setenv("SOME_TOKEN", "a")
+        assert provider.get("SOME_TOKEN") == "a"
+
+        monkeypatch.setenv("SOME_TOKEN", "b")
+        assert provider.get("SOME_TOKEN") == "b"
+
+
+class TestStripeConfig:
+    def test_webhook_event_accepts_any_rollover_secret(self, monkeypatch):
+        monkeypatch.setattr("hr_common.security.secrets.read_secret", lambda name: "whsec_new, whsec_old")
+
+        def construct(payload, sig_header, secret):
+            if secret != "whsec_old":
+                raise stripe.error.SignatureVerificationError("bad sig", sig_header)
+            return {"id": "evt_1"}
+
+        with patch("stripe.Webhook.construct_event", side_effect=construct) as construct_event:
+            event = stripe_config.construct_webhook_event(b"{}", "t=1,v1=sig")
+
+        assert event == {"id": "evt_1"}
+        assert construct_event.call_count == 2
+
+    def test_webhook_event_raises_when_no_secret_matches(self, monkeypatch):
+        monkeypatch.setattr("hr_common.security.secrets.read_secret", lambda name: "whsec_new")
+
+        with patch("stripe.Webhook.construct_event", side_effect=stripe.error.SignatureVerificationError("bad", "")):
+            with pytest.raises(stripe.error.SignatureVerificationError):
+                stripe_config.construct_webhook_event(b"{}", "t=1,v1=sig")
+
+    def test_configure_stripe_only_assigns_on_change(self, monkeypatch):
+        monkeypatch.setattr("hr_common.security.secrets.read_secret", lambda name: "sk_test_fake")
+        monkeypatch.setattr(stripe_config, "_configured_key", None)
+        monkeypatch.setattr(stripe, "api_key", None)
+
+        stripe_config.configure_stripe()
+        assert stripe.api_key == "sk_test_fake"
+
+        stripe.api_key = "sk_overwritten"
+        stripe_config.configure_stripe()
+        assert stripe.api_key == "sk_overwritten"
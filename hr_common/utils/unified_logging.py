@@ -9,6 +9,7 @@ Provides:
 - Generation and propagation of request IDs (X-Request-ID)
 - A logging.Filter that injects request_id into standard logging records
 - Recursive payload redaction helpers to prevent sensitive data leaks in logs
+- Per-event sampling for chatty sub-WARNING events (settings.LOG_SAMPLE_RATES)
 
 Design goals:
 - Every log line in a request should carry a request_id
@@ -21,8 +22,10 @@ from __future__ import annotations
 import contextvars
 import hashlib
 import logging
+import random
 import uuid
 from collections.abc import Iterable
+from functools import lru_cache
 from typing import Any
 
 import structlog
@@ -55,6 +58,13 @@ _SENSITIVE_KEY_PARTS = (
     "ssn",
 )
 
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+# Per-key redaction decisions (see _key_decision).
+_KEEP, _REDACT, _REDACT_EMAIL = 0, 1, 2
+
+_struct_loggers: dict[str, Any] = {}
+
 
 def _safe_email(value: Any) -> Any:
     if not isinstance(value, str):
@@ -85,10 +95,35 @@ def reset_user_id(token: contextvars.Token) -> None:
     unbind_contextvars("user_id")
 
 
+def _sample_rate(event: str) -> float | None:
+    from django.conf import settings
+
+    try:
+        return settings.LOG_SAMPLE_RATES.get(event)
+    except AttributeError:
+        return None
+
+
+def _struct_logger(name: str):
+    struct_logger = _struct_loggers.get(name)
+    if struct_logger is None:
+        struct_logger = _struct_loggers[name] = structlog.get_logger(name)
+    return struct_logger
+
+
 def log_event(logger: logging.Logger, level: int, event: str, *, exc_info: bool = False, **data: Any) -> None:
+    # Cheap exits first: disabled levels and sampled-out events never pay for redaction.
+    if not logger.isEnabledFor(level):
+        return
+    if level < logging.WARNING:
+        rate = _sample_rate(event)
+        if rate is not None:
+            if random.random() >= rate:
+                return
+            data["sample_rate"] = rate
+
     payload = redact_payload(data)
-    struct_logger = structlog.get_logger(logger.name)
-    struct_logger.log(level, event, **payload, exc_info=exc_info)
+    _struct_logger(logger.name).log(level, event, **payload, exc_info=exc_info)
 
 
 def get_request_id() -> str | None:
@@ -126,48 +161,47 @@ def redact_payload(
     redacted_value: str = "**redacted**",
     sensitive_key_parts: Iterable[str] = _SENSITIVE_KEY_PARTS,
 ) -> Any:
+    if isinstance(payload, _PRIMITIVES):
+        return payload
+
+    parts = sensitive_key_parts if isinstance(sensitive_key_parts, tuple) else tuple(sensitive_key_parts)
+
     if isinstance(payload, dict):
         out = {}
         for key, value in payload.items():
-            if _is_sensitive_key(key, sensitive_key_parts):
+            decision = _key_decision(key, parts) if isinstance(key, str) else _KEEP
+            if decision == _REDACT_EMAIL:
                 # special-case email to keep a tiny bit of signal
-                if isinstance(key, str) and "email" in key.lower():
-                    out[key] = _safe_email(value)
-                else:
-                    out[key] = redacted_value
+                out[key] = _safe_email(value)
+            elif decision == _REDACT:
+                out[key] = redacted_value
+            elif isinstance(value, _PRIMITIVES):
+                out[key] = value
             else:
-                out[key] = redact_payload(
-                    value,
-                    redacted_value=redacted_value,
-                    sensitive_key_parts=sensitive_key_parts,
-                )
+                out[key] = redact_payload(value, redacted_value=redacted_value, sensitive_key_parts=parts)
         return out
 
     if isinstance(payload, list):
-        return [
-            redact_payload(
-                item,
-                redacted_value=redacted_value,
-                sensitive_key_parts=sensitive_key_parts,
-            )
-            for item in payload
-        ]
+        return [redact_payload(item, redacted_value=redacted_value, sensitive_key_parts=parts) for item in payload]
 
     if isinstance(payload, tuple):
-        return tuple(
-            redact_payload(
-                item,
-                redacted_value=redacted_value,
-                sensitive_key_parts=sensitive_key_parts,
-            )
-            for item in payload
-        )
+        return tuple(redact_payload(item, redacted_value=redacted_value, sensitive_key_parts=parts) for item in payload)
 
     return payload
 
 
+@lru_cache(maxsize=4096)
+def _key_decision(key: str, sensitive_key_parts: tuple[str, ...]) -> int:
+    """
+    Memoized per-key verdict; log payloads reuse a small set of key names.
+    """
+    lower_key = key.lower()
+    if not any(part in lower_key for part in sensitive_key_parts):
+        return _KEEP
+    return _REDACT_EMAIL if "email" in lower_key else _REDACT
+
+
 def _is_sensitive_key(key: Any, sensitive_key_parts: Iterable[str]) -> bool:
     if not isinstance(key, str):
         return False
-    lower_key = key.lower()
-    return any(part in lower_key for part in sensitive_key_parts)
+    return _key_decision(key, tuple(sensitive_key_parts)) != _KEEP
@@ -2,26 +2,30 @@
 
 import logging
 
+from django.db.models import Prefetch
 from django.shortcuts import render
 from django.utils import timezone
 
 from hr_about.models import CarouselSlide, PullQuote
 from hr_common.utils.unified_logging import log_event
+from hr_core.srcset_registry import registry
 from hr_live.models import Show
-from hr_shop.models import Product
+from hr_shop.models import Product, ProductVariant
 
 logger = logging.getLogger(__name__)
 
 
 def index(request):
     today = timezone.localdate()
-    products = Product.objects.prefetch_related("variants").order_by("name")
+    products = list(Product.objects.prefetch_related(Prefetch("variants", queryset=ProductVariant.objects.select_related("image"))).order_by("name"))
+    display_variants = [p.display_variant for p in products]
+    registry.prime("variant", (v.image.image.url for v in display_variants if v and v.image and v.image.image))
     slides = CarouselSlide.objects.filter(is_active=True).order_by("order", "id")
     quotes = PullQuote.objects.filter(is_active=True).order_by("order", "id")
     shows = Show.objects.filter(status="published", date__gte=today).select_related("venue").prefetch_related("lineup").order_by("date", "time", "id")[:5]
     modal = (request.GET.get("modal") or "").strip()
     log_event(logger, logging.INFO, "site.index.rendered",
-        products_count=products.count(),
+        products_count=len(products),
         slides_count=slides.count(),
         quotes_count=quotes.count(),
         shows_count=shows.count(),
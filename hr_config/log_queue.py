@@ -0,0 +1,122 @@
+# hr_config/log_queue.py
+
+"""
+Non-blocking logging: the root logger's handlers are moved behind a
+QueueHandler and drained by one QueueListener thread per process, so request
+threads only pay for a queue put. Enabled by LOG_ASYNC (see settings.logging).
+
+- Records are handed over in-process (no pickling); structlog event dicts are
+  already fully built, and stdlib messages are interpolated up front.
+- contextvars (request_id, user_id) are snapshotted onto foreign records and
+  merged back by structlog_config.merge_queued_contextvars in the listener.
+- The queue is bounded; when it is full records are dropped and counted
+  rather than blocking the caller.
+- The listener is restarted in forked children (gunicorn --preload).
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from structlog.contextvars import get_contextvars
+
+DEFAULT_QUEUE_SIZE = 10_000
+
+_handler: NonBlockingQueueHandler | None = None
+_listener: QueueListener | None = None
+_targets: tuple[logging.Handler, ...] = ()
+
+
+class NonBlockingQueueHandler(QueueHandler):
+
+    def __init__(self, q: queue.Queue):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if not isinstance(record.msg, dict):
+            record.msg = record.getMessage()
+            record.args = None
+            record.hr_contextvars = get_contextvars()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def install_queue_logging(maxsize: int = DEFAULT_QUEUE_SIZE) -> bool:
+    """
+    Move the root logger's current handlers behind a queue. Idempotent;
+    returns False when already installed or there is nothing to move.
+    """
+    global _handler, _targets
+
+    if _handler is not None:
+        return False
+
+    root = logging.getLogger()
+    targets = tuple(h for h in root.handlers if not isinstance(h, QueueHandler))
+    if not targets:
+        return False
+
+    for h in targets:
+        root.removeHandler(h)
+
+    _targets = targets
+    _handler = NonBlockingQueueHandler(queue.Queue(maxsize))
+    root.addHandler(_handler)
+    _start_listener()
+
+    atexit.register(stop_queue_logging)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_restart_in_child)
+    return True
+
+
+def stop_queue_logging() -> None:
+    """
+    Flush pending records and stop the writer thread.
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def uninstall_queue_logging() -> None:
+    global _handler, _targets
+
+    stop_queue_logging()
+    root = logging.getLogger()
+    if _handler is not None:
+        root.removeHandler(_handler)
+        for h in _targets:
+            root.addHandler(h)
+    _handler, _targets = None, ()
+
+
+def _start_listener() -> None:
+    global _listener
+
+    _listener = QueueListener(_handler.queue, *_targets, respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_in_child() -> None:
+    # The parent's writer thread does not exist in the child; its queue may
+    # hold records the parent will write itself.
+    global _listener
+
+    if _handler is None:
+        return
+    _handler.queue = queue.Queue(_handler.queue.maxsize)
+    _listener = None
+    _start_listener()
@@ -6,7 +6,7 @@ from django.core.management.utils import get_random_secret_key
 from django.urls import reverse_lazy
 
 from hr_common.security import secrets
-from hr_config.settings.common import BASE_DIR
+from hr_config.settings.common import BASE_DIR, env_bool
 
 # TODO - In Docker, it will be safer to move SECRET_KEY to the environment.
 #        Otherwise, if the file is recreated below, sessions/tokens = invalid.
@@ -66,6 +66,8 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "hr_core.middleware.request_id.RequestIdMiddleware",
+    "hr_core.middleware.instrumentation.InstrumentationMiddleware",
+    "hr_core.middleware.preload_hints.PreloadHintsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -107,6 +109,13 @@ LOGIN_URL = reverse_lazy("hr_access:auth_login")
 LOGIN_REDIRECT_URL = "/"
 LOGOUT_REDIRECT_URL = "/"
 
+# Login throttling (hr_access.services.login_throttle). Client IP is the Nth X-Forwarded-For entry from
+# the right when this many proxies (nginx) sit in front of Django; 0 = use REMOTE_ADDR only.
+TRUSTED_PROXY_COUNT = int(os.getenv("TRUSTED_PROXY_COUNT", "1"))
+LOGIN_THROTTLE_MAX_FAILURES_PER_IDENTIFIER = int(os.getenv("LOGIN_THROTTLE_MAX_FAILURES_PER_IDENTIFIER", "5"))
+LOGIN_THROTTLE_MAX_FAILURES_PER_IP = int(os.getenv("LOGIN_THROTTLE_MAX_FAILURES_PER_IP", "30"))
+LOGIN_THROTTLE_WINDOW_SECONDS = int(os.getenv("LOGIN_THROTTLE_WINDOW_SECONDS", "900"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -117,6 +126,13 @@ AUTH_PASSWORD_VALIDATORS = [
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Serve MEDIA_ROOT from Django when there is no fronting nginx (e.g. a single Fly machine).
+# With nginx in front, set MEDIA_ACCEL_REDIRECT_PREFIX to its `internal` media location
+# so Django answers conditionals and nginx streams the body.
+SERVE_MEDIA = env_bool("SERVE_MEDIA", False)
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv("MEDIA_ACCEL_REDIRECT_PREFIX", "")
+MEDIA_CACHE_CONTROL = os.getenv("MEDIA_CACHE_CONTROL", "public, max-age=604800, immutable")
+
 STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
@@ -132,6 +148,17 @@ STORAGES = {
 
 STATICFILES_DIRS = []
 
+# -----------------------------
+# Instrumentation
+# -----------------------------
+# Server-Timing header + request.completed event (hr_core.middleware.instrumentation).
+SERVER_TIMING = env_bool("SERVER_TIMING", True)
+SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", "1000"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+
+# Bearer token for /metrics/ (Prometheus text format). Unset = endpoint disabled outside DEBUG.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 # -----------------------------
 # RQ (background jobs)
 # -----------------------------
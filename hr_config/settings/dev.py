@@ -76,7 +76,6 @@ INSTALLED_APPS += ["debug_toolbar", "django_browser_reload", "django_rq"]
 
 MIDDLEWARE.insert(2, "debug_toolbar.middleware.DebugToolbarMiddleware")
 MIDDLEWARE.append("django_browser_reload.middleware.BrowserReloadMiddleware")
-MIDDLEWARE.append('hr_core.middleware.media_cache.MediaCacheMiddleware')
 
 TEMPLATES[0]["OPTIONS"]["context_processors"].append('hr_common.context_processors.template_flags')
 
@@ -4,8 +4,8 @@
 import os
 from pathlib import Path
 
-from hr_config.settings.common import BASE_DIR
-from hr_config.structlog_config import get_structlog_processors, get_structlog_renderer
+from hr_config.settings.common import BASE_DIR, env_bool
+from hr_config.structlog_config import get_structlog_processors, get_structlog_renderer, merge_queued_contextvars
 
 LOG_DIR = Path(os.environ.get("LOG_DIR", BASE_DIR / "logs"))
 LOG_DIR.mkdir(parents=True, exist_ok=True)
@@ -13,10 +13,31 @@ LOG_DIR.mkdir(parents=True, exist_ok=True)
 LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
 DJANGO_LOG_LEVEL = os.environ.get("DJANGO_LOG_LEVEL", LOG_LEVEL).upper()
 
+# Hand records to a per-process writer thread (hr_config.log_queue) instead of
+# writing to console/files on the request thread.
+LOG_ASYNC = env_bool("LOG_ASYNC", True)
+
+# log_event() sampling for chatty sub-WARNING events on public pages: fraction of
+# calls kept (kept events carry sample_rate). Set LOG_SAMPLE_RENDERED=1 to log all.
+LOG_SAMPLE_RENDERED = float(os.environ.get("LOG_SAMPLE_RENDERED", "0.1"))
+LOG_SAMPLE_RATES = {
+    event: LOG_SAMPLE_RENDERED
+    for event in (
+        "site.index.rendered",
+        "bulletin.list.rendered",
+        "bulletin.list_partial.rendered",
+        "bulletin.detail.rendered",
+        "about.carousel.rendered",
+        "about.quotes.rendered",
+        "live.upcoming_list.rendered",
+        "live.past_list.rendered",
+    )
+}
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
-    "formatters": {"structlog": {"()": "structlog.stdlib.ProcessorFormatter", "processor": get_structlog_renderer(), "foreign_pre_chain": get_structlog_processors()}},
+    "formatters": {"structlog": {"()": "structlog.stdlib.ProcessorFormatter", "processor": get_structlog_renderer(), "foreign_pre_chain": [merge_queued_contextvars, *get_structlog_processors()]}},
     "handlers": {
         "console": {"class": "logging.StreamHandler", "formatter": "structlog", "level": LOG_LEVEL},
         "file": {
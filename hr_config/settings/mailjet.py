@@ -24,3 +24,6 @@ EMAIL_HOST_PASSWORD = secrets.read_secret('EMAIL_HOST_PASSWORD')
 
 MAILJET_API_KEY = secrets.read_secret('MAILJET_API_KEY')
 MAILJET_API_SECRET = secrets.read_secret('MAILJET_API_SECRET')
+
+# Alternate REST host (the fake started by `manage.py loadtest`); empty means api.mailjet.com.
+MAILJET_API_URL = os.environ.get("MAILJET_API_URL", "")
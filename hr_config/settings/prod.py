@@ -59,3 +59,4 @@ if USE_S3_MEDIA:
         **STORAGES,
         "default": {"BACKEND": "hr_storage.storage_backends.PublicMediaStorage"},
     }
+    WEBHOOK_EVENT_ARCHIVE_STORAGE = {"BACKEND": "hr_storage.storage_backends.PrivateMediaStorage"}
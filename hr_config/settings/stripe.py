@@ -1,8 +1,42 @@
 # hr_config/settings/stripe.py
 
+import os
+from pathlib import Path
 
 from hr_common.security import secrets
 
 STRIPE_SECRET_KEY = secrets.read_secret("STRIPE_SECRET_KEY")
 STRIPE_WEBHOOK_SECRET = secrets.read_secret("STRIPE_WEBHOOK_SECRET")
 STRIPE_PUBLIC_KEY = secrets.read_secret("STRIPE_PUBLIC_KEY")
+
+# Alternate API host (stripe-mock, or the fake started by `manage.py loadtest`); empty means api.stripe.com.
+STRIPE_API_BASE = os.environ.get("STRIPE_API_BASE", "")
+
+# "STRIPE" or "MOCK" (in-memory MockGateway; no network, for tests and benchmarks). Anything else is refused.
+PAYMENT_PROVIDER = os.environ.get("PAYMENT_PROVIDER", "STRIPE").upper()
+# Let the MockGateway take unsigned webhook JSON outside DEBUG (tests only; anyone could mark orders paid).
+MOCK_GATEWAY_ALLOW_UNSIGNED_WEBHOOKS = os.environ.get("MOCK_GATEWAY_ALLOW_UNSIGNED_WEBHOOKS", "").lower() == "true"
+
+# Shared SDK HTTP client (hr_core.services.payments.stripe_config.build_http_client).
+STRIPE_CONNECT_TIMEOUT = float(os.environ.get("STRIPE_CONNECT_TIMEOUT", "5"))
+STRIPE_READ_TIMEOUT = float(os.environ.get("STRIPE_READ_TIMEOUT", "30"))
+STRIPE_MAX_NETWORK_RETRIES = int(os.environ.get("STRIPE_MAX_NETWORK_RETRIES", "2"))
+STRIPE_HTTP_POOL_SIZE = int(os.environ.get("STRIPE_HTTP_POOL_SIZE", "10"))
+
+# Create Stripe customers through RQ (hr_payment.services.stripe_customers); off = not provisioned (checkout uses customer_email).
+ENABLE_STRIPE_CUSTOMER_JOBS = os.environ.get("ENABLE_STRIPE_CUSTOMER_JOBS", "").lower() == "true"
+
+# Mirror Product/ProductVariant into Stripe Products/Prices via RQ (hr_payment.services.stripe_catalog).
+ENABLE_STRIPE_CATALOG_SYNC = os.environ.get("ENABLE_STRIPE_CATALOG_SYNC", "").lower() == "true"
+
+# Retention (hr_payment.services.webhook_retention, `manage.py prune_webhook_events`).
+# Keep processed events past Stripe's 30-day event list so stripe_catch_up can still recognise them.
+WEBHOOK_EVENT_RETENTION_DAYS = int(os.environ.get("WEBHOOK_EVENT_RETENTION_DAYS", "45"))
+WEBHOOK_EVENT_ARCHIVE_DIR = os.environ.get("WEBHOOK_EVENT_ARCHIVE_DIR", "archive/webhook-events")
+# Archives hold full Stripe payloads (customer emails, intents, metadata): never public media.
+# STORAGES-style spec; prod settings point it at PrivateMediaStorage when media lives on S3.
+WEBHOOK_EVENT_ARCHIVE_STORAGE = {
+    "BACKEND": "django.core.files.storage.FileSystemStorage",
+    "OPTIONS": {"location": os.environ.get("WEBHOOK_EVENT_ARCHIVE_ROOT", str(Path(__file__).resolve().parents[2] / "private"))},
+}
+PAYMENT_ATTEMPT_RAW_RETENTION_DAYS = int(os.environ.get("PAYMENT_ATTEMPT_RAW_RETENTION_DAYS", "180"))
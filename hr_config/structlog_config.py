@@ -29,6 +29,17 @@ def get_structlog_processors() -> list[structlog.types.Processor]:
     ]
 
 
+def merge_queued_contextvars(logger, method_name, event_dict):
+    """
+    foreign_pre_chain step: restore contextvars captured by
+    hr_config.log_queue when a stdlib record is formatted on the writer thread.
+    """
+    record = event_dict.get("_record")
+    for key, value in (getattr(record, "hr_contextvars", None) or {}).items():
+        event_dict.setdefault(key, value)
+    return event_dict
+
+
 def get_structlog_renderer() -> structlog.types.Processor:
     if _console_enabled():
         return structlog.dev.ConsoleRenderer()
@@ -0,0 +1 @@
+# hr_core/__init__.py
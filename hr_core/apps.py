@@ -1,7 +1,9 @@
 # hr_core/apps.py
 
 from django.apps import AppConfig
+from django.conf import settings
 
+from hr_config.log_queue import install_queue_logging
 from hr_config.structlog_config import configure_structlog
 
 
@@ -10,4 +12,9 @@ class CoreConfig(AppConfig):
     name = "hr_core"
 
     def ready(self) -> None:
+        from hr_core import fragment_cache
+
         configure_structlog()
+        if getattr(settings, "LOG_ASYNC", False):
+            install_queue_logging()
+        fragment_cache.connect_signals()
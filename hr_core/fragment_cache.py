@@ -0,0 +1,276 @@
+# hr_core/fragment_cache.py
+
+"""
+Conditional GET and server-side caching for HTMX fragments that only change
+when their models do:
+
+    @require_GET
+    @cached_fragment("about.quotes")
+    def get_quotes_partial(request): ...
+
+Each scope in FRAGMENT_SCOPES has a version stamp in the default cache,
+replaced (on commit) whenever one of its models is saved, deleted or has an
+m2m relation changed. The ETag is derived from the stamp, the build, the
+path, the query parameters the view declares and whether the request came
+from HTMX, so answering If-None-Match is one cache read: a match gets a 304
+before the view runs. Undeclared parameters are ignored, and declared ones
+with a value their normalizer rejects skip caching, so arbitrary query
+strings cannot mint new cache entries.
+
+Public fragments are also stored in the cache under their ETag, so a client
+without a copy still skips the view. Fragments rendering {% csrf_token %}
+are `private`: the CSRF cookie is mixed into the ETag (login rotates it) and
+the body is never stored server-side.
+
+Stamps expire after STAMP_TIMEOUT, which bounds staleness for writes that
+bypass signals (QuerySet.update(), raw SQL). They must live in a cache shared
+by every web process and the RQ worker (variant jobs write MediaVariant
+rows): with a process-local default cache (LocMemCache, DummyCache) a bump
+would never reach the other gunicorn workers, so the decorator passes every
+request through untouched. prod_docker points the default cache at Redis
+when it is configured. A missing stamp is replaced by a fresh one, so a
+flush only costs misses.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import time
+import uuid
+from collections.abc import Callable
+from functools import lru_cache, wraps
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+
+from hr_common.utils.http.htmx import is_htmx
+from hr_common.utils.unified_logging import log_event
+from hr_core import vite_manifest
+
+logger = logging.getLogger(__name__)
+
+# scope -> models whose writes change the rendered fragment ("app_label.ModelName").
+FRAGMENT_SCOPES: dict[str, tuple[str, ...]] = {
+    "about.carousel": ("hr_about.CarouselSlide", "hr_core.MediaVariant"),
+    "about.quotes": ("hr_about.PullQuote",),
+    "bulletin.list": ("hr_bulletin.Post", "hr_bulletin.Tag", "hr_core.MediaVariant"),
+    "shop.product": (
+        "hr_shop.Product",
+        "hr_shop.ProductVariant",
+        "hr_shop.ProductVariantOption",
+        "hr_shop.ProductOptionType",
+        "hr_shop.ProductOptionValue",
+        "hr_shop.ProductImage",
+        "hr_core.MediaVariant",
+    ),
+    "access.sidebar": (),
+}
+
+STAMP_TIMEOUT = 60 * 60
+BODY_TIMEOUT = 60 * 10
+MAX_CACHED_PAGE = 50
+
+# Backends whose entries are private to one process.
+PROCESS_LOCAL_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+_scopes_by_model: dict[str, tuple[str, ...]] = {}
+
+
+def cache_is_shared() -> bool:
+    return settings.CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_BACKENDS
+
+
+def page_param(value: str) -> str | None:
+    """
+    Normalizer for `page`: canonical page numbers up to MAX_CACHED_PAGE.
+    """
+    return value if re.fullmatch(r"[1-9][0-9]*", value) and int(value) <= MAX_CACHED_PAGE else None
+
+
+def _stamp_key(scope: str) -> str:
+    return f"fragment:stamp:{scope}"
+
+
+def scope_stamp(scope: str) -> str:
+    key = _stamp_key(scope)
+    stamp = cache.get(key)
+    if stamp is None:
+        stamp = uuid.uuid4().hex
+        if not cache.add(key, stamp, STAMP_TIMEOUT):
+            stamp = cache.get(key, stamp)
+    return stamp
+
+
+def bump(*scopes: str) -> None:
+    cache.set_many({_stamp_key(scope): uuid.uuid4().hex for scope in scopes}, STAMP_TIMEOUT)
+
+
+def _bump_for_models(*models, using=None) -> None:
+    scopes = {scope for model in models if model is not None for scope in _scopes_by_model.get(model._meta.label, ())}
+    if scopes:
+        transaction.on_commit(lambda: bump(*sorted(scopes)), using=using)
+
+
+def _on_write(sender, using=None, **kwargs):
+    _bump_for_models(sender, using=using)
+
+
+def _on_m2m_changed(sender, instance, action, model=None, using=None, **kwargs):
+    if action.startswith("post_"):
+        _bump_for_models(type(instance), model, using=using)
+
+
+def connect_signals() -> None:
+    """
+    Wire stamp bumps for every model in FRAGMENT_SCOPES. Called from CoreConfig.ready().
+    """
+    by_model: dict[str, list[str]] = {}
+    for scope, labels in FRAGMENT_SCOPES.items():
+        for label in labels:
+            by_model.setdefault(label, []).append(scope)
+    _scopes_by_model.update({label: tuple(scopes) for label, scopes in by_model.items()})
+
+    for label in _scopes_by_model:
+        model = apps.get_model(label)
+        post_save.connect(_on_write, sender=model, dispatch_uid=f"fragment_cache.save.{label}")
+        post_delete.connect(_on_write, sender=model, dispatch_uid=f"fragment_cache.delete.{label}")
+    # Auto-created through models are not listed; resolve them from both ends of the relation.
+    m2m_changed.connect(_on_m2m_changed, dispatch_uid="fragment_cache.m2m")
+
+
+@lru_cache(maxsize=1)
+def _build_id() -> str:
+    """
+    Deploys change templates and asset URLs without touching any model.
+    """
+    manifest = vite_manifest.load_manifest()
+    if not manifest:
+        return "dev"
+    return hashlib.sha256(json.dumps(manifest, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def _query_key(request, query_params: dict[str, Callable[[str], str | None]]) -> str | None:
+    parts = []
+    for name, normalize in sorted(query_params.items()):
+        raw = request.GET.get(name)
+        value = "" if raw is None else normalize(raw)
+        if value is None:
+            return None
+        parts.append(f"{name}={value}")
+    return "&".join(parts)
+
+
+def fragment_etag(request, scope: str, *, query_params=None, private: bool = False, period: int | None = None) -> str | None:
+    """
+    The ETag the fragment would be served with, or None when the request
+    cannot be answered from a validator.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+
+    query = _query_key(request, query_params or {})
+    if query is None:
+        return None
+
+    parts = [_build_id(), scope, scope_stamp(scope), request.path, query, "htmx" if is_htmx(request) else "page"]
+    if period:
+        parts.append(str(int(time.time() // period)))
+    if private:
+        csrf_cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME)
+        if not csrf_cookie:
+            # The render sets a new cookie; a copy held by the client would carry a dead token.
+            return None
+        parts.append(csrf_cookie)
+
+    return '"' + hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def _is_not_modified(request, etag: str) -> bool:
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if not if_none_match:
+        return False
+    tags = {t[2:] if t.startswith("W/") else t for t in parse_etags(if_none_match)}
+    return "*" in tags or etag in tags
+
+
+def _patch_validators(response, etag: str, private: bool):
+    response["ETag"] = etag
+    # Revalidate on every use; the 304 path above is what makes that cheap.
+    if private:
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ("HX-Request", "Cookie"))
+    else:
+        patch_cache_control(response, public=True, no_cache=True)
+        patch_vary_headers(response, ("HX-Request",))
+    return response
+
+
+def cached_fragment(
+    scope: str,
+    *,
+    query_params: dict[str, Callable[[str], str | None]] | None = None,
+    private: bool = False,
+    anonymous_only: bool = False,
+    period: int | None = None,
+):
+    """
+    View decorator: ETag/304 for `scope`, plus a server-side copy of public
+    fragments. A no-op unless the default cache is shared between processes.
+
+    query_params:   the GET parameters the view reads, each with a normalizer
+                    returning the value to key on (None = do not cache this
+                    request); everything else in the query string is ignored.
+    private:        the template renders {% csrf_token %} (or other per-client
+                    state keyed by cookie); no server-side copy.
+    anonymous_only: authenticated requests bypass validation entirely.
+    period:         seconds; content that also changes with time (scheduled
+                    publishing, pin expiry) is revalidated at least this often.
+    """
+    if scope not in FRAGMENT_SCOPES:
+        raise ValueError(f"Unknown fragment scope: {scope}")
+
+    def decorator(view):
+        @wraps(view)
+        def _wrapped(request, *args, **kwargs):
+            if not cache_is_shared() or (anonymous_only and request.user.is_authenticated):
+                return view(request, *args, **kwargs)
+
+            etag = fragment_etag(request, scope, query_params=query_params, private=private, period=period)
+            if etag is None:
+                return view(request, *args, **kwargs)
+
+            if _is_not_modified(request, etag):
+                log_event(logger, logging.DEBUG, "fragment_cache.not_modified", scope=scope)
+                return _patch_validators(HttpResponseNotModified(), etag, private)
+
+            body_key = None if private else f"fragment:body:{etag[1:-1]}"
+            if body_key:
+                stored = cache.get(body_key)
+                if stored is not None:
+                    log_event(logger, logging.DEBUG, "fragment_cache.hit", scope=scope)
+                    return stored
+
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200 or response.streaming:
+                return response
+
+            _patch_validators(response, etag, private)
+            if body_key:
+                cache.set(body_key, response, BODY_TIMEOUT)
+            return response
+
+        return _wrapped
+
+    return decorator
@@ -1,22 +1,36 @@
 # hr_core/image_batch.py
 
 import json
+import logging
 import os
 import time
 import urllib.request
+from datetime import timedelta
 
 import django_rq
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 
+from hr_core.instrumentation import span
 from hr_core.models import PendingVariant
 
-ALLOWED_RECIPE_KEYS = {"variant", "post_hero", "about"}
+logger = logging.getLogger(__name__)
+
+ALLOWED_RECIPE_KEYS = {"variant", "post_hero", "about", "about_thumb"}
 LAST_UPLOAD_KEY = "img:last_upload_ts"
 LAST_UPLOAD_TTL_SECONDS = 3600
 
+CLAIM_TTL_SECONDS = 900
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 600
+
 
 def _enqueue_immediate(recipe_key: str, src_name: str) -> None:
     q = django_rq.get_queue("default")
-    q.enqueue("hr_core.media_jobs.generate_variants_for_file", recipe_key, src_name)
+    with span("redis"):
+        q.enqueue("hr_core.media_jobs.generate_variants_for_file", recipe_key, src_name)
 
 
 def scale_imgbatch(quantity: int) -> bool:
@@ -39,7 +53,7 @@ def scale_imgbatch(quantity: int) -> bool:
     )
 
     try:
-        with urllib.request.urlopen(req, timeout=10) as response:
+        with span("heroku"), urllib.request.urlopen(req, timeout=10) as response:
             return 200 <= response.status < 300
     except Exception:
         return False
@@ -59,11 +73,88 @@ def schedule_image_variants(recipe_key: str, src_name: str) -> None:
 
     connection = django_rq.get_connection("default")
     now_ts = time.time()
-    connection.setex(LAST_UPLOAD_KEY, LAST_UPLOAD_TTL_SECONDS, str(now_ts))
+    with span("redis"):
+        connection.setex(LAST_UPLOAD_KEY, LAST_UPLOAD_TTL_SECONDS, str(now_ts))
 
     on_heroku = os.getenv("DYNO") is not None
     if not on_heroku or not os.getenv("HEROKU_APP_NAME") or not os.getenv("HEROKU_API_TOKEN"):
         _enqueue_immediate(recipe_key, src_name)
         return
 
-    scale_imgbatch(1)
+    scale_imgbatch(int(os.getenv("IMGBATCH_SCALE", "1")))
+
+
+# ------------------------------
+# Claim-based work distribution
+# ------------------------------
+
+def _open_rows():
+    return PendingVariant.objects.filter(processed_at__isnull=True, failed_at__isnull=True)
+
+
+def _claimable(now):
+    lease_expired = now - timedelta(seconds=CLAIM_TTL_SECONDS)
+    return _open_rows().filter(
+        Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now),
+        Q(claimed_at__isnull=True) | Q(claimed_at__lt=lease_expired),
+    )
+
+
+def claim_pending(worker_id: str, limit: int) -> list[PendingVariant]:
+    """
+    Claim up to `limit` due rows for `worker_id`, oldest first.
+
+    Rows are locked with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent
+    workers never wait on each other or claim the same row; the claim itself
+    is a lease (claimed_at) that expires after CLAIM_TTL_SECONDS in case the
+    worker dies mid-batch. Backends without row locks (SQLite) fall back to
+    the lease alone.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(_claimable(now).select_for_update(skip_locked=True).order_by("created_at")[:limit])
+        if rows:
+            PendingVariant.objects.filter(pk__in=[r.pk for r in rows]).update(claimed_at=now, claimed_by=worker_id)
+    for row in rows:
+        row.claimed_at, row.claimed_by = now, worker_id
+    return rows
+
+
+def backoff_seconds(attempts: int) -> int:
+    return min(BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), BACKOFF_MAX_SECONDS)
+
+
+def record_success(row: PendingVariant) -> None:
+    PendingVariant.objects.filter(pk=row.pk).update(
+        processed_at=timezone.now(), last_error="", next_attempt_at=None, claimed_at=None, claimed_by=""
+    )
+
+
+def record_failure(row: PendingVariant, reason: str) -> bool:
+    """
+    Count a failed attempt and schedule a retry with exponential backoff.
+    After MAX_ATTEMPTS the row is retired (failed_at) so a poison file cannot
+    keep a worker busy forever. Returns True when the row was retired.
+    """
+    now = timezone.now()
+    attempts = row.attempts + 1
+    retired = attempts >= MAX_ATTEMPTS
+    PendingVariant.objects.filter(pk=row.pk).update(
+        attempts=attempts,
+        last_error=reason[:2000],
+        next_attempt_at=None if retired else now + timedelta(seconds=backoff_seconds(attempts)),
+        failed_at=now if retired else None,
+        claimed_at=None,
+        claimed_by="",
+    )
+    if retired:
+        logger.error("imgbatch.row_retired", extra={"recipe": row.recipe_key, "src": row.src_name, "attempts": attempts, "error": reason})
+    return retired
+
+
+def has_due_work() -> bool:
+    return _claimable(timezone.now()).exists()
+
+
+def has_open_work() -> bool:
+    return _open_rows().exists()
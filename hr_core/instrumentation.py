@@ -0,0 +1,178 @@
+# hr_core/instrumentation.py
+
+"""
+Per-request performance instrumentation.
+
+- span("stripe") / @timed("mailjet") time outbound calls (Stripe, Mailjet,
+  Redis, ImageMagick, ...) and add them to the current request's stats
+- DB query count/time is captured by InstrumentationMiddleware through
+  connection.execute_wrapper
+- Route latencies and span durations feed in-process histograms that
+  render_prometheus() exports in the Prometheus text format
+
+Outside a request (RQ workers, management commands) spans still feed the
+histograms but nothing is attached to a request.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+# Seconds; roughly log-spaced from "cache hit" to "something is wrong".
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RequestStats:
+    started: float = field(default_factory=time.perf_counter)
+    db_count: int = 0
+    db_time: float = 0.0
+    db_statements: Counter = field(default_factory=Counter)
+    spans: dict[str, list[float]] = field(default_factory=dict)
+
+    def add_span(self, name: str, seconds: float) -> None:
+        entry = self.spans.setdefault(name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def max_repeated_query(self) -> int:
+        """
+        Highest execution count of a single SQL statement (parameters are not
+        part of the SQL text), i.e. the size of the worst N+1 loop.
+        """
+        return max(self.db_statements.values(), default=0)
+
+
+_current: contextvars.ContextVar[RequestStats | None] = contextvars.ContextVar("request_stats", default=None)
+
+
+def current_stats() -> RequestStats | None:
+    return _current.get()
+
+
+def start_request() -> contextvars.Token:
+    return _current.set(RequestStats())
+
+
+def end_request(token: contextvars.Token) -> None:
+    _current.reset(token)
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    """
+    connection.execute_wrapper hook: counts and times every query run while a
+    request is being instrumented.
+    """
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_time += time.perf_counter() - start
+        stats.db_count += 1
+        stats.db_statements[sql] += 1
+
+
+def record_span(name: str, seconds: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.add_span(name, seconds)
+    span_histogram.observe((name,), seconds)
+
+
+@contextmanager
+def span(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - start)
+
+
+def timed(name: str):
+    """
+    Decorator form of span().
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ------------------------------
+# Histograms / Prometheus export
+# ------------------------------
+
+class Histogram:
+
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...], buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += 1
+            series[2] += value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {k: (list(v[0]), v[1], v[2]) for k, v in self._series.items()}
+        for labels, (counts, total, value_sum) in sorted(snapshot.items()):
+            base = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(self.label_names, labels, strict=True))
+            sep = "," if base else ""
+            for bound, count in zip(self.buckets, counts, strict=True):
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {total}')
+            lines.append(f"{self.name}_count{{{base}}} {total}")
+            lines.append(f"{self.name}_sum{{{base}}} {value_sum:.6f}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+request_histogram = Histogram("hr_http_request_duration_seconds", "Request latency by route.", ("route", "method", "status"))
+db_histogram = Histogram("hr_http_request_db_queries", "SQL queries per request by route.", ("route",), buckets=(1, 2, 5, 10, 20, 50, 100, 200))
+span_histogram = Histogram("hr_upstream_duration_seconds", "Outbound call latency by upstream.", ("upstream",))
+
+HISTOGRAMS = (request_histogram, db_histogram, span_histogram)
+
+
+def render_prometheus() -> str:
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
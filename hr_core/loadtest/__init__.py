@@ -0,0 +1,9 @@
+# hr_core/loadtest/__init__.py
+
+"""
+Offline load testing for the shop funnel (see the `loadtest` management command).
+
+- fakes: local HTTP stand-ins for the Stripe API and Mailjet's send endpoint
+- journey: one simulated shopper walking browse -> pay -> webhook
+- stats: per-step latency percentiles / throughput and saved-result comparison
+"""
@@ -0,0 +1,260 @@
+# hr_core/loadtest/fakes.py
+
+"""
+Local HTTP stand-ins for Stripe and Mailjet.
+
+Both run a ThreadingHTTPServer on 127.0.0.1 in a daemon thread and are
+reached through the real SDK clients (STRIPE_API_BASE / MAILJET_API_URL), so
+connection handling, serialization and timeouts are exercised exactly as in
+production. `latency_ms` adds a fixed delay per request to approximate the
+real round trip.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+_BRACKET_RE = re.compile(r"\[([^\]]*)\]")
+
+
+def parse_stripe_form(body: str) -> dict:
+    """
+    Decode the SDK's form encoding (metadata[order_id]=1,
+    line_items[0][quantity]=1) into nested dicts; numeric keys stay strings.
+    """
+    result: dict = {}
+    for key, value in parse_qsl(body, keep_blank_values=True):
+        head = key.split("[", 1)[0]
+        parts = [head, *_BRACKET_RE.findall(key[len(head):])]
+        node = result
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = value
+    return result
+
+
+def sign_webhook_payload(payload: bytes, secret: str, timestamp: int | None = None) -> str:
+    """
+    Stripe-Signature header value for `payload` (v1 scheme).
+    """
+    ts = int(time.time()) if timestamp is None else timestamp
+    digest = hmac.new(secret.encode(), f"{ts}.".encode() + payload, hashlib.sha256).hexdigest()
+    return f"t={ts},v1={digest}"
+
+
+class _FakeServer:
+    handler_class: type[BaseHTTPRequestHandler]
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000.0
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self._httpd: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> _FakeServer:
+        handler = type("Handler", (self.handler_class,), {"fake": self})
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+    fake: _FakeServer
+
+    def log_message(self, format, *args):  # noqa: A002 - stdlib signature
+        pass
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _reply(self, status: int, payload: dict) -> None:
+        if self.fake.latency:
+            time.sleep(self.fake.latency)
+        with self.fake.lock:
+            self.fake.request_count += 1
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# ------------------------------
+# Stripe
+# ------------------------------
+
+class _StripeHandler(_JsonHandler):
+    fake: FakeStripe
+
+    def do_POST(self):
+        path = urlsplit(self.path).path.rstrip("/")
+        params = parse_stripe_form(self._body().decode())
+
+        if path == "/v1/customers":
+            return self._reply(200, self.fake.create_customer(params))
+        if path == "/v1/checkout/sessions":
+            return self._reply(200, self.fake.create_session(params))
+        self._reply(404, _stripe_error(f"Unrecognized request URL (POST: {path})"))
+
+    def do_GET(self):
+        path = urlsplit(self.path).path.rstrip("/")
+        match = re.fullmatch(r"/v1/checkout/sessions/([\w-]+)", path)
+        session = self.fake.sessions.get(match.group(1)) if match else None
+        if session is None:
+            return self._reply(404, _stripe_error(f"No such checkout.session: {path.rsplit('/', 1)[-1]}"))
+        self._reply(200, session)
+
+
+def _stripe_error(message: str) -> dict:
+    return {"error": {"type": "invalid_request_error", "message": message}}
+
+
+class FakeStripe(_FakeServer):
+    """
+    Implements what checkout needs: customer create, checkout session
+    create/retrieve. Sessions are kept in memory so retrieve and the
+    completed-event payload echo what was created.
+    """
+
+    handler_class = _StripeHandler
+
+    def __init__(self, latency_ms: float = 0.0):
+        super().__init__(latency_ms)
+        self.sessions: dict[str, dict] = {}
+        self.customers: dict[str, dict] = {}
+
+    def create_customer(self, params: dict) -> dict:
+        customer = {
+            "id": f"cus_{uuid.uuid4().hex[:14]}",
+            "object": "customer",
+            "email": params.get("email"),
+            "name": params.get("name"),
+            "metadata": params.get("metadata") or {},
+            "livemode": False,
+        }
+        with self.lock:
+            self.customers[customer["id"]] = customer
+        return customer
+
+    def create_session(self, params: dict) -> dict:
+        amount = 0
+        for item in (params.get("line_items") or {}).values():
+            amount += int((item.get("price_data") or {}).get("unit_amount") or 0) * int(item.get("quantity") or 1)
+
+        sid = f"cs_test_{uuid.uuid4().hex}"
+        session = {
+            "id": sid,
+            "object": "checkout.session",
+            "client_secret": f"{sid}_secret_{uuid.uuid4().hex[:12]}",
+            "livemode": False,
+            "amount_total": amount,
+            "currency": (params.get("currency") or "usd"),
+            "status": "open",
+            "payment_status": "unpaid",
+            "payment_intent": None,
+            "expires_at": int(time.time()) + 24 * 3600,
+            "customer": params.get("customer"),
+            "customer_email": params.get("customer_email"),
+            "ui_mode": params.get("ui_mode") or "hosted",
+            "mode": params.get("mode") or "payment",
+            "return_url": params.get("return_url"),
+            "metadata": params.get("metadata") or {},
+        }
+        with self.lock:
+            self.sessions[sid] = session
+        return session
+
+    def complete_session(self, session_id: str) -> dict:
+        """
+        Mark a session paid and return the checkout.session.completed event
+        Stripe would deliver for it.
+        """
+        with self.lock:
+            session = self.sessions[session_id]
+            session.update(status="complete", payment_status="paid", payment_intent=f"pi_{uuid.uuid4().hex[:24]}")
+            data = dict(session)
+        return {
+            "id": f"evt_{uuid.uuid4().hex[:24]}",
+            "object": "event",
+            "api_version": "2024-06-20",
+            "created": int(time.time()),
+            "livemode": False,
+            "type": "checkout.session.completed",
+            "data": {"object": data},
+        }
+
+
+# ------------------------------
+# Mailjet
+# ------------------------------
+
+class _MailjetHandler(_JsonHandler):
+    fake: FakeMailjet
+
+    def do_POST(self):
+        if urlsplit(self.path).path.rstrip("/") != "/v3.1/send":
+            return self._reply(404, {"ErrorMessage": "Not found"})
+        payload = json.loads(self._body() or b"{}")
+        self._reply(200, self.fake.accept(payload.get("Messages") or []))
+
+
+class FakeMailjet(_FakeServer):
+    """
+    Accepts v3.1 /send and keeps every message, indexed by recipient, so a
+    journey can read its confirmation link back out.
+    """
+
+    handler_class = _MailjetHandler
+
+    def __init__(self, latency_ms: float = 0.0):
+        super().__init__(latency_ms)
+        self.outbox: dict[str, list[dict]] = {}
+
+    def accept(self, messages: list[dict]) -> dict:
+        results = []
+        with self.lock:
+            for message in messages:
+                recipients = [r.get("Email", "").lower() for r in message.get("To") or []]
+                for email in recipients:
+                    self.outbox.setdefault(email, []).append(message)
+                results.append({
+                    "Status": "success",
+                    "CustomID": message.get("CustomID", ""),
+                    "To": [{"Email": e, "MessageUUID": str(uuid.uuid4()), "MessageID": 0} for e in recipients],
+                })
+        return {"Messages": results}
+
+    def messages_for(self, email: str) -> list[dict]:
+        with self.lock:
+            return list(self.outbox.get(email.lower(), ()))
@@ -0,0 +1,156 @@
+# hr_core/loadtest/journey.py
+
+"""
+One simulated guest shopper.
+
+Drives the real URL conf through django.test.Client (full middleware stack,
+sessions, cookies; no network hop to the app itself) and times every request
+under a step name. Outbound Stripe/Mailjet calls go to the fakes over HTTP,
+or stay in process when the run uses the MockGateway.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+import time
+from dataclasses import dataclass
+
+from django.test import Client
+from django.urls import reverse
+
+from hr_core.loadtest.fakes import FakeMailjet, FakeStripe, sign_webhook_payload
+from hr_core.loadtest.stats import Recorder
+from hr_core.services.payments import MockGateway
+
+STEPS = (
+    "browse",
+    "product_modal",
+    "add_to_cart",
+    "checkout_details",
+    "details_submit",
+    "confirm_email",
+    "create_order",
+    "checkout_pay",
+    "stripe_session",
+    "webhook",
+)
+
+HTMX = {"HTTP_HX_REQUEST": "true"}
+
+
+class JourneyAborted(Exception):
+    def __init__(self, step: str, detail: str):
+        super().__init__(f"{step}: {detail}")
+        self.step = step
+
+
+@dataclass(frozen=True)
+class CatalogItem:
+    product_slug: str
+    variant_slug: str
+
+
+class Shopper:
+
+    def __init__(self, *, index: int, run_id: str, catalog: list[CatalogItem], recorder: Recorder,
+                 payments: FakeStripe | MockGateway, mailjet_fake: FakeMailjet, webhook_secret: str, seed: int = 0):
+        self.index = index
+        self.email = f"shopper{index}+{run_id}@loadtest.invalid"
+        self.rng = random.Random(seed + index)
+        self.catalog = catalog
+        self.recorder = recorder
+        self.payments = payments
+        self.mailjet_fake = mailjet_fake
+        self.webhook_secret = webhook_secret
+        self.client = Client()
+        self.failure: str | None = None
+
+    def _timed(self, step: str, call, *, expect=(200,)):
+        start = time.perf_counter()
+        try:
+            response = call()
+        except Exception as exc:
+            self.recorder.record(step, time.perf_counter() - start, ok=False)
+            raise JourneyAborted(step, f"{type(exc).__name__}: {exc}") from exc
+        ok = response.status_code in expect
+        self.recorder.record(step, time.perf_counter() - start, ok=ok)
+        if not ok:
+            raise JourneyAborted(step, f"HTTP {response.status_code}")
+        return response
+
+    def run(self) -> bool:
+        """
+        Walk the whole funnel once. Returns False when a step failed (the
+        failure is already recorded against that step).
+        """
+        try:
+            self._run()
+        except JourneyAborted as exc:
+            self.failure = str(exc)
+            return False
+        return True
+
+    def _run(self) -> None:
+        c = self.client
+        item = self.rng.choice(self.catalog)
+
+        self._timed("browse", lambda: c.get(reverse("index")))
+        self._timed("product_modal", lambda: c.get(reverse("hr_shop:get_product_modal_partial", args=[item.product_slug]), **HTMX))
+        self._timed("add_to_cart", lambda: c.post(reverse("hr_shop:add_to_cart", args=[item.variant_slug]), **HTMX), expect=(200, 204))
+        self._timed("checkout_details", lambda: c.get(reverse("hr_shop:checkout_details"), **HTMX))
+        self._timed("details_submit", lambda: c.post(reverse("hr_shop:checkout_details_submit"), self._details_form(), **HTMX))
+
+        confirm_path = self._confirmation_path()
+        self._timed("confirm_email", lambda: c.get(confirm_path), expect=(302,))
+
+        resp = self._timed("create_order", lambda: c.post(reverse("hr_shop:checkout_create_order"), **HTMX), expect=(200, 204))
+        order_id = _order_id_from_modal_trigger(resp)
+        if order_id is None:
+            raise JourneyAborted("create_order", "no checkout_pay URL in response")
+
+        self._timed("checkout_pay", lambda: c.get(reverse("hr_shop:checkout_pay", args=[order_id]), **HTMX))
+        resp = self._timed("stripe_session", lambda: c.post(reverse("hr_payment:checkout_stripe_session", args=[order_id])))
+        session_id = resp.json().get("sessionId")
+
+        event = self.payments.complete_session(session_id)
+        payload = json.dumps(event).encode()
+        self._timed("webhook", lambda: c.post(
+            reverse("hr_payment:stripe-webhook"), payload, content_type="application/json",
+            HTTP_STRIPE_SIGNATURE=sign_webhook_payload(payload, self.webhook_secret),
+        ))
+
+    def _details_form(self) -> dict:
+        return {
+            "email": self.email,
+            "first_name": "Load",
+            "last_name": f"Shopper {self.index}",
+            "street_address": f"{100 + self.index} Test St",
+            "building_type": "single_family",
+            "city": "Denver",
+            "subdivision": "CO",
+            "postal_code": "80202",
+        }
+
+    def _confirmation_path(self) -> str:
+        # The link is absolute (SITE_URL), but only its path matters here.
+        prefix = reverse("hr_shop:email_confirmation_process_response", kwargs={"token": "t"})[:-2]
+        pattern = re.compile(re.escape(prefix) + r"[^/\s\"]+/")
+        for message in reversed(self.mailjet_fake.messages_for(self.email)):
+            match = pattern.search(message.get("TextPart") or "")
+            if match:
+                return match.group(0)
+        self.recorder.record("confirm_email", 0.0, ok=False)
+        raise JourneyAborted("confirm_email", "no confirmation email captured")
+
+
+def _order_id_from_modal_trigger(response) -> int | None:
+    """
+    checkout_create_order answers with an HX trigger that loads the pay modal;
+    pull the order id back out of that URL.
+    """
+    prefix = reverse("hr_shop:checkout_pay", args=[0]).rsplit("0/", 1)[0]
+    text = " ".join(filter(None, [response.get("HX-Trigger"), response.get("HX-Trigger-After-Settle"), response.content.decode(errors="ignore")]))
+    match = re.search(re.escape(prefix) + r"(\d+)/", text.replace("\\/", "/"))
+    return int(match.group(1)) if match else None
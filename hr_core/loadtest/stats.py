@@ -0,0 +1,109 @@
+# hr_core/loadtest/stats.py
+
+"""
+Latency aggregation and saved-result comparison for load-test runs.
+
+A result file is plain JSON:
+
+    {"version": 1, "meta": {...run parameters, git sha...},
+     "steps": {"browse": {"count", "errors", "rps", "p50_ms", "p95_ms", "p99_ms", "max_ms"}, ...}}
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+RESULTS_VERSION = 1
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list (0.0 for an empty one).
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass
+class StepSamples:
+    durations: list[float] = field(default_factory=list)
+    errors: int = 0
+
+
+class Recorder:
+    """
+    Thread-safe sink for per-step timings from concurrent shoppers.
+    """
+
+    def __init__(self):
+        self._steps: dict[str, StepSamples] = {}
+        self._lock = threading.Lock()
+
+    def record(self, step: str, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            samples = self._steps.setdefault(step, StepSamples())
+            samples.durations.append(seconds)
+            if not ok:
+                samples.errors += 1
+
+    def summary(self, wall_seconds: float) -> dict[str, dict]:
+        out = {}
+        with self._lock:
+            items = [(name, sorted(s.durations), s.errors) for name, s in self._steps.items()]
+        for name, durations, errors in items:
+            out[name] = {
+                "count": len(durations),
+                "errors": errors,
+                "rps": round(len(durations) / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+                "p50_ms": round(percentile(durations, 50) * 1000, 2),
+                "p95_ms": round(percentile(durations, 95) * 1000, 2),
+                "p99_ms": round(percentile(durations, 99) * 1000, 2),
+                "max_ms": round((durations[-1] if durations else 0.0) * 1000, 2),
+            }
+        return out
+
+
+def write_results(path: Path, *, meta: dict, steps: dict) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"version": RESULTS_VERSION, "meta": meta, "steps": steps}, indent=2) + "\n", encoding="utf-8")
+    return path
+
+
+def load_results(path: Path) -> dict:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if data.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path}: unsupported results version {data.get('version')!r}")
+    return data
+
+
+def latest_results(directory: Path, exclude: Path | None = None) -> Path | None:
+    """
+    Most recent result file in `directory` (names start with a UTC timestamp).
+    """
+    files = sorted(p for p in Path(directory).glob("*.json") if p != exclude)
+    return files[-1] if files else None
+
+
+def compare(baseline: dict, current: dict, *, metric: str = "p95_ms", threshold_pct: float = 20.0) -> list[dict]:
+    """
+    Per-step change of `metric` against a baseline result. Rows are flagged
+    as regressions when they got slower by more than threshold_pct, or when
+    a step that used to succeed now reports errors.
+    """
+    rows = []
+    for step, now in current["steps"].items():
+        before = baseline["steps"].get(step)
+        if before is None:
+            rows.append({"step": step, "before": None, "after": now[metric], "change_pct": None, "regression": False})
+            continue
+        old, new = before[metric], now[metric]
+        change = ((new - old) / old * 100.0) if old else 0.0
+        regression = change > threshold_pct or (now["errors"] > 0 and before["errors"] == 0)
+        rows.append({"step": step, "before": old, "after": new, "change_pct": round(change, 1), "regression": regression})
+    return rows
@@ -1,55 +1,116 @@
 # hr_core/management/commands/imgbatch.py
 
+import multiprocessing
+import os
+import socket
 import time
-import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from random import randint
 
+import django
 import django_rq
 from django.core.management.base import BaseCommand
-from django.utils import timezone
 
-from hr_core.image_batch import LAST_UPLOAD_KEY, scale_imgbatch
+from hr_core.image_batch import LAST_UPLOAD_KEY, claim_pending, has_due_work, has_open_work, record_failure, record_success, scale_imgbatch
 from hr_core.media_jobs import generate_variants_for_file
-from hr_core.models import PendingVariant
 
-LOCK_KEY = "img:batch_lock"
-LOCK_TTL_SECONDS = 900
 DEBOUNCE_SECONDS = 300
 
 
 class Command(BaseCommand):
-    help = "Process debounced image variant batches."
+    help = "Process debounced image variant batches. Safe to run on several machines at once: rows are claimed with SKIP LOCKED."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: IMGBATCH_WORKERS or CPU count). 1 processes inline.")
+        parser.add_argument("--batch-size", type=int, default=None, help="Rows claimed per round (default: 2 x workers).")
 
     def handle(self, *args, **options):
+        workers = max(1, options["workers"] or int(os.getenv("IMGBATCH_WORKERS", "0")) or os.cpu_count() or 1)
+        batch_size = max(1, options["batch_size"] or workers * 2)
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"[:64]
         connection = django_rq.get_connection("default")
-        lock_value = str(uuid.uuid4())
-        lock_acquired = connection.set(LOCK_KEY, lock_value, nx=True, ex=LOCK_TTL_SECONDS)
-
-        if not lock_acquired:
-            self.stdout.write(self.style.WARNING("Batch lock already held; exiting."))
-            return
 
+        self.pool = None
         try:
             while True:
                 if not _wait_for_quiet_period(connection):
                     break
 
-                processed_any = _process_pending()
+                processed_any = self._process_pending(worker_id, workers, batch_size)
 
                 last_upload_ts = _get_last_upload_ts(connection)
                 if last_upload_ts and _seconds_since(last_upload_ts) < DEBOUNCE_SECONDS:
                     continue
 
-                if PendingVariant.objects.filter(processed_at__isnull=True).exists():
-                    if processed_any:
+                if has_open_work():
+                    if processed_any or has_due_work():
                         continue
+                    # Remaining rows are backing off or claimed by another worker.
                     time.sleep(5)
                     continue
 
                 break
         finally:
-            scale_imgbatch(0)
-            _release_lock(connection, lock_value)
+            if self.pool is not None:
+                self.pool.shutdown(cancel_futures=True)
+            # Other workers may still hold claims; the last one out scales the formation down.
+            if not has_open_work():
+                scale_imgbatch(0)
+
+    def _process_pending(self, worker_id: str, workers: int, batch_size: int) -> bool:
+        rows = claim_pending(worker_id, batch_size)
+        if not rows:
+            return False
+
+        if workers == 1:
+            for row in rows:
+                _settle(row, _run_one(row.recipe_key, row.src_name))
+            return True
+
+        if self.pool is None:
+            # spawn, not fork: children must not inherit the parent's DB connection.
+            self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=django.setup)
+
+        futures = {self.pool.submit(_run_one, row.recipe_key, row.src_name): row for row in rows}
+        broken = False
+        for future in as_completed(futures):
+            row = futures[future]
+            try:
+                outcome = future.result()
+            except BrokenProcessPool:
+                broken = True
+                outcome = (False, "worker process died")
+            except Exception as exc:
+                outcome = (False, f"{type(exc).__name__}: {exc}")
+            _settle(row, outcome)
+
+        if broken:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+        return True
+
+
+def _run_one(recipe_key: str, src_name: str) -> tuple[bool, str]:
+    """
+    Pool entry point; returns a picklable outcome instead of raising.
+    """
+    try:
+        result = generate_variants_for_file(recipe_key, src_name)
+    except Exception as exc:
+        return False, str(exc) or type(exc).__name__
+
+    if result.get("ok"):
+        return True, ""
+    return False, result.get("reason", "unknown_error")
+
+
+def _settle(row, outcome: tuple[bool, str]) -> None:
+    ok, reason = outcome
+    if ok:
+        record_success(row)
+    else:
+        record_failure(row, reason)
 
 
 def _get_last_upload_ts(connection) -> float | None:
@@ -74,35 +135,3 @@ def _wait_for_quiet_period(connection) -> bool:
         if _seconds_since(last_upload_ts) >= DEBOUNCE_SECONDS:
             return True
         time.sleep(randint(10, 20))
-
-
-def _process_pending() -> bool:
-    pending = PendingVariant.objects.filter(processed_at__isnull=True).order_by("created_at")
-    if not pending.exists():
-        return False
-
-    for row in pending:
-        try:
-            result = generate_variants_for_file(row.recipe_key, row.src_name)
-        except Exception as exc:
-            row.attempts += 1
-            row.last_error = str(exc)
-            row.save(update_fields=["attempts", "last_error"])
-            continue
-
-        if result.get("ok"):
-            row.processed_at = timezone.now()
-            row.last_error = ""
-            row.save(update_fields=["processed_at", "last_error"])
-        else:
-            row.attempts += 1
-            row.last_error = result.get("reason", "unknown_error")
-            row.save(update_fields=["attempts", "last_error"])
-
-    return True
-
-
-def _release_lock(connection, lock_value: str) -> None:
-    current = connection.get(LOCK_KEY)
-    if current and current.decode("utf-8") == lock_value:
-        connection.delete(LOCK_KEY)
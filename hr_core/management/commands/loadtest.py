@@ -0,0 +1,212 @@
+# hr_core/management/commands/loadtest.py
+
+import os
+import subprocess
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from hr_core.loadtest.fakes import FakeMailjet, FakeStripe
+from hr_core.loadtest.journey import STEPS, CatalogItem, Shopper
+from hr_core.loadtest.stats import Recorder, compare, latest_results, load_results, write_results
+from hr_core.services.payments import get_gateway, reset_gateways
+from hr_email.mailjet import get_mailjet_client
+from hr_shop.models import Product
+
+DEFAULT_RESULTS_DIR = Path(settings.BASE_DIR) / "benchmarks" / "results"
+DEV_ONLY_MIDDLEWARE = ("debug_toolbar.", "django_browser_reload.")
+LOADTEST_SECRETS = {
+    "STRIPE_SECRET_KEY": "sk_test_loadtest",
+    "STRIPE_PUBLIC_KEY": "pk_test_loadtest",
+    "STRIPE_WEBHOOK_SECRET": "whsec_loadtest",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Run concurrent guest-checkout journeys (browse -> product modal -> cart -> details -> confirm email -> order -> pay -> webhook) "
+        "against local Stripe/Mailjet fakes and report per-step latency. Writes real rows: point it at a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--shoppers", type=int, default=50, help="Journeys to run (default: 50).")
+        parser.add_argument("--concurrency", type=int, default=10, help="Shoppers in flight at once (default: 10).")
+        parser.add_argument("--warmup", type=int, default=2, help="Unrecorded journeys run first to warm caches (default: 2).")
+        parser.add_argument(
+            "--gateway", choices=("stripe", "mock"), default="stripe",
+            help="stripe: StripeGateway against the local HTTP fake (default). mock: in-process MockGateway, no Stripe network hop.",
+        )
+        parser.add_argument("--stripe-latency-ms", type=float, default=150.0, help="Added latency per fake Stripe call (default: 150).")
+        parser.add_argument("--mailjet-latency-ms", type=float, default=80.0, help="Added latency per fake Mailjet send (default: 80).")
+        parser.add_argument("--seed", type=int, default=0, help="Seed for per-shopper product choice.")
+        parser.add_argument("--output", type=Path, default=None, help=f"Result file (default: {DEFAULT_RESULTS_DIR}/<timestamp>-<sha>.json).")
+        parser.add_argument("--compare", default=None, help="Baseline result file to compare against, or 'latest' for the newest saved run.")
+        parser.add_argument("--threshold", type=float, default=20.0, help="p95 slowdown (percent) reported as a regression (default: 20).")
+        parser.add_argument("--fail-on-regression", action="store_true", help="Exit non-zero when a step regressed against the baseline.")
+
+    def handle(self, *args, **options):
+        catalog = _load_catalog()
+        if settings.DEBUG:
+            self.stdout.write(self.style.WARNING("DEBUG is on; expect slower numbers than production settings."))
+        if connections["default"].vendor == "sqlite" and options["concurrency"] > 1:
+            self.stdout.write(self.style.WARNING("SQLite allows one writer at a time; concurrent shoppers will hit 'database is locked'. Use Postgres."))
+        run_id = uuid.uuid4().hex[:8]
+        recorder = Recorder()
+
+        with ExitStack() as stack:
+            stripe_fake = stack.enter_context(FakeStripe(latency_ms=options["stripe_latency_ms"]))
+            mailjet_fake = stack.enter_context(FakeMailjet(latency_ms=options["mailjet_latency_ms"]))
+            _wire_fakes(stack, stripe_fake, mailjet_fake, gateway=options["gateway"])
+            payments = stripe_fake if options["gateway"] == "stripe" else get_gateway()
+            if options["gateway"] == "mock":
+                # Journeys sign webhooks with the loadtest secret; the mock checks them like Stripe would.
+                payments.webhook_secret = LOADTEST_SECRETS["STRIPE_WEBHOOK_SECRET"]
+
+            def journey(index: int, sink: Recorder) -> str | None:
+                shopper = Shopper(
+                    index=index, run_id=run_id, catalog=catalog, recorder=sink, seed=options["seed"],
+                    payments=payments, mailjet_fake=mailjet_fake, webhook_secret=LOADTEST_SECRETS["STRIPE_WEBHOOK_SECRET"],
+                )
+                shopper.run()
+                return shopper.failure
+
+            def in_worker(index: int) -> str | None:
+                try:
+                    return journey(index, recorder)
+                finally:
+                    connections.close_all()
+
+            for i in range(options["warmup"]):
+                journey(-1 - i, Recorder())
+
+            shoppers = max(1, options["shoppers"])
+            concurrency = max(1, min(options["concurrency"], shoppers))
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="shopper") as pool:
+                failures = Counter(f for f in pool.map(in_worker, range(shoppers)) if f)
+            wall = time.perf_counter() - started
+        completed = shoppers - sum(failures.values())
+
+        steps = recorder.summary(wall)
+        meta = {
+            "run_id": run_id,
+            "started_at": timezone.now().isoformat(),
+            "git_sha": _git_sha(),
+            "shoppers": shoppers,
+            "concurrency": concurrency,
+            "gateway": options["gateway"],
+            "completed_journeys": completed,
+            "wall_seconds": round(wall, 3),
+            "journeys_per_second": round(completed / wall, 2) if wall else 0.0,
+            "stripe_latency_ms": options["stripe_latency_ms"],
+            "mailjet_latency_ms": options["mailjet_latency_ms"],
+            "stripe_requests": stripe_fake.request_count,
+            "mailjet_requests": mailjet_fake.request_count,
+            "database": connections["default"].vendor,
+            "failures": dict(failures.most_common(10)),
+        }
+
+        self.meta = meta
+        self._print_summary(meta, steps)
+
+        output = options["output"] or DEFAULT_RESULTS_DIR / f"{timezone.now():%Y%m%dT%H%M%S}-{meta['git_sha'] or 'nogit'}.json"
+        write_results(output, meta=meta, steps=steps)
+        self.stdout.write(f"Saved {output}")
+
+        if options["compare"]:
+            self._compare(options, output, steps)
+
+    def _print_summary(self, meta: dict, steps: dict) -> None:
+        self.stdout.write(
+            f"{meta['completed_journeys']}/{meta['shoppers']} journeys completed in {meta['wall_seconds']}s "
+            f"({meta['journeys_per_second']}/s, concurrency {meta['concurrency']})"
+        )
+        self.stdout.write(f"{'step':<18}{'count':>7}{'errors':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for name in [s for s in STEPS if s in steps]:
+            row = steps[name]
+            line = f"{name:<18}{row['count']:>7}{row['errors']:>8}{row['rps']:>9}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}{row['max_ms']:>10}"
+            self.stdout.write(self.style.ERROR(line) if row["errors"] else line)
+        for reason, count in meta["failures"].items():
+            self.stdout.write(self.style.ERROR(f"  {count}x {reason}"))
+
+    def _compare(self, options, output: Path, steps: dict) -> None:
+        if options["compare"] == "latest":
+            baseline_path = latest_results(output.parent, exclude=output)
+            if baseline_path is None:
+                self.stdout.write("No earlier result to compare against.")
+                return
+        else:
+            baseline_path = Path(options["compare"])
+
+        baseline = load_results(baseline_path)
+        drift = [k for k in ("concurrency", "gateway", "stripe_latency_ms", "mailjet_latency_ms", "database") if baseline["meta"].get(k) != self.meta.get(k)]
+        if drift:
+            self.stdout.write(self.style.WARNING(f"Baseline ran with different {', '.join(drift)}; numbers are not directly comparable."))
+        rows = compare(baseline, {"steps": steps}, threshold_pct=options["threshold"])
+        self.stdout.write(f"p95 vs {baseline_path.name} (git {baseline['meta'].get('git_sha') or '?'}):")
+        for row in rows:
+            change = "new" if row["change_pct"] is None else f"{row['change_pct']:+.1f}%"
+            line = f"  {row['step']:<18}{row['before'] if row['before'] is not None else '-':>10} -> {row['after']:>10}  {change}"
+            self.stdout.write(self.style.ERROR(line) if row["regression"] else line)
+
+        regressed = [r["step"] for r in rows if r["regression"]]
+        if regressed and options["fail_on_regression"]:
+            raise CommandError(f"Regressed: {', '.join(regressed)}")
+
+
+def _load_catalog() -> list[CatalogItem]:
+    items = []
+    for product in Product.objects.filter(active=True).prefetch_related("variants"):
+        variant = product.display_variant
+        if variant is not None and variant.active:
+            items.append(CatalogItem(product_slug=product.slug, variant_slug=variant.slug))
+    if not items:
+        raise CommandError("No active products with an active variant; run `manage.py seed_hr_shop` first.")
+    return items
+
+
+def _wire_fakes(stack: ExitStack, stripe_fake: FakeStripe, mailjet_fake: FakeMailjet, *, gateway: str = "stripe") -> None:
+    """
+    Point Stripe/Mailjet at the fakes and swap in throwaway credentials for
+    the duration of the run.
+    """
+    stack.enter_context(mock.patch.dict(os.environ))
+    for name, value in LOADTEST_SECRETS.items():
+        os.environ.pop(f"{name}_FILE", None)
+        os.environ[name] = value
+
+    stack.enter_context(override_settings(
+        PAYMENT_PROVIDER=gateway.upper(),
+        STRIPE_API_BASE=stripe_fake.url,
+        MAILJET_API_URL=mailjet_fake.url,
+        MAILJET_API_KEY="loadtest",
+        MAILJET_API_SECRET="loadtest",
+        EMAIL_PROVIDER="mailjet",
+        EMAIL_SEND_MODE="rest",
+        ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+        # The toolbar rewrites redirects into interstitial pages and dominates timings.
+        MIDDLEWARE=[m for m in settings.MIDDLEWARE if not m.startswith(DEV_ONLY_MIDDLEWARE)],
+    ))
+
+    get_mailjet_client.cache_clear()
+    stack.callback(get_mailjet_client.cache_clear)
+    reset_gateways()
+    stack.callback(reset_gateways)
+
+
+def _git_sha() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return out.stdout.strip() if out.returncode == 0 else ""
@@ -18,7 +18,7 @@ class Command(BaseCommand):
         parser.add_argument(
             "--recipe",
             choices=sorted(RECIPES.keys()),
-            help="Only sweep a specific recipe (e.g. wipe, background, post_hero, variant, about).",
+            help="Only sweep a specific recipe (e.g. wipe, background, post_hero, variant, about, about_thumb).",
         )
         parser.add_argument(
             "--run-now",
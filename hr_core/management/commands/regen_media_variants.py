@@ -17,8 +17,8 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument(
             "--recipe",
-            choices=["post_hero", "variant", "about"],
-            help="Only regenerate a specific recipe (post_hero, variant, about).",
+            choices=["post_hero", "variant", "about", "about_thumb"],
+            help="Only regenerate a specific recipe (post_hero, variant, about, about_thumb).",
         )
         parser.add_argument("--limit", type=int, help="Limit number of records processed per recipe.")
         parser.add_argument("--since", type=int, help="Only include records updated/created in the last N days.")
@@ -32,6 +32,7 @@ class Command(BaseCommand):
             "post_hero": (Post, "hero", "updated_at"),
             "variant": (ProductImage, "image", "created_at"),
             "about": (CarouselSlide, "image", "updated_at"),
+            "about_thumb": (CarouselSlide, "image", "updated_at"),
         }
 
         keys = [recipe_key] if recipe_key else list(mapping.keys())
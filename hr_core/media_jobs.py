@@ -1,16 +1,22 @@
 # hr_core/media_jobs.py
 
+import io
 import logging
+import re
 import shutil
 import subprocess
 import tempfile
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 
+from hr_core import variant_manifest
+from hr_core.instrumentation import span
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,12 +42,20 @@ class Recipe:
     quality: int = 82
     webp_method: int = 6
 
+    # Encoded from the same decoded/resized frame. WebP is always written and
+    # stays the <img>/srcset fallback; the rest are offered as typed sources.
+    formats: tuple[str, ...] = ("webp", "avif")
+    avif_quality: int = 55
+    avif_speed: int = 6
+    jxl_effort: int = 7
+
 
 RECIPES: dict[str, Recipe] = {
     # existing media-based ones stay "media"
     "post_hero":  Recipe(src_root="media", src_rel_dir="posts/hero",  out_subdir="opt",      widths=(640, 960, 1280, 1600),       crop=CropSpec(16, 9)),
     "variant":    Recipe(src_root="media", src_rel_dir="variants",    out_subdir="opt_webp", widths=(256, 512, 768),              crop=CropSpec(1, 1)),
     "about":      Recipe(src_root="media", src_rel_dir="hr_about",    out_subdir="opt_webp", widths=(640, 960, 1280, 1600, 1920), crop=CropSpec(3, 2)),
+    "about_thumb": Recipe(src_root="media", src_rel_dir="hr_about",   out_subdir="thumb_webp", widths=(220,),                    crop=CropSpec(1, 1), quality=80),
 
     # backgrounds + wipes become repo assets
     "bg_section":   Recipe(src_root="repo_static", src_rel_dir="hr_core/images/backgrounds", out_subdir="bg_opt",   widths=(960, 1920),             crop=None),
@@ -49,18 +63,57 @@ RECIPES: dict[str, Recipe] = {
 }
 
 
-def _run_imagemagick_convert(args, env=None):
+PRIMARY_FORMAT = "webp"
+PLACEHOLDER_WIDTH = 32
+PLACEHOLDER_QUALITY = 40
+
+_FORMAT_LINE = re.compile(r"^\s*([A-Z0-9-]+)\*?\s+\S+\s+[r-]w")
+
+
+def _imagemagick_cmd() -> list[str]:
     magick = shutil.which("magick")
     convert = shutil.which("convert")
 
     if magick:
-        cmd = [magick, "convert", *args]   # IM7 style
-    elif convert:
-        cmd = [convert, *args]            # IM6 style
-    else:
-        raise FileNotFoundError("Neither 'magick' nor 'convert' found in PATH")
+        return [magick, "convert"]   # IM7 style
+    if convert:
+        return [convert]             # IM6 style
+    raise FileNotFoundError("Neither 'magick' nor 'convert' found in PATH")
 
-    subprocess.run(cmd, check=True, env=env, capture_output=True, text=True)
+
+def _run_imagemagick_convert(args, env=None):
+    cmd = [*_imagemagick_cmd(), *args]
+
+    with span("imagemagick"):
+        subprocess.run(cmd, check=True, env=env, capture_output=True, text=True)
+
+
+@lru_cache(maxsize=1)
+def _writable_formats() -> frozenset[str] | None:
+    """
+    Formats the local ImageMagick build can encode (AVIF/JXL depend on
+    delegates). None when it cannot be asked; callers then try everything.
+    """
+    try:
+        out = subprocess.run([*_imagemagick_cmd(), "-list", "format"], check=True, capture_output=True, text=True).stdout
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return None
+    return frozenset(m.group(1).lower() for m in map(_FORMAT_LINE.match, out.splitlines()) if m)
+
+
+def _recipe_formats(recipe: Recipe) -> tuple[str, ...]:
+    """
+    Formats to write for `recipe`: the primary first, then every extra format
+    this host can encode.
+    """
+    extras = [f for f in recipe.formats if f != PRIMARY_FORMAT]
+    writable = _writable_formats()
+    if writable is not None:
+        missing = [f for f in extras if f not in writable]
+        if missing:
+            logger.warning("media_job.format_unsupported", extra={"formats": missing})
+        extras = [f for f in extras if f in writable]
+    return (PRIMARY_FORMAT, *extras)
 
 
 def _target_size(w: int, crop: CropSpec) -> tuple[int, int]:
@@ -68,8 +121,8 @@ def _target_size(w: int, crop: CropSpec) -> tuple[int, int]:
     return w, h
 
 
-def _out_path_for(src: Path, out_dir: Path, w: int) -> Path:
-    return out_dir / f"{src.stem}-{w}w.webp"
+def _out_path_for(src: Path, out_dir: Path, w: int, fmt: str = PRIMARY_FORMAT) -> Path:
+    return out_dir / f"{src.stem}-{w}w.{fmt}"
 
 
 def _is_up_to_date(src: Path, out: Path) -> bool:
@@ -101,39 +154,106 @@ def _get_roots(recipe: Recipe) -> tuple[Path, Path]:
     return src_root, out_root
 
 
-def _build_convert_args(src: Path, out: Path, recipe: Recipe, w: int) -> list[str]:
+def _static_name(path: Path, static_root: Path) -> str:
+    """
+    Static-relative (URL) name for a file under REPO_STATIC_ROOT, as used by the manifest.
+    """
+    try:
+        return path.resolve().relative_to(static_root).as_posix()
+    except ValueError:
+        return path.name
+
+
+def _encode_args(recipe: Recipe, fmt: str) -> list[str]:
+    if fmt == "avif":
+        return ["-quality", str(recipe.avif_quality), "-define", f"heic:speed={recipe.avif_speed}"]
+    if fmt == "jxl":
+        return ["-quality", str(recipe.quality), "-define", f"jxl:effort={recipe.jxl_effort}"]
+    return ["-quality", str(recipe.quality), "-define", f"webp:method={recipe.webp_method}"]
+
+
+def _build_convert_args(src: Path, outs: dict[str, Path], recipe: Recipe, w: int) -> list[str]:
+    """
+    One convert invocation for every format at width `w`: the source is
+    decoded and resized once, then written per format (`-write` for all but
+    the last output).
+    """
     if recipe.crop is None:
-        return [
+        args = [
             str(src),
             "-auto-orient",
             "-strip",
             "-resize",
-            f"{w}x",
-            "-quality",
-            str(recipe.quality),
-            "-define",
-            f"webp:method={recipe.webp_method}",
-            str(out)
+            f"{w}x"
         ]
+    else:
+        tw, th = _target_size(w, recipe.crop)
+        size = f"{tw}x{th}"
+        args = [
+            str(src),
+            "-auto-orient",
+            "-strip",
+            "-resize",
+            f"{size}^",
+            "-gravity",
+            "center",
+            "-extent",
+            size
+        ]
+
+    items = list(outs.items())
+    for fmt, out in items[:-1]:
+        args += [*_encode_args(recipe, fmt), "-write", str(out)]
+    fmt, out = items[-1]
+    args += [*_encode_args(recipe, fmt), str(out)]
+    return args
+
+
+def _describe_outputs(paths: dict[str, Path], names: dict[str, str]) -> list[variant_manifest.VariantInfo]:
+    primary = variant_manifest.describe_file(paths[PRIMARY_FORMAT], names[PRIMARY_FORMAT])
+    infos = [primary]
+    for fmt, path in paths.items():
+        if fmt != PRIMARY_FORMAT:
+            # Same frame as the primary, so reuse its geometry instead of decoding (Pillow cannot read JPEG XL).
+            infos.append(variant_manifest.describe_file(path, names[fmt], dimensions=(primary.width, primary.height)))
+    return infos
 
-    tw, th = _target_size(w, recipe.crop)
-    size = f"{tw}x{th}"
-    return [
-        str(src),
-        "-auto-orient",
-        "-strip",
-        "-resize",
-        f"{size}^",
-        "-gravity",
-        "center",
-        "-extent",
-        size,
-        "-quality",
-        str(recipe.quality),
-        "-define",
-        f"webp:method={recipe.webp_method}",
-        str(out)
-    ]
+
+def _placeholder_name(out_rel_dir: str, stem: str) -> str:
+    return f"{out_rel_dir}/{stem}-lqip.webp"
+
+
+def _placeholder_info(src: Path, recipe: Recipe, name: str) -> variant_manifest.VariantInfo | None:
+    """
+    Blurred PLACEHOLDER_WIDTH-px WebP of the recipe's framing, for inlining
+    as a data URI. None for sources with real transparency (the backdrop
+    would show through them once loaded) or that Pillow cannot read.
+    """
+    from PIL import Image, ImageFilter, ImageOps
+
+    try:
+        with Image.open(src) as im:
+            im.draft("RGB", (PLACEHOLDER_WIDTH * 4, PLACEHOLDER_WIDTH * 4))
+            im = ImageOps.exif_transpose(im)
+            if im.mode in ("RGBA", "LA", "PA") or "transparency" in im.info:
+                if im.convert("RGBA").getchannel("A").getextrema()[0] < 255:
+                    return None
+            im = im.convert("RGB")
+
+            if recipe.crop is not None:
+                size = _target_size(PLACEHOLDER_WIDTH, recipe.crop)
+                im = ImageOps.fit(im, size, Image.Resampling.LANCZOS)
+            else:
+                size = (PLACEHOLDER_WIDTH, max(1, round(PLACEHOLDER_WIDTH * im.height / im.width)))
+                im = im.resize(size, Image.Resampling.LANCZOS)
+
+            buf = io.BytesIO()
+            im.filter(ImageFilter.GaussianBlur(1)).save(buf, "WEBP", quality=PLACEHOLDER_QUALITY)
+    except (OSError, ValueError):
+        logger.warning("media_job.placeholder_failed", extra={"src": str(src), "name": name})
+        return None
+
+    return variant_manifest.placeholder_info(name, size, buf.getvalue())
 
 
 def _normalize_media_name(src_rel_or_abs_path: str) -> str:
@@ -155,40 +275,55 @@ def _generate_media_variants(recipe_key: str, recipe: Recipe, src_rel_or_abs_pat
     src_stem = Path(src_name).stem
     src_suffix = Path(src_name).suffix or ".bin"
     src_local = _local_storage_path(default_storage, src_name)
+    formats = _recipe_formats(recipe)
 
     made = skipped = failed = 0
 
     with tempfile.TemporaryDirectory() as tmp_dir:
         tmp_root = Path(tmp_dir)
         tmp_src = tmp_root / f"src{src_suffix}"
-        tmp_out = tmp_root / "out.webp"
+        tmp_outs = {fmt: tmp_root / f"out.{fmt}" for fmt in formats}
 
         with default_storage.open(src_name, "rb") as src_handle:
             tmp_src.write_bytes(src_handle.read())
 
         for w in recipe.widths:
-            out_name = f"{recipe.src_rel_dir}/{recipe.out_subdir}/{src_stem}-{w}w.webp"
-            out_local = _local_storage_path(default_storage, out_name)
+            out_names = {fmt: f"{recipe.src_rel_dir}/{recipe.out_subdir}/{src_stem}-{w}w.{fmt}" for fmt in formats}
+            out_locals = {fmt: _local_storage_path(default_storage, name) for fmt, name in out_names.items()}
 
-            if src_local and out_local and _is_up_to_date(src_local, out_local):
+            if src_local and all(out_locals.values()) and all(_is_up_to_date(src_local, p) for p in out_locals.values()):
+                if not all(variant_manifest.has_media_variant(name) for name in out_names.values()):
+                    for info in _describe_outputs(out_locals, out_names):
+                        variant_manifest.record_media_variant(recipe_key, src_name, info)
                 skipped += 1
                 continue
 
             try:
-                args = _build_convert_args(tmp_src, tmp_out, recipe, w)
+                args = _build_convert_args(tmp_src, tmp_outs, recipe, w)
                 _run_imagemagick_convert(args)
-                if default_storage.exists(out_name):
-                    default_storage.delete(out_name)
-                default_storage.save(out_name, ContentFile(tmp_out.read_bytes()))
+                infos = _describe_outputs(tmp_outs, out_names)
+                for fmt, out_name in out_names.items():
+                    if default_storage.exists(out_name):
+                        default_storage.delete(out_name)
+                    default_storage.save(out_name, ContentFile(tmp_outs[fmt].read_bytes()))
+                # Recorded together, so readers never see a width in one format only.
+                for info in infos:
+                    variant_manifest.record_media_variant(recipe_key, src_name, info)
                 made += 1
             except subprocess.CalledProcessError:
                 failed += 1
                 logger.exception(
                     "media_job.convert_failed",
-                    extra={"recipe": recipe_key, "src": src_name, "out": out_name}
+                    extra={"recipe": recipe_key, "src": src_name, "out": out_names[PRIMARY_FORMAT]}
                 )
                 continue
 
+        lqip_name = _placeholder_name(f"{recipe.src_rel_dir}/{recipe.out_subdir}", src_stem)
+        if made or not variant_manifest.has_media_variant(lqip_name):
+            lqip = _placeholder_info(tmp_src, recipe, lqip_name)
+            if lqip is not None:
+                variant_manifest.record_media_variant(recipe_key, src_name, lqip)
+
     return {
         "ok": failed == 0,
         "recipe": recipe_key,
@@ -230,22 +365,38 @@ def generate_variants_for_file(recipe_key: str, src_rel_or_abs_path: str) -> dic
     out_dir = (out_root / recipe.src_rel_dir / recipe.out_subdir).resolve()
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    static_root = Path(settings.REPO_STATIC_ROOT).resolve()
+    src_name = _static_name(src, static_root)
+
+    formats = _recipe_formats(recipe)
     made = skipped = failed = 0
 
     for w in recipe.widths:
-        out_path = _out_path_for(src, out_dir, w)
+        out_paths = {fmt: _out_path_for(src, out_dir, w, fmt) for fmt in formats}
+        out_names = {fmt: _static_name(path, static_root) for fmt, path in out_paths.items()}
 
-        if _is_up_to_date(src, out_path):
+        if all(_is_up_to_date(src, path) for path in out_paths.values()):
+            if not all(variant_manifest.has_static_variant(name) for name in out_names.values()):
+                for info in _describe_outputs(out_paths, out_names):
+                    variant_manifest.record_static_variant(recipe_key, src_name, info)
             skipped += 1
             continue
 
         try:
-            args = _build_convert_args(src, out_path, recipe, w)
+            args = _build_convert_args(src, out_paths, recipe, w)
             _run_imagemagick_convert(args)
+            for info in _describe_outputs(out_paths, out_names):
+                variant_manifest.record_static_variant(recipe_key, src_name, info)
             made += 1
         except subprocess.CalledProcessError:
             failed += 1
-            logger.exception("media_job.convert_failed", extra={"recipe": recipe_key, "src": str(src), "out": str(out_path)})
+            logger.exception("media_job.convert_failed", extra={"recipe": recipe_key, "src": str(src), "out": str(out_paths[PRIMARY_FORMAT])})
             continue
 
+    lqip_name = _placeholder_name(_static_name(out_dir, static_root), src.stem)
+    if made or not variant_manifest.has_static_variant(lqip_name):
+        lqip = _placeholder_info(src, recipe, lqip_name)
+        if lqip is not None:
+            variant_manifest.record_static_variant(recipe_key, src_name, lqip)
+
     return {"ok": failed == 0, "recipe": recipe_key, "src": str(src), "out_dir": str(out_dir), "made": made, "skipped": skipped, "failed": failed}
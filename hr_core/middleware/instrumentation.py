@@ -0,0 +1,78 @@
+# hr_core/middleware/instrumentation.py
+
+import logging
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+from hr_common.utils.unified_logging import log_event
+from hr_core.instrumentation import current_stats, db_execute_wrapper, db_histogram, end_request, request_histogram, start_request
+
+logger = logging.getLogger(__name__)
+
+
+# InstrumentationMiddleware
+#    - Counts/times SQL (execute_wrapper on every configured connection)
+#    - Collects outbound spans recorded by hr_core.instrumentation.span()
+#    - Adds a Server-Timing header and emits one request.completed event
+#    - Feeds the per-route histograms exported at /metrics/
+#
+# Sits right after RequestIdMiddleware so the event carries request_id.
+
+class InstrumentationMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(settings, "SERVER_TIMING", True)
+        self.slow_request_ms = getattr(settings, "SLOW_REQUEST_MS", 1000)
+        self.n_plus_one_threshold = getattr(settings, "N_PLUS_ONE_THRESHOLD", 10)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        token = start_request()
+        try:
+            stats = current_stats()
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(db_execute_wrapper))
+                response = self.get_response(request)
+
+            self._finish(request, response, stats)
+            return response
+        finally:
+            end_request(token)
+
+    def _finish(self, request, response, stats) -> None:
+        elapsed = stats.elapsed
+        match = getattr(request, "resolver_match", None)
+        route = (match.route or match.view_name) if match else "unmatched"
+        status = response.status_code
+
+        request_histogram.observe((route, request.method, f"{status // 100}xx"), elapsed)
+        db_histogram.observe((route,), stats.db_count)
+
+        if self.server_timing:
+            parts = [f'db;dur={stats.db_time * 1000:.1f};desc="{stats.db_count} queries"']
+            parts += [f'{name};dur={total * 1000:.1f};desc="{count} calls"' for name, (count, total) in stats.spans.items()]
+            parts.append(f"total;dur={elapsed * 1000:.1f}")
+            existing = response.get("Server-Timing")
+            response["Server-Timing"] = ", ".join(([existing] if existing else []) + parts)
+
+        duration_ms = round(elapsed * 1000, 1)
+        repeated = stats.max_repeated_query
+        suspected_n_plus_one = repeated >= self.n_plus_one_threshold
+        slow = duration_ms >= self.slow_request_ms
+        level = logging.WARNING if (slow or suspected_n_plus_one or status >= 500) else logging.INFO
+
+        log_event(
+            logger, level, "request.completed",
+            method=request.method,
+            route=route,
+            status=status,
+            duration_ms=duration_ms,
+            db_queries=stats.db_count,
+            db_ms=round(stats.db_time * 1000, 1),
+            db_max_repeated=repeated,
+            n_plus_one_suspected=suspected_n_plus_one,
+            spans={name: {"count": count, "ms": round(total * 1000, 1)} for name, (count, total) in stats.spans.items()},
+        )
@@ -0,0 +1,87 @@
+# hr_core/middleware/preload_hints.py
+
+"""
+PreloadHintsMiddleware
+   - Adds a `Link` header with preload/modulepreload hints to full-page HTML
+     responses: the Vite entry chunks and their static imports, the body
+     font and the first section background (best format, same density
+     descriptors as its image-set rule). critical.css is inlined by
+     {% inline_critical_css %} and needs no hint; noncritical.css is left
+     out on purpose, since a preload would fetch the stylesheet base.html
+     defers (media="print" swap) at high priority.
+   - The header is built once per process, from the built Vite manifest.
+   - HTMX partials, non-GET and non-200 responses are left alone; the
+     assets are already loaded by then.
+   - Disabled (MiddlewareNotUsed) in Vite dev mode or without a built
+     manifest.
+
+An edge that supports Early Hints (Cloudflare, nginx `early_hints`) can
+replay the header as a 103 before the page is rendered; Django itself
+cannot send informational responses.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+from django.templatetags.static import static
+
+from hr_common.utils.http.htmx import is_htmx
+from hr_core import vite_manifest
+from hr_core.responsive_backgrounds import first_background
+
+SCRIPT_ENTRIES = ("js/main.js",)
+PRELOAD_FONTS = ("hr_core/fonts/Exo2-VariableFont_wght.woff2",)
+
+
+def _script_links(entries) -> list[str]:
+    links = []
+    for entry in entries:
+        for chunk in vite_manifest.entry_chunks(entry):
+            links.append(f"<{vite_manifest.asset_url(chunk['file'])}>; rel=modulepreload")
+            links.extend(f"<{vite_manifest.asset_url(css)}>; rel=preload; as=style" for css in chunk.get("css", ()))
+    return links
+
+
+def _background_link() -> list[str]:
+    image = first_background()
+    entries = image.preferred if image else ()
+    if not entries:
+        return []
+    srcset = ", ".join(f"{static(e.name)} {e.density}" for e in entries)
+    return [f'<{static(entries[0].name)}>; rel=preload; as=image; imagesrcset="{srcset}"; type="{entries[0].type}"; fetchpriority=high']
+
+
+def preload_links() -> list[str]:
+    """
+    Link header values, in priority order. Empty without a built manifest.
+    """
+    if vite_manifest.dev_mode() or not vite_manifest.load_manifest():
+        return []
+
+    links = _script_links(SCRIPT_ENTRIES)
+    links += [f"<{static(font)}>; rel=preload; as=font; type=font/woff2; crossorigin" for font in PRELOAD_FONTS]
+    links += _background_link()
+    return list(dict.fromkeys(links))
+
+
+class PreloadHintsMiddleware:
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self.get_response = get_response
+        self.link = ", ".join(preload_links())
+        if not self.link:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.get_response(request)
+
+        if request.method != "GET" or is_htmx(request) or response.status_code != 200:
+            return response
+        if not response.get("Content-Type", "").startswith("text/html"):
+            return response
+
+        existing = response.get("Link")
+        response["Link"] = f"{existing}, {self.link}" if existing else self.link
+        return response
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hr_core", "0001_pending_variant"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MediaVariant",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("recipe_key", models.CharField(max_length=32)),
+                ("src_name", models.TextField()),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("width", models.PositiveIntegerField()),
+                ("height", models.PositiveIntegerField()),
+                ("format", models.CharField(default="webp", max_length=16)),
+                ("sha256", models.CharField(max_length=64)),
+                ("size", models.PositiveBigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["recipe_key", "src_name"], name="ix_media_variant_recipe_src")],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hr_core", "0002_media_variant"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pendingvariant",
+            name="claimed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="pendingvariant",
+            name="claimed_by",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="pendingvariant",
+            name="failed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="pendingvariant",
+            name="next_attempt_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="pendingvariant",
+            index=models.Index(condition=models.Q(("failed_at__isnull", True), ("processed_at__isnull", True)), fields=["created_at"], name="ix_pending_variant_open"),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hr_core", "0003_pending_variant_claims"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mediavariant",
+            name="data",
+            field=models.TextField(blank=True, default=""),
+        ),
+    ]
@@ -4,18 +4,65 @@ from django.db import models
 
 
 class PendingVariant(models.Model):
+    """
+    Debounced variant work item, claimed by imgbatch workers (see
+    hr_core.image_batch.claim_pending). A claim is a lease: rows whose
+    claimed_at is older than CLAIM_TTL_SECONDS are up for grabs again.
+    """
+
     recipe_key = models.CharField(max_length=32, db_index=True)
     src_name = models.TextField(db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     processed_at = models.DateTimeField(null=True, blank=True, db_index=True)
     attempts = models.PositiveIntegerField(default=0)
     last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    claimed_by = models.CharField(max_length=64, blank=True)
+    failed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=["recipe_key", "src_name"], name="uq_pending_variant_recipe_src"),
         ]
+        indexes = [
+            models.Index(
+                fields=["created_at"],
+                name="ix_pending_variant_open",
+                condition=models.Q(processed_at__isnull=True, failed_at__isnull=True),
+            ),
+        ]
 
     def __str__(self) -> str:
-        status = "processed" if self.processed_at else "pending"
+        status = "processed" if self.processed_at else "failed" if self.failed_at else "pending"
         return f"{self.recipe_key}:{self.src_name} ({status})"
+
+
+class MediaVariant(models.Model):
+    """
+    Manifest row for a generated media variant (see hr_core.variant_manifest).
+
+    Written by the variant pipeline after each conversion so readers (srcset
+    tags, media serving) can resolve widths, dimensions and content-hash ETags
+    without touching storage. Placeholder rows (format "lqip") have no file;
+    their bytes are inlined in `data` as a data URI.
+    """
+
+    recipe_key = models.CharField(max_length=32)
+    src_name = models.TextField()
+    name = models.CharField(max_length=255, unique=True)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    format = models.CharField(max_length=16, default="webp")
+    sha256 = models.CharField(max_length=64)
+    size = models.PositiveBigIntegerField(default=0)
+    data = models.TextField(blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["recipe_key", "src_name"], name="ix_media_variant_recipe_src"),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
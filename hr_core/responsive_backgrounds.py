@@ -0,0 +1,104 @@
+# hr_core/responsive_backgrounds.py
+
+"""
+Section wipe/background image sets, resolved from SECTION_WIPES /
+SECTION_BACKGROUNDS and the static variant manifest (no filesystem probes).
+
+build_responsive_backgrounds renders them as CSS image-set() rules and the
+`background_preload` template tag renders the first configured background
+as <link rel=preload>, so the preload always names the file the CSS picks.
+Names are static-relative; CSS prefixes them with /static/, templates go
+through static().
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+
+from hr_core import variant_manifest
+from hr_core.config.backgrounds_config import SECTION_BACKGROUNDS, SECTION_WIPES
+from hr_core.media_jobs import PRIMARY_FORMAT, RECIPES
+from hr_core.srcset_registry import MIME_TYPES, SOURCE_FORMATS
+
+WIPES_DIR = "hr_core/images/wipes"
+BACKGROUNDS_DIR = "hr_core/images/backgrounds"
+
+# Pixel-density descriptor per recipe width, in RECIPES order.
+DENSITIES = {
+    "wipe_section": ("1x", "1.5x", "2x", "3x"),
+    "bg_section": ("1x", "2x"),
+}
+
+# Preferred first: for equal densities browsers keep the first type they can decode.
+IMAGE_SET_FORMATS = (*SOURCE_FORMATS, PRIMARY_FORMAT)
+
+
+@dataclass(frozen=True)
+class ImageSetEntry:
+    name: str
+    type: str
+    density: str
+
+
+@dataclass(frozen=True)
+class SectionImage:
+    selector: str
+    fallback: str
+    entries: tuple[ImageSetEntry, ...]
+
+    @property
+    def preferred(self) -> tuple[ImageSetEntry, ...]:
+        """
+        Entries of the most preferred format only (what a supporting browser picks).
+        """
+        return tuple(e for e in self.entries if e.type == self.entries[0].type) if self.entries else ()
+
+
+def _image_set(recipe_key: str, src_name: str) -> tuple[ImageSetEntry, ...]:
+    widths = RECIPES[recipe_key].widths
+    by_format: dict[str, dict[int, str]] = {}
+    for v in variant_manifest.static_variants(src_name):
+        w = variant_manifest.variant_width(v.name)
+        if w in widths:
+            by_format.setdefault(v.format, {})[w] = v.name
+
+    # Only formats with every recipe width; without a full WebP set the fallback stands alone.
+    formats = [f for f in IMAGE_SET_FORMATS if len(by_format.get(f, ())) == len(widths)]
+    if PRIMARY_FORMAT not in formats:
+        return ()
+
+    return tuple(
+        ImageSetEntry(name=by_format[f][w], type=MIME_TYPES[f], density=density)
+        for w, density in zip(widths, DENSITIES[recipe_key], strict=False)
+        for f in formats
+    )
+
+
+def _section(recipe_key: str, src_dir: str, selector: str, filename: str) -> SectionImage:
+    src_name = variant_manifest.static_source_name(f"{src_dir}/{filename}")
+    return SectionImage(selector=selector, fallback=src_name, entries=_image_set(recipe_key, src_name))
+
+
+def section_images() -> list[SectionImage]:
+    images = [_section("wipe_section", WIPES_DIR, f"#{key}.section-wipe", filename) for key, filename in SECTION_WIPES.items()]
+    images += [_section("bg_section", BACKGROUNDS_DIR, f"#{key} .parallax-background", filename) for key, filename in SECTION_BACKGROUNDS.items()]
+    return images
+
+
+def inputs_digest(images: list[SectionImage]) -> str:
+    """
+    Content hash of everything the CSS is rendered from (config + manifest entries).
+    """
+    payload = json.dumps([asdict(image) for image in images], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def first_background() -> SectionImage | None:
+    """
+    The first configured parallax background: the one above the fold.
+    """
+    for key, filename in SECTION_BACKGROUNDS.items():
+        return _section("bg_section", BACKGROUNDS_DIR, f"#{key} .parallax-background", filename)
+    return None
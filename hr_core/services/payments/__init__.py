@@ -1,12 +1,42 @@
 # hr_core/services/payments/__init__.py
 
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 
+from hr_core.services.payments.base import (  # noqa: F401 - re-exported for callers
+    PaymentAuthError,
+    PaymentError,
+    PaymentGateway,
+    PaymentInvalidRequest,
+    PaymentTemporaryError,
+    WebhookVerificationError,
+)
 from hr_core.services.payments.stripe_mock import MockGateway
 from hr_core.services.payments.stripe_real import StripeGateway
 
+PROVIDERS: dict[str, type[PaymentGateway]] = {"STRIPE": StripeGateway, "MOCK": MockGateway}
 
-def get_gateway():
-    if getattr(settings, "PAYMENT_PROVIDER", "MOCK") == "STRIPE":
-        return StripeGateway(settings.STRIPE_API_KEY, settings.STRIPE_WEBHOOK_SECRET)
-    return MockGateway()
+_gateways: dict[str, PaymentGateway] = {}
+
+
+def get_gateway() -> PaymentGateway:
+    """
+    Process-wide gateway for PAYMENT_PROVIDER ("STRIPE" or "MOCK").
+
+    One instance per provider, so the MockGateway's in-memory state survives
+    between requests and StripeGateway calls share the pooled SDK client.
+    Unknown providers raise rather than fall back to the mock, which would
+    otherwise take webhooks without a Stripe signature.
+    """
+    provider = (getattr(settings, "PAYMENT_PROVIDER", "STRIPE") or "STRIPE").upper()
+    gateway = _gateways.get(provider)
+    if gateway is None:
+        if provider not in PROVIDERS:
+            raise ImproperlyConfigured(f"Unknown PAYMENT_PROVIDER {provider!r}; expected one of {', '.join(PROVIDERS)}.")
+        gateway = _gateways.setdefault(provider, PROVIDERS[provider]())
+    return gateway
+
+
+def reset_gateways() -> None:
+    """Drop cached gateways (tests; MockGateway state)."""
+    _gateways.clear()
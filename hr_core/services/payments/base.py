@@ -1,16 +1,75 @@
 # hr_core/services/payments/base.py
 
+"""
+Provider-neutral payment interface.
 
-class CheckoutSession:
-    def __init__(self, id, url):
-        self.id = id
-        self.url = url
+Views talk to `get_gateway()` (hr_core.services.payments) and never import a
+provider SDK. Gateways return plain dicts shaped like Stripe's JSON objects
+(checkout.session, payment_intent, customer, event) and raise the errors
+below instead of SDK exceptions.
+"""
+
+
+class PaymentError(Exception):
+    """Any failure talking to the payment provider."""
+
+
+class PaymentTemporaryError(PaymentError):
+    """Network trouble or rate limiting; the same call may succeed later."""
+
+
+class PaymentAuthError(PaymentError):
+    """Bad or under-privileged API key. Needs an operator, not a retry."""
+
+
+class PaymentInvalidRequest(PaymentError):
+    """The provider rejected the call (unknown id, bad parameters)."""
+
+
+class WebhookVerificationError(PaymentError):
+    """Webhook payload failed signature verification or could not be parsed."""
 
 
 class PaymentGateway:
-    def create_checkout_session(self, *, line_items, success_url, cancel_url, customer_email=None, metadata=None) -> CheckoutSession:
+    def create_checkout_session(self, *, line_items: list[dict], metadata: dict | None = None, idempotency_key: str | None = None, **options) -> dict:
+        """
+        Create a checkout session. `options` are passed through as provider
+        parameters (ui_mode, mode, return_url, customer, customer_email, ...).
+        """
+        raise NotImplementedError
+
+    def retrieve_checkout_session(self, session_id: str) -> dict:
+        raise NotImplementedError
+
+    def retrieve_payment_intent(self, payment_intent_id: str) -> dict:
+        raise NotImplementedError
+
+    def create_customer(self, *, email: str, name: str | None = None, metadata: dict | None = None, idempotency_key: str | None = None) -> dict:
+        raise NotImplementedError
+
+    def create_product(self, *, name: str, active: bool = True, metadata: dict | None = None, idempotency_key: str | None = None) -> dict:
+        raise NotImplementedError
+
+    def update_product(self, product_id: str, **fields) -> dict:
+        raise NotImplementedError
+
+    def create_price(
+        self, *, product: str, unit_amount: int, currency: str, nickname: str | None = None, metadata: dict | None = None, idempotency_key: str | None = None
+    ) -> dict:
+        raise NotImplementedError
+
+    def update_price(self, price_id: str, **fields) -> dict:
+        """Prices are immutable apart from active/nickname/metadata; replace one to change its amount."""
+        raise NotImplementedError
+
+    def list_events(self, *, created_gte: int, types: list[str] | None = None, starting_after: str | None = None, limit: int = 100) -> dict:
+        """
+        One page of events created at or after `created_gte` (unix seconds),
+        newest first: {"data": [event, ...], "has_more": bool}. Pass the last
+        id of a page as `starting_after` to get the next (older) one.
+        """
         raise NotImplementedError
 
     def verify_webhook(self, request) -> dict:
-        """Return parsed event dict or raise."""
+        """Return the parsed event dict or raise WebhookVerificationError."""
         raise NotImplementedError
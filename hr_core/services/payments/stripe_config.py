@@ -0,0 +1,101 @@
+# hr_core/services/payments/stripe_config.py
+
+import requests
+import stripe
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from hr_common.security import secrets
+from hr_core.instrumentation import span
+
+_configured_key: str | None = None
+
+
+class TimedRequestsClient(stripe.RequestsClient):
+    """
+    Stripe's requests-based client with each HTTP round trip recorded as a
+    "stripe" span (Server-Timing, request.completed, upstream histogram).
+    """
+
+    def request(self, method, url, headers, post_data=None):
+        with span("stripe"):
+            return super().request(method, url, headers, post_data)
+
+
+def build_http_client() -> TimedRequestsClient:
+    """
+    One keep-alive requests.Session for every thread in the process.
+
+    The SDK's default gives each thread its own session, so a pool of
+    gunicorn threads each pays its own TLS handshake to api.stripe.com and
+    idle connections are never shared. A single session with a sized
+    urllib3 pool (thread-safe) keeps warm connections for all of them.
+    STRIPE_CONNECT_TIMEOUT fails fast on an unreachable host instead of the
+    SDK's 80s blanket timeout; STRIPE_READ_TIMEOUT bounds slow responses.
+    """
+    pool_size = getattr(settings, "STRIPE_HTTP_POOL_SIZE", 10)
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    timeout = (getattr(settings, "STRIPE_CONNECT_TIMEOUT", 5.0), getattr(settings, "STRIPE_READ_TIMEOUT", 30.0))
+    return TimedRequestsClient(timeout=timeout, session=session)
+
+
+def configure_stripe() -> None:
+    """
+    Point the Stripe SDK at the current secret key.
+
+    Cheap enough for hot paths: the key comes from the cached secret provider
+    and stripe.api_key is only reassigned when the key actually changed
+    (first call in the process, or after a rotation). STRIPE_API_BASE points
+    the SDK at a local stand-in. The shared HTTP client and the SDK's retry
+    count (STRIPE_MAX_NETWORK_RETRIES; retried POSTs reuse one idempotency
+    key) are installed on the first call.
+    """
+    global _configured_key
+
+    if not isinstance(stripe.default_http_client, TimedRequestsClient):
+        stripe.default_http_client = build_http_client()
+
+    retries = getattr(settings, "STRIPE_MAX_NETWORK_RETRIES", 2)
+    if stripe.max_network_retries != retries:
+        stripe.max_network_retries = retries
+
+    api_base = getattr(settings, "STRIPE_API_BASE", "") or "https://api.stripe.com"
+    if stripe.api_base != api_base:
+        stripe.api_base = api_base
+
+    key = secrets.read_secret("STRIPE_SECRET_KEY")
+    if key == _configured_key:
+        return
+    stripe.api_key = key
+    _configured_key = key
+
+
+def webhook_secrets() -> tuple[str, ...]:
+    """
+    Accepted webhook signing secrets, newest first. STRIPE_WEBHOOK_SECRET may
+    list several (comma/newline separated) while an endpoint secret is rolled.
+    """
+    return secrets.read_secret_list("STRIPE_WEBHOOK_SECRET")
+
+
+def construct_webhook_event(payload, sig_header: str):
+    """
+    stripe.Webhook.construct_event against every accepted secret; raises the
+    last SignatureVerificationError when none of them match. Returns a plain
+    dict (StripeObject stopped being a dict subclass in stripe 15).
+    """
+    candidates = webhook_secrets()
+    if not candidates:
+        raise stripe.error.SignatureVerificationError("No webhook signing secret configured", sig_header)
+
+    error = None
+    for secret in candidates:
+        try:
+            event = stripe.Webhook.construct_event(payload=payload, sig_header=sig_header, secret=secret)
+            return event.to_dict() if isinstance(event, stripe.StripeObject) else event
+        except stripe.error.SignatureVerificationError as exc:
+            error = exc
+    raise error
@@ -2,29 +2,214 @@
 
 import json
 import logging
+import threading
+import time
 import uuid
 
-from django.urls import reverse
+import stripe
+from django.conf import settings
 
 from hr_common.utils.unified_logging import log_event
-from hr_core.services.payments.base import CheckoutSession, PaymentGateway
+from hr_core.services.payments.base import PaymentGateway, PaymentInvalidRequest, WebhookVerificationError
 
 logger = logging.getLogger(__name__)
 
 
 class MockGateway(PaymentGateway):
-    def __init__(self, signer=None):
-        self.signer = signer
+    """
+    In-memory stand-in for StripeGateway (PAYMENT_PROVIDER=MOCK).
 
-    def create_checkout_session(self, *, line_items, success_url, cancel_url, customer_email=None, metadata=None):
-        session_id = f"fake_cs_{uuid.uuid4().hex[:24]}"
-        # Point to a local “mock checkout” page that imitates Stripe’s redirect
-        url = reverse("mock_checkout") + f"?sid={session_id}"
-        log_event(logger, logging.INFO, "payments.mock.checkout_session.created", session_id=session_id, has_customer_email=bool(customer_email))
-        return CheckoutSession(session_id, url)
+    Objects come back in the same dict shapes the views read from Stripe,
+    retrieve echoes what was created, and an idempotency key returns the
+    object from its first use. `complete_session()` plays the customer
+    paying and returns the checkout.session.completed event Stripe would
+    deliver; every event produced is also kept for `list_events()`. With a
+    `webhook_secret` webhooks must carry a valid Stripe-Signature; without
+    one unsigned JSON is accepted only under DEBUG or
+    MOCK_GATEWAY_ALLOW_UNSIGNED_WEBHOOKS.
+    """
+
+    def __init__(self, webhook_secret: str | None = None):
+        self.webhook_secret = webhook_secret
+        self.sessions: dict[str, dict] = {}
+        self.customers: dict[str, dict] = {}
+        self.payment_intents: dict[str, dict] = {}
+        self.products: dict[str, dict] = {}
+        self.prices: dict[str, dict] = {}
+        self.events: list[dict] = []
+        self._idempotent: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _once(self, idempotency_key: str | None, build) -> dict:
+        with self._lock:
+            if idempotency_key and idempotency_key in self._idempotent:
+                return dict(self._idempotent[idempotency_key])
+            obj = build()
+            if idempotency_key:
+                self._idempotent[idempotency_key] = obj
+            return dict(obj)
+
+    def create_checkout_session(self, *, line_items, metadata=None, idempotency_key=None, **options):
+        def build():
+            sid = f"cs_test_mock_{uuid.uuid4().hex}"
+            priced = [(item.get("price_data") or self.prices.get(item.get("price")) or {}, int(item.get("quantity") or 1)) for item in line_items]
+            amount = sum(int(price.get("unit_amount") or 0) * quantity for price, quantity in priced)
+            currency = next((price.get("currency") for price, _ in priced if price.get("currency")), None) or "usd"
+            session = {
+                "id": sid,
+                "object": "checkout.session",
+                "client_secret": f"{sid}_secret_{uuid.uuid4().hex[:12]}",
+                "livemode": False,
+                "amount_total": amount,
+                "currency": currency,
+                "status": "open",
+                "payment_status": "unpaid",
+                "payment_intent": None,
+                "expires_at": int(time.time()) + 24 * 3600,
+                "customer": options.get("customer"),
+                "customer_email": options.get("customer_email"),
+                "ui_mode": options.get("ui_mode") or "hosted",
+                "mode": options.get("mode") or "payment",
+                "return_url": options.get("return_url"),
+                "url": None,
+                "metadata": dict(metadata or {}),
+            }
+            self.sessions[sid] = session
+            return session
+
+        session = self._once(idempotency_key, build)
+        log_event(logger, logging.INFO, "payments.mock.checkout_session.created", session_id=session["id"], has_customer=bool(options.get("customer")))
+        return session
+
+    def retrieve_checkout_session(self, session_id):
+        with self._lock:
+            session = self.sessions.get(session_id)
+        if session is None:
+            raise PaymentInvalidRequest(f"No such checkout.session: '{session_id}'")
+        return dict(session)
+
+    def retrieve_payment_intent(self, payment_intent_id):
+        with self._lock:
+            intent = self.payment_intents.get(payment_intent_id)
+        if intent is None:
+            raise PaymentInvalidRequest(f"No such payment_intent: '{payment_intent_id}'")
+        return dict(intent)
+
+    def create_customer(self, *, email, name=None, metadata=None, idempotency_key=None):
+        def build():
+            customer = {
+                "id": f"cus_mock_{uuid.uuid4().hex[:14]}",
+                "object": "customer",
+                "email": email,
+                "name": name,
+                "metadata": dict(metadata or {}),
+                "livemode": False,
+            }
+            self.customers[customer["id"]] = customer
+            return customer
+
+        return self._once(idempotency_key, build)
+
+    def create_product(self, *, name, active=True, metadata=None, idempotency_key=None):
+        def build():
+            product = {"id": f"prod_mock_{uuid.uuid4().hex[:14]}", "object": "product", "name": name, "active": active, "metadata": dict(metadata or {})}
+            self.products[product["id"]] = product
+            return product
+
+        return self._once(idempotency_key, build)
+
+    def update_product(self, product_id, **fields):
+        return self._update(self.products, "product", product_id, fields)
+
+    def create_price(self, *, product, unit_amount, currency, nickname=None, metadata=None, idempotency_key=None):
+        def build():
+            price = {
+                "id": f"price_mock_{uuid.uuid4().hex[:14]}",
+                "object": "price",
+                "product": product,
+                "unit_amount": unit_amount,
+                "currency": currency,
+                "nickname": nickname,
+                "active": True,
+                "metadata": dict(metadata or {}),
+            }
+            self.prices[price["id"]] = price
+            return price
+
+        return self._once(idempotency_key, build)
+
+    def update_price(self, price_id, **fields):
+        return self._update(self.prices, "price", price_id, fields)
+
+    def _update(self, store: dict, kind: str, object_id: str, fields: dict) -> dict:
+        with self._lock:
+            obj = store.get(object_id)
+            if obj is None:
+                raise PaymentInvalidRequest(f"No such {kind}: '{object_id}'")
+            obj.update(fields)
+            return dict(obj)
+
+    def complete_session(self, session_id: str) -> dict:
+        """
+        Mark a session paid (with a succeeded PaymentIntent) and return the
+        checkout.session.completed event for it.
+        """
+        with self._lock:
+            session = self.sessions[session_id]
+            pi_id = f"pi_mock_{uuid.uuid4().hex[:24]}"
+            self.payment_intents[pi_id] = {
+                "id": pi_id,
+                "object": "payment_intent",
+                "amount": session["amount_total"],
+                "currency": session["currency"],
+                "status": "succeeded",
+                "livemode": False,
+                "last_payment_error": None,
+                "metadata": dict(session["metadata"]),
+            }
+            session.update(status="complete", payment_status="paid", payment_intent=pi_id)
+            data = dict(session)
+        return self.emit("checkout.session.completed", data)
+
+    def emit(self, event_type: str, obj: dict, *, created: int | None = None) -> dict:
+        """
+        Record an event as Stripe would have sent it and return it.
+        """
+        event = {
+            "id": f"evt_mock_{uuid.uuid4().hex[:24]}",
+            "object": "event",
+            "created": int(time.time()) if created is None else created,
+            "livemode": False,
+            "type": event_type,
+            "data": {"object": obj},
+        }
+        with self._lock:
+            self.events.append(event)
+        return event
+
+    def list_events(self, *, created_gte, types=None, starting_after=None, limit=100):
+        with self._lock:
+            # Newest first, like Stripe; events from the same second, most recently emitted first.
+            matching = [e for e in reversed(self.events) if e["created"] >= created_gte and (not types or e["type"] in types)]
+        matching.sort(key=lambda e: e["created"], reverse=True)
+        if starting_after:
+            ids = [e["id"] for e in matching]
+            matching = matching[ids.index(starting_after) + 1:] if starting_after in ids else []
+        return {"object": "list", "data": [dict(e) for e in matching[:limit]], "has_more": len(matching) > limit}
 
     def verify_webhook(self, request):
-        # Accept any JSON for dev; or require a local header key
-        event = json.loads(request.body.decode("utf-8"))
+        payload = request.body.decode("utf-8")
+        if self.webhook_secret:
+            sig = request.META.get("HTTP_STRIPE_SIGNATURE", "")
+            try:
+                stripe.WebhookSignature.verify_header(payload, sig, self.webhook_secret, tolerance=300)
+            except stripe.error.SignatureVerificationError as exc:
+                raise WebhookVerificationError(str(exc)) from exc
+        elif not (settings.DEBUG or getattr(settings, "MOCK_GATEWAY_ALLOW_UNSIGNED_WEBHOOKS", False)):
+            raise WebhookVerificationError("MockGateway has no webhook_secret and unsigned webhooks are not allowed.")
+        try:
+            event = json.loads(payload)
+        except ValueError as exc:
+            raise WebhookVerificationError(f"Invalid payload: {exc}") from exc
         log_event(logger, logging.INFO, "payments.mock.webhook.verified", event_id=event.get("id"), event_type=event.get("type"))
         return event
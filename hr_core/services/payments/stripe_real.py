@@ -1,40 +1,112 @@
 # hr_core/services/payments/stripe_real.py
 
 import logging
+from contextlib import contextmanager
 
 import stripe
 
 from hr_common.utils.unified_logging import log_event
-from hr_core.services.payments.base import CheckoutSession, PaymentGateway
+from hr_core.services.payments.base import (
+    PaymentAuthError,
+    PaymentError,
+    PaymentGateway,
+    PaymentInvalidRequest,
+    PaymentTemporaryError,
+    WebhookVerificationError,
+)
+from hr_core.services.payments.stripe_config import configure_stripe, construct_webhook_event
 
 logger = logging.getLogger(__name__)
 
 
+@contextmanager
+def _translate_errors():
+    """
+    Re-raise Stripe SDK errors as gateway errors. The SDK has already spent
+    its retries (STRIPE_MAX_NETWORK_RETRIES) by the time one escapes.
+    """
+    try:
+        yield
+    except (stripe.error.APIConnectionError, stripe.error.RateLimitError) as exc:
+        raise PaymentTemporaryError(str(exc)) from exc
+    except (stripe.error.AuthenticationError, stripe.error.PermissionError) as exc:
+        raise PaymentAuthError(str(exc)) from exc
+    except stripe.error.InvalidRequestError as exc:
+        raise PaymentInvalidRequest(str(exc)) from exc
+    except stripe.error.StripeError as exc:
+        raise PaymentError(str(exc)) from exc
+
+
+def _request_options(idempotency_key: str | None) -> dict:
+    # Without an explicit key the SDK generates one per call (reused across its retries).
+    return {"idempotency_key": idempotency_key} if idempotency_key else {}
+
+
 class StripeGateway(PaymentGateway):
-    def __init__(self, api_key, webhook_secret):
-        stripe.api_key = api_key
-        self.webhook_secret = webhook_secret
-
-    def create_checkout_session(self, **kw):
-        sess = stripe.checkout.Session.create(
-            mode="payment",
-            line_items=kw["line_items"],
-            success_url=kw["success_url"],
-            cancel_url=kw["cancel_url"],
-            customer_email=kw.get("customer_email"),
-            metadata=kw.get("metadata") or {}
-        )
-        log_event(logger, logging.INFO,"payments.stripe.checkout_session.created", session_id=sess.id, has_customer_email=bool(kw.get("customer_email")))
-        return CheckoutSession(sess.id, sess.url)
+    """
+    Stripe over the process-wide HTTP client set up by configure_stripe()
+    (one pooled keep-alive session, tuned timeouts, SDK retries).
+    """
+
+    def create_checkout_session(self, *, line_items, metadata=None, idempotency_key=None, **options):
+        configure_stripe()
+        with _translate_errors():
+            sess = stripe.checkout.Session.create(line_items=line_items, metadata=metadata or {}, **_request_options(idempotency_key), **options)
+        log_event(logger, logging.INFO, "payments.stripe.checkout_session.created", session_id=sess.id, has_customer=bool(options.get("customer")))
+        return sess.to_dict()
+
+    def retrieve_checkout_session(self, session_id):
+        configure_stripe()
+        with _translate_errors():
+            return stripe.checkout.Session.retrieve(session_id).to_dict()
+
+    def retrieve_payment_intent(self, payment_intent_id):
+        configure_stripe()
+        with _translate_errors():
+            return stripe.PaymentIntent.retrieve(payment_intent_id).to_dict()
+
+    def create_customer(self, *, email, name=None, metadata=None, idempotency_key=None):
+        configure_stripe()
+        with _translate_errors():
+            customer = stripe.Customer.create(email=email, name=name, metadata=metadata or {}, **_request_options(idempotency_key))
+        log_event(logger, logging.INFO, "payments.stripe.customer.created", stripe_customer_id=customer.id)
+        return customer.to_dict()
+
+    def create_product(self, *, name, active=True, metadata=None, idempotency_key=None):
+        configure_stripe()
+        with _translate_errors():
+            return stripe.Product.create(name=name, active=active, metadata=metadata or {}, **_request_options(idempotency_key)).to_dict()
+
+    def update_product(self, product_id, **fields):
+        configure_stripe()
+        with _translate_errors():
+            return stripe.Product.modify(product_id, **fields).to_dict()
+
+    def create_price(self, *, product, unit_amount, currency, nickname=None, metadata=None, idempotency_key=None):
+        configure_stripe()
+        with _translate_errors():
+            return stripe.Price.create(
+                product=product, unit_amount=unit_amount, currency=currency, nickname=nickname, metadata=metadata or {}, **_request_options(idempotency_key)
+            ).to_dict()
+
+    def update_price(self, price_id, **fields):
+        configure_stripe()
+        with _translate_errors():
+            return stripe.Price.modify(price_id, **fields).to_dict()
+
+    def list_events(self, *, created_gte, types=None, starting_after=None, limit=100):
+        params = {"created": {"gte": created_gte}, "limit": limit}
+        if types:
+            params["types"] = list(types)
+        if starting_after:
+            params["starting_after"] = starting_after
+        configure_stripe()
+        with _translate_errors():
+            return stripe.Event.list(**params).to_dict()
 
     def verify_webhook(self, request):
-        payload = request.body
         sig = request.META.get("HTTP_STRIPE_SIGNATURE", "")
         try:
-            event = stripe.Webhook.construct_event(payload, sig, self.webhook_secret)
-        except Exception:
-            log_event(logger, logging.ERROR, "payments.stripe.webhook.verify_failed", has_signature=bool(sig), exc_info=True,)
-            raise
-        event_dict = event.to_dict()
-        log_event(logger, logging.INFO, "payments.stripe.webhook.verified", event_id=event_dict.get("id"), event_type=event_dict.get("type"))
-        return event_dict
+            return construct_webhook_event(request.body, sig)
+        except (stripe.error.SignatureVerificationError, ValueError) as exc:
+            raise WebhookVerificationError(str(exc)) from exc
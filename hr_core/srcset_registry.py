@@ -0,0 +1,226 @@
+# hr_core/srcset_registry.py
+
+"""
+Memoized responsive-image lookups for templates.
+
+Widths come from RECIPES and availability from the variant manifest, so a
+srcset only lists variants that were actually generated and falls back to
+the original when none exist yet. Extra encodings of the same widths (AVIF,
+JPEG XL) are exposed as typed `sources` for <picture>, and the inline
+placeholder (if any) as `placeholder`. Results are cached per process: complete
+entries (every recipe width present) indefinitely, incomplete ones for
+INCOMPLETE_TTL seconds so freshly generated variants are picked up.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.templatetags.static import static
+
+from hr_core.media_jobs import RECIPES
+from hr_core.variant_manifest import PLACEHOLDER_FORMAT, VariantInfo, media_variants, media_variants_many, static_variants, variant_width
+
+INCOMPLETE_TTL = 60
+MAX_ENTRIES = 4096
+SRCSET_FORMAT = "webp"
+
+# <source> order for <picture>: browsers take the first type they support.
+SOURCE_FORMATS = ("jxl", "avif")
+MIME_TYPES = {"avif": "image/avif", "jxl": "image/jxl", "webp": "image/webp"}
+
+
+@dataclass(frozen=True)
+class Candidate:
+    url: str
+    width: int
+    height: int
+
+
+def _srcset(candidates: tuple[Candidate, ...]) -> str:
+    return ", ".join(f"{c.url} {c.width}w" for c in candidates)
+
+
+@dataclass(frozen=True)
+class SourceSet:
+    format: str
+    candidates: tuple[Candidate, ...]
+
+    @property
+    def type(self) -> str:
+        return MIME_TYPES[self.format]
+
+    @property
+    def srcset(self) -> str:
+        return _srcset(self.candidates)
+
+
+@dataclass(frozen=True)
+class ResponsiveImage:
+    original_url: str
+    candidates: tuple[Candidate, ...]
+    fallback_size: tuple[int, int] | None = None
+    complete: bool = False
+    sources: tuple[SourceSet, ...] = ()
+    placeholder: str = ""
+    placeholder_size: tuple[int, int] | None = None
+
+    @property
+    def srcset(self) -> str:
+        return _srcset(self.candidates)
+
+    @property
+    def largest(self) -> Candidate | None:
+        return self.candidates[-1] if self.candidates else None
+
+    @property
+    def width(self) -> int | None:
+        if self.largest:
+            return self.largest.width
+        size = self.fallback_size or self.placeholder_size
+        return size[0] if size else None
+
+    @property
+    def height(self) -> int | None:
+        if self.largest:
+            return self.largest.height
+        size = self.fallback_size or self.placeholder_size
+        return size[1] if size else None
+
+    def url(self, width: int | None = None) -> str:
+        """
+        Smallest generated variant at least `width` wide, else the largest one,
+        else the original.
+        """
+        if not self.candidates:
+            return self.original_url
+        if width is None:
+            return self.largest.url
+        for c in self.candidates:
+            if c.width >= int(width):
+                return c.url
+        return self.largest.url
+
+    @property
+    def src(self) -> str:
+        return self.url()
+
+
+def media_name_from_url(url: str) -> str:
+    """
+    Storage name for a media URL (inverse of default_storage.url for MEDIA_URL-rooted storages).
+    """
+    media_url = settings.MEDIA_URL or "/"
+    if url.startswith(media_url):
+        return unquote(url[len(media_url):].split("?", 1)[0])
+
+    path = urlsplit(url).path
+    media_path = urlsplit(media_url).path
+    if media_path and path.startswith(media_path):
+        path = path[len(media_path):]
+    return unquote(path.lstrip("/"))
+
+
+class SrcsetRegistry:
+
+    def __init__(self):
+        self._entries: dict[tuple[str, str], tuple[float | None, ResponsiveImage]] = {}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def prime(self, recipe_key: str, sources) -> None:
+        """
+        Fill missing or expired entries for many media sources with a single
+        manifest query, so list pages do not pay one lookup per image.
+        """
+        recipe = RECIPES[recipe_key]
+        if recipe.src_root != "media":
+            return
+
+        now = time.monotonic()
+        missing = []
+        for source in dict.fromkeys(s for s in sources if s):
+            entry = self._entries.get((recipe_key, source))
+            if entry is None or (entry[0] is not None and entry[0] <= now):
+                missing.append(source)
+        if not missing:
+            return
+
+        by_name = media_variants_many(recipe_key, (media_name_from_url(s) for s in missing))
+        for source in missing:
+            self._store((recipe_key, source), self._build(recipe_key, source, by_name.get(media_name_from_url(source), ())), now)
+
+    def get(self, recipe_key: str, source: str) -> ResponsiveImage:
+        """
+        `source` is an ImageField URL for media recipes, or a static path
+        (relative to REPO_STATIC_ROOT) for repo_static recipes.
+        """
+        key = (recipe_key, source or "")
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and (entry[0] is None or entry[0] > now):
+            return entry[1]
+
+        image = self._build(recipe_key, source or "")
+        self._store(key, image, now)
+        return image
+
+    def _store(self, key: tuple[str, str], image: ResponsiveImage, now: float) -> None:
+        expires = None if image.complete else now + INCOMPLETE_TTL
+        with self._lock:
+            if len(self._entries) >= MAX_ENTRIES:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (expires, image)
+
+    @staticmethod
+    def _build(recipe_key: str, source: str, infos: tuple[VariantInfo, ...] | None = None) -> ResponsiveImage:
+        recipe = RECIPES[recipe_key]
+        fallback_size = (recipe.crop.ar_w, recipe.crop.ar_h) if recipe.crop else None
+
+        if not source:
+            return ResponsiveImage(original_url="", candidates=(), fallback_size=fallback_size)
+
+        if recipe.src_root == "media":
+            original_url = source
+            if infos is None:
+                infos = media_variants(recipe_key, media_name_from_url(source), use_cache=False)
+            url_for = default_storage.url
+        else:
+            original_url = static(source)
+            infos = static_variants(source)
+            url_for = static
+
+        wanted = set(recipe.widths)
+        by_format: dict[str, list[Candidate]] = {}
+        lqip = None
+        for v in infos:
+            if v.format == PLACEHOLDER_FORMAT:
+                lqip = v
+            elif variant_width(v.name) in wanted:
+                by_format.setdefault(v.format, []).append(Candidate(url=url_for(v.name), width=v.width, height=v.height))
+
+        candidates = tuple(by_format.get(SRCSET_FORMAT, ()))
+        # A width's formats are recorded together (hr_core.media_jobs), so alternates match the WebP widths.
+        sources = tuple(SourceSet(format=f, candidates=tuple(by_format[f])) for f in SOURCE_FORMATS if by_format.get(f) and candidates)
+
+        # Only call it complete once every recipe width has been generated.
+        return ResponsiveImage(
+            original_url=original_url,
+            candidates=candidates,
+            fallback_size=fallback_size,
+            complete=len(candidates) == len(wanted),
+            sources=sources,
+            placeholder=lqip.data if lqip else "",
+            placeholder_size=(lqip.width, lqip.height) if lqip else None,
+        )
+
+
+registry = SrcsetRegistry()
@@ -0,0 +1,79 @@
+# hr_core/templatetags/critical_css.py
+
+"""
+Inline the built critical stylesheet into <head>:
+
+    {% load critical_css %}
+    {% inline_critical_css %}
+
+The CSS is read from static storage the first time a built file is seen and
+kept in process memory keyed by its content-hashed name, so each build is
+read once per process. ManifestStaticFilesStorage's copy is used, with
+url()s already pointing at hashed names; Vite emits them absolute (`base`),
+so they resolve the same inline as from the stylesheet.
+
+In Vite dev mode, or when the build cannot be read, a <link> to the same
+entry is rendered instead so HMR keeps working.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+
+from django import template
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+from django_vite.templatetags.django_vite import vite_asset_url
+
+from hr_core import vite_manifest
+
+logger = logging.getLogger(__name__)
+
+register = template.Library()
+
+CRITICAL_ENTRY = "css/critical.css"
+
+_inlined: dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def _read_built(file: str) -> str:
+    name = f"{vite_manifest.static_url_prefix()}/{file}"
+    stored_name = getattr(staticfiles_storage, "stored_name", None)
+    if stored_name is not None:
+        name = stored_name(name)
+    with staticfiles_storage.open(name) as fh:
+        return fh.read().decode("utf-8")
+
+
+def _built_css(entry: str) -> str | None:
+    if vite_manifest.dev_mode():
+        return None
+
+    chunk = vite_manifest.load_manifest().get(entry)
+    if not chunk:
+        return None
+
+    file = chunk["file"]
+    css = _inlined.get(file)
+    if css is None:
+        try:
+            css = _read_built(file)
+        except (OSError, ValueError):
+            logger.warning("critical_css.unreadable", extra={"entry": entry, "file": file})
+            return None
+        with _lock:
+            _inlined[file] = css
+    return css
+
+
+@register.simple_tag
+def inline_critical_css(entry: str = CRITICAL_ENTRY) -> str:
+    css = _built_css(entry)
+    if css is None:
+        return format_html('<link rel="stylesheet" href="{}">', vite_asset_url(entry))
+    # Built by our own pipeline; only a literal </style> could break out of the element.
+    css = css.replace("</style", "<\\/style")
+    return mark_safe(f"<style>{css}</style>")
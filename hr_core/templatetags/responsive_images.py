@@ -1,63 +1,93 @@
 # hr_core/templatetags/responsive_images.py
 
-from __future__ import annotations
+"""
+Responsive-image helpers backed by hr_core.srcset_registry.
+
+Widths come from RECIPES and only variants recorded in the manifest are
+listed, so srcsets never point at files that have not been generated yet;
+URLs fall back to the original until they are. For intrinsic dimensions use
+the `responsive_image` tag:
+
+    {% responsive_image "variant" image.url as img %}
+    <img src="{{ img|at_width:512 }}" {% if img.srcset %}srcset="{{ img.srcset }}"{% endif %}
+         width="{{ img.width }}" height="{{ img.height }}">
+
+Wrap it in <picture> with `picture_sources` to offer the AVIF/JPEG XL
+encodings; the <img> stays the WebP/original fallback. Leave it out where
+scripts swap the <img> srcset (carousel stage, product modal), since a
+<source> would win over it:
+
+    <picture>
+        {% picture_sources img "(max-width: 640px) 92vw, 900px" %}
+        <img ...>
+    </picture>
 
-from pathlib import PurePosixPath
-from urllib.parse import urlsplit, urlunsplit
+`placeholder_style` paints the inline LQIP (when the pipeline made one)
+behind a lazily loaded <img> until the real image decodes over it:
+
+    <img ... style="{% placeholder_style img %}">
+"""
+
+from __future__ import annotations
 
 from django import template
 from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from hr_core.media_jobs import RECIPES
+from hr_core.responsive_backgrounds import first_background
+from hr_core.srcset_registry import ResponsiveImage, registry
 
 register = template.Library()
 
 
-# ------------------------------
-# Media URL helpers (ImageField)
-# ------------------------------
+@register.simple_tag
+def responsive_image(recipe_key: str, source: str) -> ResponsiveImage:
+    return registry.get(recipe_key, source)
 
-def _swap_dir_and_suffix(url: str, subdir: str, suffix: str) -> str:
-    """
-    Given an ImageField URL like /media/hr_about/foo.jpg,
-    produce /media/hr_about/<subdir>/foo<suffix>.webp
-    """
-    if not url:
-        return url
 
-    parts = urlsplit(url)
-    path = parts.path
+@register.filter
+def at_width(image: ResponsiveImage, width: int) -> str:
+    return image.url(int(width))
+
 
-    if "/" not in path:
-        return url
+@register.simple_tag
+def placeholder_style(image: ResponsiveImage) -> str:
+    if not image.placeholder:
+        return ""
+    return format_html("background: url({}) center / cover no-repeat;", image.placeholder)
 
-    dirpath, filename = path.rsplit("/", 1)
-    stem = filename.rsplit(".", 1)[0]
-    new_path = f"{dirpath}/{subdir}/{stem}{suffix}.webp"
-    return urlunsplit((parts.scheme, parts.netloc, new_path, parts.query, parts.fragment))
+
+@register.simple_tag
+def picture_sources(image: ResponsiveImage, sizes: str = "") -> str:
+    return format_html_join("\n", '<source type="{}" srcset="{}" sizes="{}">', ((src.type, src.srcset, sizes) for src in image.sources))
 
 
+# ------------------------------
+# Media URL helpers (ImageField)
+# ------------------------------
+
 @register.filter
 def about_img_url(url: str, width: int) -> str:
-    return _swap_dir_and_suffix(url, "opt_webp", f"-{int(width)}w")
+    return registry.get("about", url).url(int(width))
 
 
 @register.filter
 def about_img_srcset(url: str) -> str:
-    widths = (640, 960, 1280, 1600, 1920)
-    return ", ".join(f"{about_img_url(url, w)} {w}w" for w in widths)
+    return registry.get("about", url).srcset
 
 
 @register.filter
 def post_hero_url(url: str, width: int) -> str:
-    return _swap_dir_and_suffix(url, "opt", f"-{int(width)}w")
+    return registry.get("post_hero", url).url(int(width))
 
 
 @register.filter
 def post_hero_srcset(url: str) -> str:
-    widths = (640, 960, 1280, 1600)
-    return ", ".join(f"{post_hero_url(url, w)} {w}w" for w in widths)
+    return registry.get("post_hero", url).srcset
 
 
-ALLOWED_VARIANT_SIZES = {"256", "512", "768"}
+ALLOWED_VARIANT_SIZES = {str(w) for w in RECIPES["variant"].widths}
 
 
 @register.filter
@@ -69,65 +99,55 @@ def variant_img_url(url: str, size: int | str) -> str:
     if s not in ALLOWED_VARIANT_SIZES:
         raise ValueError(f"variant_img_url: invalid size {size!r}")
 
-    return _swap_dir_and_suffix(url, "opt_webp", f"-{s}w")
+    return registry.get("variant", url).url(int(s))
 
 
 @register.filter
 def variant_img_srcset(url: str) -> str:
-    return ", ".join(
-        [
-            f"{variant_img_url(url, 256)} 256w",
-            f"{variant_img_url(url, 512)} 512w",
-            f"{variant_img_url(url, 768)} 768w",
-        ]
-    )
+    return registry.get("variant", url).srcset
 
 
 # ------------------------------
 # Static background/wipe helpers
 # ------------------------------
 
-def _static_variant_from_source(source_static_path: str, out_bucket: str, out_subdir: str, width: int) -> str:
-    """
-    Convert a source static asset path like:
-      hr_core/images/backgrounds/hero-01.jpg
-
-    into a generated variant static path like:
-      hr_core/images/backgrounds/bg_opt/hero-01-1920w.webp
-
-    Assumes variants are written alongside the sources inside static:
-      hr_core/static/hr_core/images/<bucket>/<out_subdir>/<stem>-<w>w.webp
-
-    and Django serves it under /static/.
-    """
-    if not source_static_path:
-        return source_static_path
-
-    p = PurePosixPath(source_static_path)
-    stem = p.stem
-    out_rel = PurePosixPath("hr_core") / "images" / out_bucket / out_subdir / f"{stem}-{int(width)}w.webp"
-    return static(str(out_rel))
-
-
 @register.simple_tag
 def background_url(source_static_path: str, width: int) -> str:
-    # recipe: bg_section -> out_subdir "bg_opt"
-    return _static_variant_from_source(source_static_path, out_bucket="backgrounds", out_subdir="bg_opt", width=width)
+    return registry.get("bg_section", source_static_path).url(int(width))
 
 
 @register.simple_tag
 def background_srcset(source_static_path: str) -> str:
-    widths = (960, 1920)
-    return ", ".join(f"{background_url(source_static_path, w)} {w}w" for w in widths)
+    return registry.get("bg_section", source_static_path).srcset
+
+
+@register.simple_tag
+def background_preload() -> str:
+    """
+    <link rel=preload> for the first configured parallax background, built
+    from the same manifest entries as its image-set() rule (best format
+    only, same density descriptors), so the preloaded file is the one used.
+    """
+    image = first_background()
+    if image is None:
+        return ""
+
+    entries = image.preferred
+    if not entries:
+        return format_html('<link rel="preload" as="image" href="{}" fetchpriority="high">', static(image.fallback))
+
+    srcset = ", ".join(f"{static(e.name)} {e.density}" for e in entries)
+    return format_html(
+        '<link rel="preload" as="image" href="{}" imagesrcset="{}" type="{}" fetchpriority="high">',
+        static(entries[0].name), srcset, entries[0].type,
+    )
 
 
 @register.simple_tag
 def wipe_url(source_static_path: str, width: int) -> str:
-    # recipe: wipe_section -> out_subdir "opt_webp"
-    return _static_variant_from_source(source_static_path, out_bucket="wipes", out_subdir="opt_webp", width=width)
+    return registry.get("wipe_section", source_static_path).url(int(width))
 
 
 @register.simple_tag
 def wipe_srcset(source_static_path: str) -> str:
-    widths = (960, 1440, 1920, 2560)
-    return ", ".join(f"{wipe_url(source_static_path, w)} {w}w" for w in widths)
+    return registry.get("wipe_section", source_static_path).srcset
@@ -0,0 +1 @@
+# hr_core/tests/__init__.py
@@ -0,0 +1,115 @@
+# hr_core/tests/test_fragment_cache.py
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from hr_about.models import PullQuote
+from hr_core import fragment_cache
+
+
+class SharedLocMemCache(LocMemCache):
+    """
+    Stands in for Redis: the suite runs in one process, so local memory is shared here.
+    """
+
+
+SHARED_CACHES = {"default": {"BACKEND": "hr_core.tests.test_fragment_cache.SharedLocMemCache"}}
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class FragmentCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        PullQuote.objects.create(text="Loud.", attribution="A fan")
+
+    def _get(self, name, query=None, **headers):
+        return self.client.get(reverse(name), query, HTTP_HX_REQUEST="true", **headers)
+
+    def _body_keys(self):
+        return [key for key in cache._cache if key.startswith(":1:fragment:body:")]
+
+    def test_matching_etag_returns_304_without_running_the_view(self):
+        first = self._get("hr_about:get_quotes_partial")
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("HX-Request", first["Vary"])
+
+        with CaptureQueriesContext(connection) as ctx:
+            second = self._get("hr_about:get_quotes_partial", HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second["ETag"], first["ETag"])
+        # Only the session lookup from the middleware stack remains.
+        self.assertFalse([q for q in ctx.captured_queries if "hr_about_" in q["sql"]])
+
+    def test_public_fragment_is_served_from_cache(self):
+        first = self._get("hr_about:get_quotes_partial")
+
+        with CaptureQueriesContext(connection) as ctx:
+            second = self._get("hr_about:get_quotes_partial")
+
+        self.assertEqual(second.content, first.content)
+        # Only the session lookup from the middleware stack remains.
+        self.assertFalse([q for q in ctx.captured_queries if "hr_about_" in q["sql"]])
+
+    def test_model_write_changes_the_etag(self):
+        first = self._get("hr_about:get_quotes_partial")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PullQuote.objects.create(text="Louder.", attribution="Another fan")
+
+        second = self._get("hr_about:get_quotes_partial", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second["ETag"], first["ETag"])
+        self.assertIn(b"Louder.", second.content)
+
+    def test_htmx_and_full_requests_get_distinct_etags(self):
+        htmx = self._get("hr_about:get_quotes_partial")
+        plain = self.client.get(reverse("hr_about:get_quotes_partial"))
+
+        self.assertNotEqual(htmx["ETag"], plain["ETag"])
+
+    def test_private_fragment_needs_csrf_cookie_and_is_not_stored(self):
+        without_cookie = self._get("hr_access:account_get_sidebar_panel")
+        self.assertNotIn("ETag", without_cookie)
+
+        self.client.cookies["csrftoken"] = "a" * 32
+        first = self._get("hr_access:account_get_sidebar_panel")
+        self.assertIn("private", first["Cache-Control"])
+        self.assertEqual(self._get("hr_access:account_get_sidebar_panel", HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+
+        self.client.cookies["csrftoken"] = "b" * 32
+        self.assertEqual(self._get("hr_access:account_get_sidebar_panel", HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 200)
+        self.assertFalse(self._body_keys())
+
+    def test_undeclared_query_params_share_one_entry(self):
+        first = self._get("hr_bulletin:bulletin_list_partial", {"page": "1", "utm_source": "a"})
+        second = self._get("hr_bulletin:bulletin_list_partial", {"page": "1", "utm_source": "b"})
+
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertEqual(len(self._body_keys()), 1)
+
+    def test_rejected_query_param_is_not_cached(self):
+        for page in ("01", "abc", str(fragment_cache.MAX_CACHED_PAGE + 1)):
+            response = self._get("hr_bulletin:bulletin_list_partial", {"page": page})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("ETag", response)
+
+        self.assertFalse(self._body_keys())
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_process_local_cache_passes_through(self):
+        first = self._get("hr_about:get_quotes_partial")
+
+        self.assertEqual(first.status_code, 200)
+        self.assertNotIn("ETag", first)
+        self.assertFalse(self._body_keys())
+
+    def test_unknown_scope_is_rejected(self):
+        with self.assertRaises(ValueError):
+            fragment_cache.cached_fragment("nope")
@@ -0,0 +1,54 @@
+# hr_core/tests/test_loadtest.py
+
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+
+from hr_core.loadtest import fakes, stats
+
+
+class LoadtestTests(TransactionTestCase):
+
+    def test_percentiles_and_regression_compare(self):
+        values = sorted(x / 1000 for x in range(1, 101))
+        self.assertEqual(stats.percentile(values, 50), 0.05)
+        self.assertEqual(stats.percentile(values, 99), 0.099)
+        self.assertEqual(stats.percentile([], 95), 0.0)
+
+        before = {"steps": {"browse": {"p95_ms": 10.0, "errors": 0}, "webhook": {"p95_ms": 10.0, "errors": 0}}}
+        after = {"steps": {"browse": {"p95_ms": 11.0, "errors": 0}, "webhook": {"p95_ms": 13.0, "errors": 0}, "pay": {"p95_ms": 5.0, "errors": 0}}}
+        rows = {r["step"]: r for r in stats.compare(before, after, threshold_pct=20)}
+        self.assertFalse(rows["browse"]["regression"])
+        self.assertTrue(rows["webhook"]["regression"])
+        self.assertIsNone(rows["pay"]["change_pct"])
+
+    def test_fake_stripe_form_parsing_and_signature(self):
+        import stripe
+
+        parsed = fakes.parse_stripe_form("metadata[order_id]=7&line_items[0][quantity]=2&line_items[0][price_data][unit_amount]=1500&mode=payment")
+        self.assertEqual(parsed["metadata"], {"order_id": "7"})
+        self.assertEqual(parsed["line_items"]["0"]["price_data"]["unit_amount"], "1500")
+
+        payload = b'{"id": "evt_1"}'
+        header = fakes.sign_webhook_payload(payload, "whsec_x")
+        self.assertTrue(stripe.WebhookSignature.verify_header(payload.decode(), header, "whsec_x"))
+
+    @override_settings(STORAGES={"default": {"BACKEND": "django.core.files.storage.FileSystemStorage"}, "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}})
+    def test_single_journey_reaches_paid_order(self):
+        from hr_shop.models import Order, PaymentStatus, Product, ProductVariant
+
+        product = Product.objects.create(name="Loadtest Tee", active=True)
+        ProductVariant.objects.create(product=product, sku="LT-1", name="M", price="20.00", is_display_variant=True)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "run.json"
+            call_command("loadtest", shoppers=1, concurrency=1, warmup=0, stripe_latency_ms=0, mailjet_latency_ms=0, output=output, stdout=StringIO())
+            result = stats.load_results(output)
+
+        self.assertEqual(result["meta"]["completed_journeys"], 1, result["meta"]["failures"])
+        self.assertEqual(sum(step["errors"] for step in result["steps"].values()), 0)
+        self.assertEqual(result["meta"]["stripe_requests"], 1)
+        self.assertEqual(Order.objects.get().payment_status, PaymentStatus.PAID)
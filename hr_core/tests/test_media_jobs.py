@@ -0,0 +1,161 @@
+# hr_core/tests/test_media_jobs.py
+
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from hr_core import image_batch
+from hr_core.media_jobs import CropSpec, Recipe, _build_convert_args, _placeholder_info
+from hr_core.models import PendingVariant
+
+
+class MediaSweepCommandTests(SimpleTestCase):
+
+    @staticmethod
+    def test_run_now_processes_sources_inline():
+        with tempfile.TemporaryDirectory() as media_root:
+            src_dir = Path(media_root) / "variants"
+            src_dir.mkdir(parents=True)
+            (src_dir / "shirt.png").write_bytes(b"fake")
+
+            recipe = Recipe(
+                src_root="media",
+                src_rel_dir="variants",
+                out_subdir="opt_webp",
+                widths=(256,),
+                crop=CropSpec(1, 1)
+            )
+
+            with override_settings(MEDIA_ROOT=media_root):
+                with patch("hr_core.management.commands.media_sweep.RECIPES", {"variant": recipe}):
+                    with patch("hr_core.management.commands.media_sweep.generate_variants_for_file") as gen:
+                        call_command("media_sweep", "--recipe", "variant", "--run-now")
+
+            gen.assert_called_once_with("variant", "variants/shirt.png")
+
+    def test_enqueue_mode_prints_worker_hint(self):
+        with tempfile.TemporaryDirectory() as media_root:
+            src_dir = Path(media_root) / "variants"
+            src_dir.mkdir(parents=True)
+            (src_dir / "shirt.png").write_bytes(b"fake")
+
+            recipe = Recipe(
+                src_root="media",
+                src_rel_dir="variants",
+                out_subdir="opt_webp",
+                widths=(256,),
+                crop=CropSpec(1, 1)
+            )
+
+            queue = Mock()
+            out = StringIO()
+            with override_settings(MEDIA_ROOT=media_root):
+                with patch("hr_core.management.commands.media_sweep.RECIPES", {"variant": recipe}):
+                    with patch("hr_core.management.commands.media_sweep.django_rq.get_queue", return_value=queue):
+                        call_command("media_sweep", "--recipe", "variant", stdout=out)
+
+            queue.enqueue.assert_called_once_with("hr_core.media_jobs.generate_variants_for_file", "variant", "variants/shirt.png")
+            self.assertIn("python manage.py rqworker default", out.getvalue())
+
+    def test_enqueue_falls_back_to_inline_when_rq_unavailable(self):
+        with tempfile.TemporaryDirectory() as media_root:
+            src_dir = Path(media_root) / "variants"
+            src_dir.mkdir(parents=True)
+            (src_dir / "shirt.png").write_bytes(b"fake")
+
+            recipe = Recipe(
+                src_root="media",
+                src_rel_dir="variants",
+                out_subdir="opt_webp",
+                widths=(256,),
+                crop=CropSpec(1, 1)
+            )
+
+            out = StringIO()
+            with override_settings(MEDIA_ROOT=media_root):
+                with patch("hr_core.management.commands.media_sweep.RECIPES", {"variant": recipe}):
+                    with patch("hr_core.management.commands.media_sweep.django_rq.get_queue", side_effect=RuntimeError("redis down")):
+                        with patch("hr_core.management.commands.media_sweep.generate_variants_for_file") as gen:
+                            call_command("media_sweep", "--recipe", "variant", stdout=out)
+
+            gen.assert_called_once_with("variant", "variants/shirt.png")
+            output = out.getvalue()
+            self.assertIn("falling back to inline processing", output)
+            self.assertIn("Processed 1 source files inline", output)
+
+
+class ConvertArgsTests(SimpleTestCase):
+
+    def test_all_formats_share_one_decode(self):
+        recipe = Recipe(src_root="media", src_rel_dir="variants", out_subdir="opt_webp", widths=(256,), crop=CropSpec(1, 1))
+        outs = {"webp": Path("out.webp"), "avif": Path("out.avif")}
+
+        args = _build_convert_args(Path("src.png"), outs, recipe, 256)
+
+        self.assertEqual(args.count("src.png"), 1)
+        self.assertEqual(args[args.index("-write") + 1], "out.webp")
+        self.assertEqual(args[-1], "out.avif")
+        self.assertEqual(args[args.index("-write") + 2:args.index("-write") + 4], ["-quality", str(recipe.avif_quality)])
+
+    def test_placeholder_is_inline_webp_in_recipe_framing(self):
+        from PIL import Image
+
+        recipe = Recipe(src_root="media", src_rel_dir="posts/hero", out_subdir="opt", widths=(640,), crop=CropSpec(16, 9))
+        with tempfile.TemporaryDirectory() as tmp:
+            jpeg, png = Path(tmp) / "hero.jpg", Path(tmp) / "cutout.png"
+            Image.new("RGB", (800, 800), "red").save(jpeg)
+            Image.new("RGBA", (100, 100), (0, 0, 0, 0)).save(png)
+
+            info = _placeholder_info(jpeg, recipe, "posts/hero/opt/hero-lqip.webp")
+            self.assertIsNone(_placeholder_info(png, recipe, "posts/hero/opt/cutout-lqip.webp"))
+
+        self.assertEqual((info.width, info.height, info.format), (32, 18, "lqip"))
+        self.assertTrue(info.data.startswith("data:image/webp;base64,"))
+        self.assertLess(info.size, 1024)
+
+
+class ImageBatchClaimTests(TestCase):
+
+    def setUp(self):
+        self.rows = [PendingVariant.objects.create(recipe_key="variant", src_name=f"variants/{i}.png") for i in range(3)]
+
+    def test_claims_are_disjoint_between_workers(self):
+        first = image_batch.claim_pending("w1", 2)
+        second = image_batch.claim_pending("w2", 2)
+
+        self.assertEqual([r.pk for r in first], [self.rows[0].pk, self.rows[1].pk])
+        self.assertEqual([r.pk for r in second], [self.rows[2].pk])
+        self.assertEqual(image_batch.claim_pending("w3", 2), [])
+
+    def test_failure_backs_off_then_retires_poison_row(self):
+        row = self.rows[0]
+        for _ in range(image_batch.MAX_ATTEMPTS - 1):
+            self.assertFalse(image_batch.record_failure(row, "boom"))
+            row.refresh_from_db()
+            self.assertIsNotNone(row.next_attempt_at)
+            self.assertNotIn(row.pk, [r.pk for r in image_batch.claim_pending("w1", 10)])
+            PendingVariant.objects.filter(pk=row.pk).update(next_attempt_at=None, claimed_at=None)
+
+        self.assertTrue(image_batch.record_failure(row, "boom"))
+        row.refresh_from_db()
+        self.assertIsNotNone(row.failed_at)
+        self.assertEqual(row.attempts, image_batch.MAX_ATTEMPTS)
+
+    def test_imgbatch_command_processes_claimed_rows_inline(self):
+        connection = Mock()
+        connection.get.return_value = None
+
+        with (
+            patch("hr_core.management.commands.imgbatch.django_rq.get_connection", return_value=connection),
+            patch("hr_core.management.commands.imgbatch.generate_variants_for_file", return_value={"ok": True}) as gen,
+            patch("hr_core.management.commands.imgbatch.scale_imgbatch") as scale,
+        ):
+            call_command("imgbatch", "--workers", "1", stdout=StringIO())
+
+        self.assertEqual(gen.call_count, 3)
+        self.assertFalse(PendingVariant.objects.filter(processed_at__isnull=True).exists())
+        scale.assert_called_once_with(0)
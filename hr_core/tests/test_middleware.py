@@ -0,0 +1,78 @@
+# hr_core/tests/test_middleware.py
+
+import logging
+from unittest.mock import patch
+
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from hr_common.utils.unified_logging import REQUEST_ID_HEADER, get_request_id
+from hr_core import instrumentation
+from hr_core.middleware.instrumentation import InstrumentationMiddleware
+from hr_core.middleware.request_id import RequestIdMiddleware
+from hr_core.models import MediaVariant
+from hr_core.views import metrics
+
+
+class RequestIdMiddlewareTests(SimpleTestCase):
+    def test_request_id_is_propagated_and_cleared(self):
+        factory = RequestFactory()
+        request = factory.get("/", HTTP_X_REQUEST_ID="req-123")
+        captured = {}
+
+        def get_response(_request):
+            captured["request_id"] = get_request_id()
+            return HttpResponse("ok")
+
+        middleware = RequestIdMiddleware(get_response)
+        resp = middleware(request)
+
+        self.assertEqual(captured["request_id"], "req-123")
+        self.assertEqual(resp[REQUEST_ID_HEADER], "req-123")
+        self.assertIsNone(get_request_id())
+
+
+class InstrumentationMiddlewareTests(TestCase):
+
+    def setUp(self):
+        for histogram in instrumentation.HISTOGRAMS:
+            histogram.clear()
+        self.factory = RequestFactory()
+
+    def _view(self, request):
+        for _ in range(3):
+            list(MediaVariant.objects.filter(name="x"))
+        with instrumentation.span("stripe"):
+            pass
+        return HttpResponse("ok")
+
+    @override_settings(N_PLUS_ONE_THRESHOLD=3)
+    def test_server_timing_and_completed_event(self):
+        middleware = InstrumentationMiddleware(self._view)
+
+        with patch("hr_core.middleware.instrumentation.log_event") as log:
+            resp = middleware(self.factory.get("/shop/"))
+
+        self.assertIn('db;dur=', resp["Server-Timing"])
+        self.assertIn('desc="3 queries"', resp["Server-Timing"])
+        self.assertIn('stripe;dur=', resp["Server-Timing"])
+        self.assertIn("total;dur=", resp["Server-Timing"])
+
+        (_, level, event), data = log.call_args
+        self.assertEqual(event, "request.completed")
+        self.assertEqual(data["db_queries"], 3)
+        self.assertTrue(data["n_plus_one_suspected"])
+        self.assertEqual(level, logging.WARNING)
+        self.assertEqual(data["spans"]["stripe"]["count"], 1)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_metrics_export_requires_token(self):
+        InstrumentationMiddleware(lambda r: HttpResponse("ok"))(self.factory.get("/"))
+
+        with self.assertRaises(Http404):
+            metrics(self.factory.get("/metrics/"))
+
+        resp = metrics(self.factory.get("/metrics/", HTTP_AUTHORIZATION="Bearer s3cret"))
+        body = resp.content.decode()
+        self.assertIn("# TYPE hr_http_request_duration_seconds histogram", body)
+        self.assertIn('hr_http_request_duration_seconds_count{route="unmatched",method="GET",status="2xx"} 1', body)
@@ -0,0 +1,140 @@
+# hr_core/tests/test_responsive_images.py
+
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from hr_about.models import CarouselSlide
+from hr_core.models import MediaVariant
+from hr_core.responsive_backgrounds import first_background
+from hr_core.srcset_registry import registry
+from hr_core.templatetags.responsive_images import background_preload, background_srcset, picture_sources, placeholder_style, variant_img_srcset, variant_img_url
+
+
+@override_settings(MEDIA_URL="/media/")
+class SrcsetRegistryTests(TestCase):
+
+    def setUp(self):
+        registry.clear()
+        self.addCleanup(registry.clear)
+
+    def _record(self, width):
+        MediaVariant.objects.create(
+            recipe_key="variant", src_name="variants/shirt.png", name=f"variants/opt_webp/shirt-{width}w.webp",
+            width=width, height=width, sha256=f"sha{width}", size=10
+        )
+
+    def test_srcset_lists_only_generated_widths(self):
+        self._record(256)
+        self._record(512)
+
+        self.assertEqual(
+            variant_img_srcset("/media/variants/shirt.png"),
+            "/media/variants/opt_webp/shirt-256w.webp 256w, /media/variants/opt_webp/shirt-512w.webp 512w",
+        )
+        self.assertEqual(variant_img_url("/media/variants/shirt.png", 768), "/media/variants/opt_webp/shirt-512w.webp")
+
+    def test_falls_back_to_original_without_variants(self):
+        image = registry.get("variant", "/media/variants/shirt.png")
+
+        self.assertEqual(image.srcset, "")
+        self.assertEqual(image.src, "/media/variants/shirt.png")
+        self.assertEqual((image.width, image.height), (1, 1))
+
+    def test_complete_entries_are_memoized(self):
+        for w in (256, 512, 768):
+            self._record(w)
+        first = registry.get("variant", "/media/variants/shirt.png")
+
+        with self.assertNumQueries(0):
+            again = registry.get("variant", "/media/variants/shirt.png")
+
+        self.assertIs(first, again)
+        self.assertEqual((again.width, again.height), (768, 768))
+
+    def test_alternate_formats_become_picture_sources(self):
+        self._record(256)
+        MediaVariant.objects.create(
+            recipe_key="variant", src_name="variants/shirt.png", name="variants/opt_webp/shirt-256w.avif",
+            width=256, height=256, format="avif", sha256="avif256", size=6
+        )
+        image = registry.get("variant", "/media/variants/shirt.png")
+
+        self.assertEqual(image.srcset, "/media/variants/opt_webp/shirt-256w.webp 256w")
+        self.assertEqual(
+            picture_sources(image, "50vw"),
+            '<source type="image/avif" srcset="/media/variants/opt_webp/shirt-256w.avif 256w" sizes="50vw">',
+        )
+
+    def test_placeholder_row_is_exposed_not_listed(self):
+        self._record(256)
+        MediaVariant.objects.create(
+            recipe_key="variant", src_name="variants/shirt.png", name="variants/opt_webp/shirt-lqip.webp",
+            width=32, height=32, format="lqip", sha256="lqip", size=4, data="data:image/webp;base64,AAAA"
+        )
+        image = registry.get("variant", "/media/variants/shirt.png")
+
+        self.assertEqual(image.srcset, "/media/variants/opt_webp/shirt-256w.webp 256w")
+        self.assertEqual(placeholder_style(image), "background: url(data:image/webp;base64,AAAA) center / cover no-repeat;")
+        self.assertEqual(placeholder_style(registry.get("variant", "/media/variants/other.png")), "")
+
+    def test_carousel_thumbs_resolve_from_manifest(self):
+        for stem in ("one", "two"):
+            CarouselSlide.objects.create(title=stem, image=f"hr_about/{stem}.jpg")
+            MediaVariant.objects.create(
+                recipe_key="about_thumb", src_name=f"hr_about/{stem}.jpg", name=f"hr_about/thumb_webp/{stem}-220w.webp",
+                width=220, height=220, sha256=f"sha-{stem}", size=10
+            )
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("hr_about:get_carousel_partial"))
+
+        # One manifest query for the stage image, one for the whole thumbnail strip.
+        self.assertEqual(sum("hr_core_mediavariant" in q["sql"] for q in ctx.captured_queries), 2)
+
+        self.assertContains(resp, 'src="/media/hr_about/thumb_webp/two-220w.webp"')
+        self.assertContains(resp, 'width="220" height="220"')
+
+    @override_settings(STORAGES={"default": {"BACKEND": "django.core.files.storage.FileSystemStorage"}, "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}})
+    def test_static_srcset_comes_from_manifest(self):
+        srcset = background_srcset("hr_core/images/backgrounds/parallax_bg_1-0.jpg")
+
+        self.assertIn("parallax_bg_1-0-960w.webp 960w", srcset)
+        self.assertIn("parallax_bg_1-0-1920w.webp 1920w", srcset)
+
+    @override_settings(STORAGES={"default": {"BACKEND": "django.core.files.storage.FileSystemStorage"}, "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}})
+    def test_background_preload_matches_first_section_image_set(self):
+        first = first_background()
+
+        html = background_preload()
+
+        self.assertTrue(first.entries)
+        for entry in first.preferred:
+            self.assertIn(f"/static/{entry.name} {entry.density}", html)
+        self.assertIn(f'type="{first.entries[0].type}"', html)
+
+
+class BuildResponsiveBackgroundsTests(SimpleTestCase):
+
+    def test_rewrites_only_when_inputs_change(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out_path = Path(tmp) / "responsive_backgrounds.css"
+            with patch("hr_core.management.commands.build_responsive_backgrounds.OUT_ABS_PATH", out_path):
+                call_command("build_responsive_backgrounds", stdout=StringIO())
+                first = out_path.read_text()
+                self.assertIn('type("image/webp") 2x', first)
+
+                out = StringIO()
+                call_command("build_responsive_backgrounds", stdout=out)
+                self.assertIn("up to date", out.getvalue())
+
+                with patch.dict("hr_core.config.backgrounds_config.SECTION_WIPES", {"section-wipe-9": "wipe-diamond.jpg"}):
+                    call_command("build_responsive_backgrounds", stdout=StringIO())
+                self.assertIn("#section-wipe-9.section-wipe", out_path.read_text())
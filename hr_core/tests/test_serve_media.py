@@ -0,0 +1,65 @@
+# hr_core/tests/test_serve_media.py
+
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+
+from hr_core.models import MediaVariant
+from hr_core.views import serve_media
+
+
+class ServeMediaTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root, MEDIA_ACCEL_REDIRECT_PREFIX="")
+        self.override.enable()
+        self.addCleanup(self.override.disable)
+
+        out_dir = Path(self.media_root) / "variants" / "opt_webp"
+        out_dir.mkdir(parents=True)
+        (out_dir / "shirt-256w.webp").write_bytes(b"0123456789")
+        MediaVariant.objects.create(
+            recipe_key="variant", src_name="variants/shirt.png", name="variants/opt_webp/shirt-256w.webp",
+            width=256, height=256, sha256="abc123", size=10
+        )
+        self.factory = RequestFactory()
+
+    def test_etag_comes_from_manifest(self):
+        resp = serve_media(self.factory.get("/media/variants/opt_webp/shirt-256w.webp"), "variants/opt_webp/shirt-256w.webp")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["ETag"], '"abc123"')
+        self.assertEqual(b"".join(resp.streaming_content), b"0123456789")
+
+    def test_if_none_match_returns_304_without_opening_file(self):
+        request = self.factory.get("/media/variants/opt_webp/shirt-256w.webp", HTTP_IF_NONE_MATCH='"abc123"')
+
+        with patch("pathlib.Path.open") as opener:
+            resp = serve_media(request, "variants/opt_webp/shirt-256w.webp")
+
+        self.assertEqual(resp.status_code, 304)
+        opener.assert_not_called()
+
+    def test_range_request_returns_partial_content(self):
+        request = self.factory.get("/media/variants/opt_webp/shirt-256w.webp", HTTP_RANGE="bytes=2-5")
+
+        resp = serve_media(request, "variants/opt_webp/shirt-256w.webp")
+
+        self.assertEqual(resp.status_code, 206)
+        self.assertEqual(resp["Content-Range"], "bytes 2-5/10")
+        self.assertEqual(b"".join(resp.streaming_content), b"2345")
+
+    def test_accel_redirect_hands_body_to_nginx(self):
+        with override_settings(MEDIA_ACCEL_REDIRECT_PREFIX="/_media_internal/"):
+            resp = serve_media(self.factory.get("/media/x"), "variants/opt_webp/shirt-256w.webp")
+
+        self.assertEqual(resp["X-Accel-Redirect"], "/_media_internal/variants/opt_webp/shirt-256w.webp")
+        self.assertEqual(resp.content, b"")
+
+    def test_path_traversal_is_rejected(self):
+        with self.assertRaises(Http404):
+            serve_media(self.factory.get("/media/../secret"), "../secret")
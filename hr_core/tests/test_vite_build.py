@@ -0,0 +1,96 @@
+# hr_core/tests/test_vite_build.py
+
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from hr_core import vite_manifest
+from hr_core.middleware.preload_hints import PreloadHintsMiddleware
+from hr_core.responsive_backgrounds import first_background
+from hr_core.templatetags import critical_css
+
+STATIC_STORAGES = {"default": {"BACKEND": "django.core.files.storage.FileSystemStorage"}, "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}}
+
+VITE_MANIFEST = {
+    "js/main.js": {"file": "assets/main-a1.js", "src": "js/main.js", "isEntry": True, "imports": ["_vendor-b2.js"], "css": ["assets/main-c3.css"]},
+    "_vendor-b2.js": {"file": "assets/vendor-b2.js"},
+    "css/critical.css": {"file": "assets/critical-d4.css", "src": "css/critical.css", "isEntry": True},
+    "css/noncritical.css": {"file": "assets/noncritical-e5.css", "src": "css/noncritical.css", "isEntry": True},
+}
+
+
+class ViteBuildTestMixin:
+    """
+    Points DJANGO_VITE at a throwaway production build.
+    """
+
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dist = Path(tmp.name)
+        (self.dist / "manifest.json").write_text(json.dumps(VITE_MANIFEST))
+        vite = {"default": {"dev_mode": False, "static_url_prefix": "hr_core/dist", "manifest_path": self.dist / "manifest.json"}}
+        override = override_settings(DJANGO_VITE=vite, STORAGES=STATIC_STORAGES)
+        override.enable()
+        self.addCleanup(override.disable)
+        vite_manifest.clear_manifest_cache()
+        self.addCleanup(vite_manifest.clear_manifest_cache)
+
+
+class PreloadHintsMiddlewareTests(ViteBuildTestMixin, SimpleTestCase):
+
+    def _response(self, **headers):
+        middleware = PreloadHintsMiddleware(lambda request: HttpResponse("<html></html>"))
+        return middleware(RequestFactory().get("/", **headers))
+
+    def test_full_page_gets_entry_import_font_and_background_hints(self):
+        link = self._response()["Link"]
+
+        self.assertTrue(link.startswith("</static/hr_core/dist/assets/main-a1.js>; rel=modulepreload"))
+        self.assertNotIn("critical-d4.css", link)
+        self.assertNotIn("noncritical-e5.css", link)
+        self.assertIn("</static/hr_core/dist/assets/vendor-b2.js>; rel=modulepreload", link)
+        self.assertIn("</static/hr_core/fonts/Exo2-VariableFont_wght.woff2>; rel=preload; as=font", link)
+        self.assertIn(f"/static/{first_background().preferred[-1].name} 2x", link)
+
+    def test_htmx_partials_are_skipped(self):
+        self.assertIsNone(self._response(HTTP_HX_REQUEST="true").get("Link"))
+
+    def test_not_used_in_dev_mode(self):
+        with override_settings(DJANGO_VITE={"default": {"dev_mode": True, "static_url_prefix": "hr_core/dist", "manifest_path": self.dist / "manifest.json"}}):
+            with self.assertRaises(MiddlewareNotUsed):
+                PreloadHintsMiddleware(lambda request: HttpResponse())
+
+
+class InlineCriticalCssTests(ViteBuildTestMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        static_root = self.dist / "collected"
+        (static_root / "hr_core" / "dist" / "assets").mkdir(parents=True)
+        (static_root / "hr_core" / "dist" / "assets" / "critical-d4.css").write_text("body{color:red}")
+        override = override_settings(STATIC_ROOT=static_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        critical_css._inlined.clear()
+        self.addCleanup(critical_css._inlined.clear)
+
+    def test_built_css_is_inlined_and_read_once(self):
+        self.assertEqual(critical_css.inline_critical_css(), "<style>body{color:red}</style>")
+
+        with patch("hr_core.templatetags.critical_css.staticfiles_storage.open") as opener:
+            self.assertEqual(critical_css.inline_critical_css(), "<style>body{color:red}</style>")
+        opener.assert_not_called()
+
+    def test_dev_mode_links_the_entry(self):
+        with override_settings(DJANGO_VITE={"default": {"dev_mode": True, "static_url_prefix": "hr_core/dist", "manifest_path": self.dist / "manifest.json"}}):
+            html = critical_css.inline_critical_css()
+
+        self.assertTrue(html.startswith('<link rel="stylesheet" href="'))
+        self.assertIn("css/critical.css", html)
@@ -0,0 +1,285 @@
+# hr_core/variant_manifest.py
+
+"""
+Generated-variant manifest.
+
+Every variant the media pipeline writes is recorded here with its intrinsic
+dimensions and a sha256 of its bytes, so readers never have to probe storage:
+
+- media recipes (uploads, possibly on S3) -> hr_core.models.MediaVariant rows
+- repo_static recipes (backgrounds, wipes) -> a JSON file committed next to the
+  static images, so it is available at build time without a database
+
+Each source may also have a placeholder entry (format PLACEHOLDER_FORMAT): a
+~32px blurred WebP stored inline as a data URI, so pages can paint it before
+the real image without another request.
+
+Lookups are cached (Django cache for media rows, process memory for the static
+JSON) and invalidated by the writer.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_PREFIX = "variant_manifest"
+CACHE_TIMEOUT = 60 * 60
+MANIFEST_VERSION = 1
+PLACEHOLDER_FORMAT = "lqip"
+
+
+@dataclass(frozen=True)
+class VariantInfo:
+    name: str
+    width: int
+    height: int
+    format: str
+    sha256: str
+    size: int
+    data: str = ""
+
+
+def describe_file(path: Path, name: str, *, dimensions: tuple[int, int] | None = None) -> VariantInfo:
+    """
+    Build a VariantInfo for a local file: streamed sha256, byte size and
+    intrinsic dimensions (header-only read through Pillow). Pass `dimensions`
+    when they are already known; the format then comes from the name.
+    """
+    from PIL import Image
+
+    h = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            h.update(chunk)
+            size += len(chunk)
+
+    if dimensions is not None:
+        (width, height), fmt = dimensions, Path(name).suffix.lstrip(".").lower()
+    else:
+        with Image.open(path) as im:
+            width, height = im.size
+            fmt = (im.format or Path(name).suffix.lstrip(".")).lower()
+
+    return VariantInfo(name=name, width=width, height=height, format=fmt, sha256=h.hexdigest(), size=size)
+
+
+def placeholder_info(name: str, size: tuple[int, int], webp: bytes) -> VariantInfo:
+    """
+    VariantInfo for an inline placeholder: `webp` is kept as a data URI
+    rather than written to storage.
+    """
+    uri = "data:image/webp;base64," + base64.b64encode(webp).decode("ascii")
+    return VariantInfo(name=name, width=size[0], height=size[1], format=PLACEHOLDER_FORMAT, sha256=hashlib.sha256(webp).hexdigest(), size=len(webp), data=uri)
+
+
+# ------------------------------
+# Media recipes (database)
+# ------------------------------
+
+def _media_key(recipe_key: str, src_name: str) -> str:
+    digest = hashlib.md5(f"{recipe_key}:{src_name}".encode()).hexdigest()
+    return f"{CACHE_PREFIX}:media:{digest}"
+
+
+def _etag_key(name: str) -> str:
+    digest = hashlib.md5(name.encode()).hexdigest()
+    return f"{CACHE_PREFIX}:etag:{digest}"
+
+
+def record_media_variant(recipe_key: str, src_name: str, info: VariantInfo) -> None:
+    from hr_core.models import MediaVariant
+
+    MediaVariant.objects.update_or_create(
+        name=info.name,
+        defaults={
+            "recipe_key": recipe_key,
+            "src_name": src_name,
+            "width": info.width,
+            "height": info.height,
+            "format": info.format,
+            "sha256": info.sha256,
+            "size": info.size,
+            "data": info.data,
+        },
+    )
+    cache.delete_many([_media_key(recipe_key, src_name), _etag_key(info.name)])
+
+
+def has_media_variant(name: str) -> bool:
+    from hr_core.models import MediaVariant
+
+    return MediaVariant.objects.filter(name=name).exists()
+
+
+def media_variants(recipe_key: str, src_name: str, *, use_cache: bool = True) -> tuple[VariantInfo, ...]:
+    """
+    Recorded variants for one media source, ordered by width. Callers that
+    memoize on their own (hr_core.srcset_registry) pass use_cache=False.
+    """
+    from hr_core.models import MediaVariant
+
+    key = _media_key(recipe_key, src_name)
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    rows = (
+        MediaVariant.objects.filter(recipe_key=recipe_key, src_name=src_name)
+        .order_by("width", "format")
+        .values_list("name", "width", "height", "format", "sha256", "size", "data")
+    )
+    result = tuple(VariantInfo(*row) for row in rows)
+    if use_cache:
+        cache.set(key, result, CACHE_TIMEOUT)
+    return result
+
+
+def media_variants_many(recipe_key: str, src_names) -> dict[str, tuple[VariantInfo, ...]]:
+    """
+    Bulk form of media_variants(use_cache=False): one query for a page's worth
+    of sources. Sources without recorded variants map to ().
+    """
+    from hr_core.models import MediaVariant
+
+    names = set(src_names)
+    found: dict[str, list[VariantInfo]] = {name: [] for name in names}
+    if not names:
+        return {}
+
+    rows = (
+        MediaVariant.objects.filter(recipe_key=recipe_key, src_name__in=names)
+        .order_by("width", "format")
+        .values_list("src_name", "name", "width", "height", "format", "sha256", "size", "data")
+    )
+    for src_name, *fields in rows:
+        found[src_name].append(VariantInfo(*fields))
+    return {name: tuple(infos) for name, infos in found.items()}
+
+
+def media_etag(name: str) -> str | None:
+    """
+    Content-hash ETag for a media name: generated variants come from the
+    manifest, content-addressed originals from the hr_storage hash index.
+    """
+    from hr_core.models import MediaVariant
+    from hr_storage.models import MediaBlob
+
+    key = _etag_key(name)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached or None
+
+    sha = MediaVariant.objects.filter(name=name).values_list("sha256", flat=True).first()
+    if sha is None:
+        sha = MediaBlob.objects.filter(name=name).values_list("sha256", flat=True).first()
+
+    etag = f'"{sha}"' if sha else ""
+    cache.set(key, etag, CACHE_TIMEOUT)
+    return etag or None
+
+
+# ------------------------------
+# Static recipes (JSON file)
+# ------------------------------
+
+def static_manifest_path() -> Path:
+    default = Path(settings.REPO_STATIC_ROOT) / "hr_core" / "images" / "variant_manifest.json"
+    return Path(getattr(settings, "STATIC_VARIANT_MANIFEST", default))
+
+
+@lru_cache(maxsize=1)
+def _load_static_manifest() -> dict:
+    path = static_manifest_path()
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        data = {"version": MANIFEST_VERSION, "variants": {}}
+    data.setdefault("variants", {})
+
+    by_src: dict[str, list[VariantInfo]] = {}
+    data["src_by_stem"] = {}
+    for name, e in data["variants"].items():
+        data["src_by_stem"].setdefault(_stem_key(e.get("src", "")), e.get("src", ""))
+        info = VariantInfo(name=name, width=e["width"], height=e["height"], format=e["format"], sha256=e["sha256"], size=e["size"], data=e.get("data", ""))
+        by_src.setdefault(e.get("src", ""), []).append(info)
+    data["by_src"] = {}
+    for src, infos in by_src.items():
+        ordered = tuple(sorted(infos, key=lambda v: (v.width, v.format)))
+        data["by_src"][src] = ordered
+        # Variant names only depend on the source stem, so also index extension-free.
+        data["by_src"].setdefault(_stem_key(src), ordered)
+    return data
+
+
+def variant_width(name: str) -> int | None:
+    """
+    Recipe width encoded in a variant name (<stem>-<w>w.<ext>).
+    """
+    stem = name.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+    tail = stem.rsplit("-", 1)[-1]
+    if tail.endswith("w") and tail[:-1].isdigit():
+        return int(tail[:-1])
+    return None
+
+
+def _stem_key(src_name: str) -> str:
+    return src_name.rsplit(".", 1)[0] if "." in src_name.rsplit("/", 1)[-1] else src_name
+
+
+def clear_static_manifest_cache() -> None:
+    _load_static_manifest.cache_clear()
+
+
+def record_static_variant(recipe_key: str, src_name: str, info: VariantInfo) -> None:
+    """
+    Upsert one entry in the static manifest (atomic replace). Static sweeps
+    run from a single process, so no cross-process locking is attempted.
+    """
+    path = static_manifest_path()
+    clear_static_manifest_cache()
+    data = _load_static_manifest()
+    variants = dict(data["variants"])
+    variants[info.name] = {"recipe": recipe_key, "src": src_name, **{k: v for k, v in asdict(info).items() if k != "name" and (k != "data" or v)}}
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = json.dumps({"version": MANIFEST_VERSION, "variants": dict(sorted(variants.items()))}, indent=2, sort_keys=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".variant_manifest.", suffix=".json")
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        fh.write(payload + "\n")
+    os.replace(tmp_name, path)
+    clear_static_manifest_cache()
+
+
+def has_static_variant(name: str) -> bool:
+    return name in _load_static_manifest()["variants"]
+
+
+def static_variants(src_name: str) -> tuple[VariantInfo, ...]:
+    """
+    Recorded variants for one repo-static source (path relative to REPO_STATIC_ROOT).
+    """
+    by_src = _load_static_manifest()["by_src"]
+    return by_src.get(src_name) or by_src.get(_stem_key(src_name), ())
+
+
+def static_source_name(src_name: str) -> str:
+    """
+    The source file the manifest recorded for `src_name`, which may differ
+    in extension (a configured .jpg that was replaced by a .webp); else
+    `src_name` unchanged.
+    """
+    if src_name in _load_static_manifest()["by_src"]:
+        return src_name
+    return _load_static_manifest()["src_by_stem"].get(_stem_key(src_name), src_name)
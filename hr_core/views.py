@@ -0,0 +1,188 @@
+# hr_core/views.py
+
+"""
+Media serving for deployments without a fronting web server (e.g. a single
+Fly machine). Conditional GET and Range are decided from the manifest/stat
+before the file is opened; bodies go out through FileResponse so the WSGI
+server can use sendfile, or through nginx via X-Accel-Redirect when
+MEDIA_ACCEL_REDIRECT_PREFIX is set.
+
+Also hosts the Prometheus metrics endpoint for hr_core.instrumentation.
+"""
+
+import hmac
+import mimetypes
+import posixpath
+import re
+import stat
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_etags
+from django.views.static import was_modified_since
+
+from hr_core.instrumentation import render_prometheus
+from hr_core.variant_manifest import media_etag
+
+DEFAULT_CACHE_CONTROL = "public, max-age=604800, immutable"
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+
+
+def _resolve(path: str) -> tuple[str, Path]:
+    name = posixpath.normpath(path).lstrip("/")
+    if not name or name.startswith(".."):
+        raise Http404("Invalid media path")
+    try:
+        return name, Path(safe_join(settings.MEDIA_ROOT, name))
+    except SuspiciousFileOperation as exc:
+        raise Http404("Invalid media path") from exc
+
+
+def _etag_for(name: str, st) -> str:
+    """
+    Content-hash ETag from the manifest, or a weak mtime/size tag for files
+    the manifest does not know about.
+    """
+    return media_etag(name) or f'W/"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def _strip_weak(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _is_not_modified(request, etag: str, mtime: float) -> bool:
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match:
+        tags = parse_etags(if_none_match)
+        return "*" in tags or _strip_weak(etag) in {_strip_weak(t) for t in tags}
+    if_modified_since = request.META.get("HTTP_IF_MODIFIED_SINCE")
+    if if_modified_since:
+        return not was_modified_since(if_modified_since, int(mtime))
+    return False
+
+
+def _parse_range(request, etag: str, size: int):
+    """
+    Return None (serve whole file), (start, end) for a satisfiable single
+    range, or False for an unsatisfiable one. Multi-range requests are served
+    whole, which RFC 9110 allows.
+    """
+    header = request.META.get("HTTP_RANGE")
+    if not header:
+        return None
+
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if if_range and (if_range.startswith("W/") or etag.startswith("W/") or if_range != etag):
+        return None
+
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            return False
+        start, end = max(size - length, 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _iter_range(fh, start: int, length: int):
+    try:
+        fh.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = fh.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        fh.close()
+
+
+def serve_media(request, path):
+    name, fullpath = _resolve(path)
+    try:
+        st = fullpath.stat()
+    except (FileNotFoundError, NotADirectoryError) as exc:
+        raise Http404("Media file not found") from exc
+    if not stat.S_ISREG(st.st_mode):
+        raise Http404("Media file not found")
+
+    etag = _etag_for(name, st)
+
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(st.st_mtime),
+        "Cache-Control": getattr(settings, "MEDIA_CACHE_CONTROL", DEFAULT_CACHE_CONTROL),
+        "Accept-Ranges": "bytes",
+    }
+
+    if _is_not_modified(request, etag, st.st_mtime):
+        response = HttpResponseNotModified()
+        for key in ("ETag", "Last-Modified", "Cache-Control"):
+            response[key] = headers[key]
+        return response
+
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+    accel_prefix = getattr(settings, "MEDIA_ACCEL_REDIRECT_PREFIX", "")
+    if accel_prefix:
+        # nginx streams the body (and handles Range) from its internal location.
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = f"{accel_prefix.rstrip('/')}/{quote(name)}"
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    byte_range = _parse_range(request, etag, st.st_size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{st.st_size}"
+        return response
+
+    fh = fullpath.open("rb")
+    if byte_range is None:
+        response = FileResponse(fh, content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(_iter_range(fh, start, length), status=206, content_type=content_type)
+        response["Content-Length"] = str(length)
+        response["Content-Range"] = f"bytes {start}-{end}/{st.st_size}"
+
+    for key, value in headers.items():
+        response[key] = value
+    return response
+
+
+def metrics(request):
+    """
+    Per-process latency histograms in Prometheus text format. Requires
+    `Authorization: Bearer <METRICS_TOKEN>`; without a token it is only
+    reachable in DEBUG.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(supplied, token):
+            raise Http404()
+    elif not settings.DEBUG:
+        raise Http404()
+
+    return HttpResponse(render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,73 @@
+# hr_core/vite_manifest.py
+
+"""
+Read-side access to the Vite build manifest configured in
+DJANGO_VITE["default"] (hr_config/settings/vite.py).
+
+django-vite resolves tags on its own; this module serves the code that needs
+the built files directly (preload hints, inlined critical CSS). The manifest
+is read once per process; in dev mode there is no build to read.
+"""
+
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.templatetags.static import static
+
+
+def _config() -> dict:
+    return settings.DJANGO_VITE["default"]
+
+
+def dev_mode() -> bool:
+    return bool(_config().get("dev_mode"))
+
+
+def manifest_path() -> Path:
+    return Path(_config()["manifest_path"])
+
+
+@lru_cache(maxsize=1)
+def load_manifest() -> dict:
+    try:
+        return json.loads(manifest_path().read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def clear_manifest_cache() -> None:
+    load_manifest.cache_clear()
+
+
+def entry_chunks(entry: str) -> list[dict]:
+    """
+    The manifest chunk for `entry` (source path relative to the Vite root,
+    e.g. "js/main.js") followed by every chunk it statically imports,
+    depth-first, without duplicates. Empty when the entry is not built.
+    """
+    manifest = load_manifest()
+    chunks: list[dict] = []
+    seen: set[str] = set()
+
+    def visit(key: str) -> None:
+        if key in seen or key not in manifest:
+            return
+        seen.add(key)
+        chunks.append(manifest[key])
+        for imported in manifest[key].get("imports", ()):
+            visit(imported)
+
+    visit(entry)
+    return chunks
+
+
+def static_url_prefix() -> str:
+    return _config()["static_url_prefix"]
+
+
+def asset_url(file: str) -> str:
+    return static(f"{static_url_prefix()}/{file}")
@@ -1,11 +1,15 @@
 # hr_django/urls.py
 
+import re
+
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth import views as auth_views
 from django.http import HttpResponse, JsonResponse
-from django.urls import include, path
+from django.urls import include, path, re_path
+
+from hr_core.views import metrics, serve_media
 
 
 def health_check(request):
@@ -13,6 +17,7 @@ def health_check(request):
 
 urlpatterns = [
     path("health/", health_check),
+    path("metrics/", metrics),
     path("about/", include("hr_about.urls")),
     path("user/", include("hr_access.urls")),
     path("bulletin/", include("hr_bulletin.urls")),
@@ -38,5 +43,8 @@ if settings.DEBUG:
     except ModuleNotFoundError:
         pass
 
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+
+# Local media (filesystem storage only): conditional GET / Range / sendfile.
+if (settings.DEBUG or settings.SERVE_MEDIA) and settings.MEDIA_URL.startswith("/"):
+    urlpatterns.append(re_path(rf"^{re.escape(settings.MEDIA_URL.lstrip('/'))}(?P<path>.*)$", serve_media))
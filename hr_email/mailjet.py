@@ -6,6 +6,8 @@ from functools import lru_cache
 from django.conf import settings
 from mailjet_rest import Client
 
+from hr_core.instrumentation import span
+
 
 class MailjetSendError(RuntimeError):
     """Raised when Mailjet returns a non-2xx response."""
@@ -17,7 +19,8 @@ def get_mailjet_client() -> Client | None:
     api_secret = getattr(settings, "MAILJET_API_SECRET", None)
     if not api_key or not api_secret:
         return None
-    return Client(auth=(api_key, api_secret), version="v3.1")
+    api_url = getattr(settings, "MAILJET_API_URL", "")
+    return Client(auth=(api_key, api_secret), version="v3.1", **({"api_url": api_url} if api_url else {}))
 
 
 def send_mailjet_email(
@@ -51,7 +54,8 @@ def send_mailjet_email(
         message["SandboxMode"] = True
 
     payload = {"Messages": [message]}
-    resp = client.send.create(data=payload)
+    with span("mailjet"):
+        resp = client.send.create(data=payload)
     if resp.status_code >= 300:
         raise MailjetSendError(f"Mailjet send failed ({resp.status_code}): {resp.json()}")
     return resp.json()
@@ -10,6 +10,7 @@ from django.core.mail import EmailMultiAlternatives, get_connection
 from django.utils.html import strip_tags
 
 from hr_common.utils.unified_logging import log_event
+from hr_core.instrumentation import span
 from hr_email.mailjet import MailjetSendError, send_mailjet_email
 from hr_email.provider_settings import (
     get_mailjet_rest_enabled,
@@ -148,7 +149,8 @@ def send_app_email(
     if html_body:
         msg.attach_alternative(html_body, "text/html")
 
-    sent = msg.send(fail_silently=False)
+    with span("smtp"):
+        sent = msg.send(fail_silently=False)
     log_event(
         logger,
         logging.INFO,
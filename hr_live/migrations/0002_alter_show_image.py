@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:54
+
+from django.db import migrations
+
+import hr_live.models
+import hr_storage.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hr_live", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="show",
+            name="image",
+            field=hr_storage.fields.ContentAddressedImageField(null=True, upload_to=hr_live.models.show_image_storage),
+        ),
+    ]
@@ -15,6 +15,7 @@ from phonenumber_field.phonenumber import PhoneNumber
 from hr_common.db.slug import sync_slug_from_source
 from hr_common.models import Address
 from hr_live.managers import ActManager, BookerManager, MusicianManager, ShowManager, VenueManager
+from hr_storage.fields import ContentAddressedImageField
 
 
 def fmt(obj):
@@ -269,7 +270,7 @@ class Show(models.Model):
     lineup = models.ManyToManyField(Act, related_name="shows", verbose_name="Lineup")
     date = models.DateField(null=True, blank=False, default=None, verbose_name="Date")
     time = models.TimeField(null=True, blank=False, default=None, verbose_name="Time")
-    image = models.ImageField(upload_to=show_image_storage, max_length=100, null=True)
+    image = ContentAddressedImageField(upload_to=show_image_storage, max_length=100, null=True)
     slug = models.SlugField(max_length=140, unique=True, blank=True, help_text="URL identifier auto-generated from date and venue.")
     status = models.CharField(max_length=10, default="draft", choices=STATUS_CHOICES)
     timezone = models.CharField(max_length=50, default="America/Chicago", verbose_name="Timezone")
@@ -49,7 +49,7 @@ def _serialize_show(show: Show) -> dict[str, Any]:
 
 
 def live_upcoming_list(request):
-    qs = Show.objects.upcoming()
+    qs = Show.objects.upcoming().select_related("venue").prefetch_related("lineup")
     page_obj = paginate(request, qs, per_page=10)
     log_event(logger, logging.INFO, "live.upcoming_list.rendered", page_number=page_obj.number, total_count=page_obj.paginator.count)
 
@@ -64,7 +64,7 @@ def live_upcoming_list(request):
 
 
 def live_past_list(request):
-    qs = Show.objects.past()
+    qs = Show.objects.past().select_related("venue").prefetch_related("lineup")
     page_obj = paginate(request, qs, per_page=10)
     log_event(logger, logging.INFO, "live.past_list.rendered", page_number=page_obj.number, total_count=page_obj.paginator.count)
 
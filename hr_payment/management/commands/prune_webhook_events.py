@@ -0,0 +1,34 @@
+# hr_payment/management/commands/prune_webhook_events.py
+
+import django_rq
+from django.core.management.base import BaseCommand
+
+from hr_payment.services.webhook_retention import BATCH_SIZE, prune
+
+
+class Command(BaseCommand):
+    help = (
+        "Archive processed WebhookEvents past WEBHOOK_EVENT_RETENTION_DAYS to gzipped JSONL in storage and delete them; "
+        "clear PaymentAttempt.raw past PAYMENT_ATTEMPT_RAW_RETENTION_DAYS. Queued on RQ unless --run-now."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--run-now", action="store_true", help="Run synchronously instead of enqueueing an RQ job.")
+        parser.add_argument("--dry-run", action="store_true", help="Count what would be archived/cleared; implies --run-now.")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help=f"Rows per archive file / update (default {BATCH_SIZE}).")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if not (options["run_now"] or options["dry_run"]):
+            try:
+                django_rq.get_queue("default").enqueue("hr_payment.services.webhook_retention.prune", batch_size=batch_size, job_id="prune-webhook-events")
+                self.stdout.write(self.style.SUCCESS("Queued prune-webhook-events. Start an RQ worker to process it: python manage.py rqworker default"))
+                return
+            except Exception as exc:
+                self.stdout.write(self.style.WARNING(f"RQ unavailable ({exc}); running inline."))
+
+        counts = prune(batch_size=batch_size, dry_run=options["dry_run"])
+        prefix = "Would archive" if options["dry_run"] else "Archived"
+        self.stdout.write(
+            self.style.SUCCESS(f"{prefix} {counts['archived']} webhook event(s) in {counts['files']} file(s); cleared {counts['attempts_cleared']} attempt snapshot(s)")
+        )
@@ -0,0 +1,58 @@
+# hr_payment/management/commands/stripe_catch_up.py
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from hr_core.services.payments import PaymentError
+from hr_payment.services.stripe_events import HANDLERS, catch_up, last_processed_at
+
+# Re-read a little before the last processed event: deliveries are not ordered, and known ids are skipped anyway.
+OVERLAP = timedelta(minutes=15)
+# Stripe only lists events from the last 30 days.
+MAX_LOOKBACK = timedelta(days=30)
+
+
+class Command(BaseCommand):
+    help = "Apply Stripe events the webhook missed (outage, failed deliveries), reading Stripe's event list since the last processed WebhookEvent."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="ISO 8601 datetime to start from (default: last processed WebhookEvent minus 15 minutes).")
+        parser.add_argument("--type", action="append", dest="types", choices=sorted(HANDLERS), help="Only this event type (repeatable).")
+        parser.add_argument("--dry-run", action="store_true", help="Count what would be applied without changing anything.")
+
+    def handle(self, *args, **options):
+        since = self._since(options["since"])
+        try:
+            counts = catch_up(since, types=options["types"], dry_run=options["dry_run"])
+        except PaymentError as exc:
+            raise CommandError(f"Could not list Stripe events: {exc}") from exc
+
+        verb = "would apply" if options["dry_run"] else "applied"
+        self.stdout.write(
+            f"Stripe events since {since.isoformat()}: {counts['seen']} seen, {counts['applied']} {verb}, "
+            f"{counts['skipped']} already processed, {counts['failed']} failed"
+        )
+        if counts["failed"]:
+            raise CommandError(f"{counts['failed']} event(s) failed; see payment.webhook.processing_failed log events and WebhookEvent.error.")
+
+    def _since(self, value):
+        now = timezone.now()
+        if value:
+            since = parse_datetime(value)
+            if since is None:
+                raise CommandError(f"--since: not an ISO 8601 datetime: {value!r}")
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+        else:
+            last = last_processed_at()
+            if last is None:
+                raise CommandError("No processed WebhookEvent to start from; pass --since.")
+            since = last - OVERLAP
+
+        if since < now - MAX_LOOKBACK:
+            self.stderr.write(f"Stripe keeps 30 days of events; starting from {(now - MAX_LOOKBACK).isoformat()}.")
+            since = now - MAX_LOOKBACK
+        return since
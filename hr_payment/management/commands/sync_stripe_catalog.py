@@ -0,0 +1,21 @@
+# hr_payment/management/commands/sync_stripe_catalog.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hr_payment.services.stripe_catalog import sync_variants
+
+
+class Command(BaseCommand):
+    help = "Create/update Stripe Products and Prices for shop variants and refresh the local mapping (StripeProductMap / StripePriceMap)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--variant", type=int, action="append", dest="variant_ids", help="Only sync this variant id (repeatable).")
+
+    def handle(self, *args, **options):
+        counts = sync_variants(options["variant_ids"])
+        self.stdout.write(
+            f"Stripe catalog: {counts['products']} products created/updated, {counts['prices']} prices created/updated, "
+            f"{counts['unchanged']} unchanged, {counts['failed']} failed"
+        )
+        if counts["failed"]:
+            raise CommandError(f"{counts['failed']} variant(s) failed to sync; see payment.catalog.sync_failed log events.")
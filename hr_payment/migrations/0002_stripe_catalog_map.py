@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:33
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hr_payment", "0001_initial"),
+        ("hr_shop", "0002_alter_productimage_image"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StripePriceMap",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("stripe_price_id", models.CharField(max_length=255, unique=True)),
+                ("unit_amount", models.PositiveIntegerField()),
+                ("currency", models.CharField(default="usd", max_length=10)),
+                ("active", models.BooleanField(default=True)),
+                ("synced_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("variant", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name="stripe_price", to="hr_shop.productvariant")),
+            ],
+        ),
+        migrations.CreateModel(
+            name="StripeProductMap",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("stripe_product_id", models.CharField(max_length=255, unique=True)),
+                ("name", models.CharField(max_length=255)),
+                ("active", models.BooleanField(default=True)),
+                ("synced_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("product", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name="stripe_map", to="hr_shop.product")),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hr_payment", "0002_stripe_catalog_map"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="webhookevent",
+            index=models.Index(fields=["ok", "received_at"], name="hr_payment__ok_ca1572_idx"),
+        ),
+    ]
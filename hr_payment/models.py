@@ -62,6 +62,11 @@ class PaymentAttempt(models.Model):
 class WebhookEvent(models.Model):
     """
     Idempotency + audit log for inbound webhook payloads.
+
+    Payloads are trimmed to the fields the handlers read
+    (hr_payment.services.stripe_events.stored_payload). Processed rows past
+    WEBHOOK_EVENT_RETENTION_DAYS are archived to storage and deleted by
+    `manage.py prune_webhook_events`.
     """
 
     event_id = models.CharField(max_length=255, unique=True)
@@ -71,3 +76,42 @@ class WebhookEvent(models.Model):
     processed_at = models.DateTimeField(null=True, blank=True)
     ok = models.BooleanField(default=False)
     error = models.TextField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["ok", "received_at"]),
+        ]
+
+
+class StripeProductMap(models.Model):
+    """
+    Local mirror of the Stripe Product for a shop Product
+    (hr_payment.services.stripe_catalog). Checkout reads it instead of
+    asking Stripe.
+    """
+
+    product = models.OneToOneField("hr_shop.Product", on_delete=models.CASCADE, related_name="stripe_map")
+    stripe_product_id = models.CharField(max_length=255, unique=True)
+    name = models.CharField(max_length=255)
+    active = models.BooleanField(default=True)
+    synced_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.product_id} -> {self.stripe_product_id}"
+
+
+class StripePriceMap(models.Model):
+    """
+    Current Stripe Price for a ProductVariant. Stripe prices are immutable:
+    a price change creates a new Price and replaces this row's id.
+    """
+
+    variant = models.OneToOneField("hr_shop.ProductVariant", on_delete=models.CASCADE, related_name="stripe_price")
+    stripe_price_id = models.CharField(max_length=255, unique=True)
+    unit_amount = models.PositiveIntegerField()
+    currency = models.CharField(max_length=10, default="usd")
+    active = models.BooleanField(default=True)
+    synced_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.variant_id} -> {self.stripe_price_id} ({self.unit_amount} {self.currency})"
@@ -8,6 +8,24 @@ from hr_shop.models import CheckoutDraft
 
 logger = logging.getLogger(__name__)
 
+SESSION_SNAPSHOT_FIELDS = ("id", "livemode", "amount_total", "currency", "status", "payment_status", "expires_at", "customer_email", "ui_mode", "return_url")
+PAYMENT_INTENT_SNAPSHOT_FIELDS = ("id", "livemode", "amount", "currency", "status")
+
+
+def session_snapshot(sess: dict) -> dict:
+    """
+    The subset of a checkout.session kept on PaymentAttempt.raw.
+    """
+    return {key: sess.get(key) for key in SESSION_SNAPSHOT_FIELDS}
+
+
+def payment_intent_snapshot(pi: dict, *extra: str) -> dict:
+    """
+    The subset of a payment_intent kept on PaymentAttempt.raw.
+    """
+    return {key: pi.get(key) for key in PAYMENT_INTENT_SNAPSHOT_FIELDS + extra}
+
+
 def mark_checkout_draft_used(order_id: int) -> None:
     qs = CheckoutDraft.objects.filter(order_id=order_id)
     updated = qs.filter(used_at__isnull=True).update(used_at=timezone.now())
@@ -0,0 +1,262 @@
+# hr_payment/services/stripe_catalog.py
+
+"""
+Mirror of the shop catalog in Stripe (Products and Prices).
+
+Saving a Product or ProductVariant marks its variants dirty in a Redis set
+and enqueues one RQ drain job (coalesced by a pending marker), so an admin
+bulk edit costs one job rather than one per save. The job creates/updates
+Stripe Products and Prices and records them in StripeProductMap /
+StripePriceMap; variants that fail go back into the set and RQ retries the
+job, with the marker held until the set is empty. Checkout builds its line
+items from those rows by lookup and never calls Stripe to create catalog
+objects.
+
+Disabled unless ENABLE_STRIPE_CATALOG_SYNC is set; `manage.py
+sync_stripe_catalog` backfills or repairs the mapping synchronously.
+"""
+
+import logging
+from decimal import ROUND_HALF_UP, Decimal
+
+import django_rq
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.utils import timezone
+from rq import Retry
+
+from hr_common.utils.unified_logging import log_event
+from hr_core.instrumentation import span
+from hr_core.services.payments import PaymentError, PaymentTemporaryError, get_gateway
+from hr_payment.models import StripePriceMap, StripeProductMap
+from hr_shop.models import Order, Product, ProductVariant
+
+logger = logging.getLogger(__name__)
+
+CURRENCY = "usd"
+DIRTY_KEY = "stripe:catalog:dirty"
+PENDING_KEY = "stripe:catalog:pending"
+PENDING_TTL_SECONDS = 600
+DRAIN_BATCH = 100
+RETRY_INTERVALS = [10, 60, 300]
+
+
+def to_cents(amount) -> int:
+    return int((Decimal(amount) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+# ------------------------------
+# Scheduling
+# ------------------------------
+
+def schedule_catalog_sync(variant_ids) -> None:
+    """
+    Mark variants dirty once the current transaction commits.
+    """
+    if not getattr(settings, "ENABLE_STRIPE_CATALOG_SYNC", False):
+        return
+    ids = [int(pk) for pk in variant_ids]
+    if ids:
+        transaction.on_commit(lambda: _mark_dirty(ids))
+
+
+def _mark_dirty(variant_ids: list[int]) -> None:
+    connection = django_rq.get_connection("default")
+    with span("redis"):
+        connection.sadd(DIRTY_KEY, *variant_ids)
+        _arm(connection)
+
+
+def _arm(connection) -> None:
+    # No fixed job_id: a follow-up may be enqueued while the previous drain is still finishing.
+    if connection.set(PENDING_KEY, "1", nx=True, ex=PENDING_TTL_SECONDS):
+        django_rq.get_queue("default").enqueue(
+            "hr_payment.services.stripe_catalog.drain_dirty_variants",
+            retry=Retry(max=len(RETRY_INTERVALS), interval=RETRY_INTERVALS),
+        )
+
+
+def drain_dirty_variants() -> dict:
+    """
+    RQ job: sync every variant marked dirty, in batches. Saves that land
+    mid-drain join the set and are picked up by this run. Failed variants
+    (and the rest of a batch an unexpected error interrupted) are put back
+    and the job raises so RQ retries it; the pending marker is kept
+    meanwhile and only dropped once the set is empty.
+    """
+    connection = django_rq.get_connection("default")
+    totals = {"products": 0, "prices": 0, "unchanged": 0, "failed": 0}
+    failed: list[int] = []
+    try:
+        while True:
+            with span("redis"):
+                batch = [int(pk) for pk in connection.spop(DIRTY_KEY, DRAIN_BATCH) or ()]
+            if not batch:
+                break
+            try:
+                counts, batch_failed = _sync_variants(batch)
+            except Exception:
+                failed.extend(batch)
+                raise
+            failed.extend(batch_failed)
+            for key, value in counts.items():
+                totals[key] += value
+    finally:
+        if failed:
+            with span("redis"):
+                connection.sadd(DIRTY_KEY, *failed)
+            log_event(logger, logging.WARNING, "payment.catalog.requeued", variant_ids=failed)
+
+    if failed:
+        raise PaymentTemporaryError(f"{len(failed)} variant(s) failed to sync; requeued for retry.")
+
+    with span("redis"):
+        connection.delete(PENDING_KEY)
+        # A save between the last spop and the delete saw the marker and did not enqueue.
+        if connection.scard(DIRTY_KEY):
+            _arm(connection)
+    return totals
+
+
+# ------------------------------
+# Sync
+# ------------------------------
+
+def sync_variants(variant_ids=None) -> dict:
+    """
+    Bring Stripe and the mapping tables up to date for the given variants
+    (all variants when None). Failures are logged per variant and counted;
+    the rest of the batch carries on.
+    """
+    return _sync_variants(variant_ids)[0]
+
+
+def _sync_variants(variant_ids) -> tuple[dict, list[int]]:
+    qs = ProductVariant.objects.select_related("product").order_by("product_id", "pk")
+    variants = list(qs if variant_ids is None else qs.filter(pk__in=variant_ids))
+    product_maps = {m.product_id: m for m in StripeProductMap.objects.filter(product_id__in={v.product_id for v in variants})}
+    price_maps = {m.variant_id: m for m in StripePriceMap.objects.filter(variant_id__in=[v.pk for v in variants])}
+
+    counts = {"products": 0, "prices": 0, "unchanged": 0, "failed": 0}
+    failed: list[int] = []
+    synced_products: set[int] = set()
+    gateway = get_gateway()
+    for variant in variants:
+        try:
+            if variant.product_id not in synced_products:
+                product_map, changed = _sync_product(gateway, variant.product, product_maps.get(variant.product_id))
+                product_maps[variant.product_id] = product_map
+                synced_products.add(variant.product_id)
+                counts["products"] += changed
+            changed = _sync_price(gateway, variant, product_maps[variant.product_id], price_maps.get(variant.pk))
+            counts["prices" if changed else "unchanged"] += 1
+        except PaymentError as exc:
+            counts["failed"] += 1
+            failed.append(variant.pk)
+            log_event(logger, logging.ERROR, "payment.catalog.sync_failed", variant_id=variant.pk, error=str(exc), error_type=type(exc).__name__)
+
+    log_event(logger, logging.INFO, "payment.catalog.synced", **counts)
+    return counts, failed
+
+
+def _sync_product(gateway, product: Product, mapping: StripeProductMap | None) -> tuple[StripeProductMap, bool]:
+    if mapping is None:
+        remote = gateway.create_product(
+            name=product.name, active=product.active, metadata={"hr_product_id": str(product.pk)}, idempotency_key=f"hr-product-{product.pk}-{product.slug}"
+        )
+        mapping = StripeProductMap.objects.create(product=product, stripe_product_id=remote["id"], name=product.name, active=product.active)
+        return mapping, True
+
+    if mapping.name == product.name and mapping.active == product.active:
+        return mapping, False
+
+    gateway.update_product(mapping.stripe_product_id, name=product.name, active=product.active)
+    mapping.name, mapping.active, mapping.synced_at = product.name, product.active, timezone.now()
+    mapping.save(update_fields=["name", "active", "synced_at"])
+    return mapping, True
+
+
+def _sync_price(gateway, variant: ProductVariant, product_map: StripeProductMap, mapping: StripePriceMap | None) -> bool:
+    amount = to_cents(variant.price)
+
+    if mapping is not None and mapping.unit_amount == amount and mapping.currency == CURRENCY:
+        if mapping.active == variant.active:
+            return False
+        gateway.update_price(mapping.stripe_price_id, active=variant.active)
+        mapping.active, mapping.synced_at = variant.active, timezone.now()
+        mapping.save(update_fields=["active", "synced_at"])
+        return True
+
+    remote = gateway.create_price(
+        product=product_map.stripe_product_id,
+        unit_amount=amount,
+        currency=CURRENCY,
+        nickname=variant.name,
+        metadata={"hr_variant_id": str(variant.pk), "sku": variant.sku},
+        # Keyed on the price being replaced, so switching back to an earlier amount still mints a fresh Price.
+        idempotency_key=f"hr-price-{variant.pk}-{amount}-{CURRENCY}-{mapping.stripe_price_id if mapping else 'new'}",
+    )
+    if not variant.active:
+        gateway.update_price(remote["id"], active=False)
+
+    if mapping is None:
+        StripePriceMap.objects.create(variant=variant, stripe_price_id=remote["id"], unit_amount=amount, currency=CURRENCY, active=variant.active)
+        return True
+
+    previous = mapping.stripe_price_id
+    mapping.stripe_price_id, mapping.unit_amount, mapping.currency, mapping.active, mapping.synced_at = remote["id"], amount, CURRENCY, variant.active, timezone.now()
+    mapping.save(update_fields=["stripe_price_id", "unit_amount", "currency", "active", "synced_at"])
+    if previous != remote["id"]:
+        gateway.update_price(previous, active=False)
+    return True
+
+
+# ------------------------------
+# Checkout
+# ------------------------------
+
+def checkout_line_items(order: Order) -> list[dict]:
+    """
+    Stripe line items for `order`, one per OrderItem.
+
+    Items whose variant has a current mapped Price at the charged amount are
+    sent as {"price": id}; anything else (unsynced variant, price changed
+    since the order was placed) goes as inline price_data, attached to the
+    mapped Stripe Product when there is one. Any difference between the item
+    sum and order.total (tax/shipping) becomes its own line. Falls back to a
+    single order-total line when items cannot express the total.
+    """
+    total = to_cents(order.total)
+    items = list(order.items.select_related("variant__product__stripe_map", "variant__stripe_price").order_by("pk"))
+
+    lines = []
+    for item in items:
+        amount = to_cents(item.unit_price)
+        price_map = _related_or_none(item.variant, "stripe_price")
+        if price_map is not None and price_map.active and price_map.unit_amount == amount and price_map.currency == CURRENCY:
+            lines.append({"price": price_map.stripe_price_id, "quantity": item.quantity})
+            continue
+
+        product_map = _related_or_none(item.variant.product, "stripe_map")
+        price_data = {"currency": CURRENCY, "unit_amount": amount}
+        if product_map is not None:
+            price_data["product"] = product_map.stripe_product_id
+        else:
+            price_data["product_data"] = {"name": str(item.variant), "metadata": {"hr_variant_id": str(item.variant_id)}}
+        lines.append({"price_data": price_data, "quantity": item.quantity})
+
+    remainder = total - sum(to_cents(item.unit_price) * item.quantity for item in items)
+    if remainder > 0 and lines:
+        lines.append({"price_data": {"currency": CURRENCY, "unit_amount": remainder, "product_data": {"name": "Shipping & tax"}}, "quantity": 1})
+
+    if not lines or remainder < 0:
+        return [{"price_data": {"currency": CURRENCY, "product_data": {"name": f"Hella Reptilian Order #{order.pk}"}, "unit_amount": total}, "quantity": 1}]
+    return lines
+
+
+def _related_or_none(instance, attr: str):
+    try:
+        return getattr(instance, attr)
+    except ObjectDoesNotExist:
+        return None
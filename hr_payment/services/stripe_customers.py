@@ -0,0 +1,125 @@
+# hr_payment/services/stripe_customers.py
+
+"""
+Stripe customer provisioning, off the checkout path.
+
+A Customer that wants saved info (or belongs to an account) gets its Stripe
+customer created ahead of time by an RQ job, enqueued after the saving
+transaction commits. Stripe is never called from a request or a model
+signal: with ENABLE_STRIPE_CUSTOMER_JOBS off (or Redis unreachable) nothing
+is provisioned, and checkout_stripe_session, which only reads
+Customer.stripe_customer_id, falls back to customer_email.
+
+Duplicates are prevented at three levels: a Redis marker coalesces enqueues
+for the same customer, the Stripe idempotency key is derived from the
+customer row (concurrent creates return the same Stripe customer), and the
+id is stored with a conditional UPDATE so the first writer wins.
+"""
+
+import logging
+
+import django_rq
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from rq import Retry
+
+from hr_common.utils.unified_logging import log_event
+from hr_core.instrumentation import span
+from hr_core.services.payments import PaymentError, PaymentTemporaryError, get_gateway
+from hr_shop.models import Customer
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "stripe:customer:pending:{}"
+PENDING_TTL_SECONDS = 600
+RETRY_INTERVALS = [10, 60, 300]
+# The field is CharField(blank=True, null=True); both mean "no Stripe customer yet".
+STRIPE_ID_UNSET = Q(stripe_customer_id__isnull=True) | Q(stripe_customer_id="")
+
+
+def customer_idempotency_key(customer: Customer) -> str:
+    # created_at keeps keys distinct when ids are reused (reset dev/staging databases on one Stripe account).
+    return f"hr-customer-{customer.pk}-{int(customer.created_at.timestamp())}"
+
+
+def wants_stripe_customer(customer: Customer) -> bool:
+    return not customer.stripe_customer_id and bool(customer.wants_saved_info or customer.user_id)
+
+
+def schedule_stripe_customer(customer_id: int) -> None:
+    """
+    Provision the Stripe customer once the current transaction commits.
+    """
+    transaction.on_commit(lambda: _dispatch(customer_id))
+
+
+def _dispatch(customer_id: int) -> None:
+    if not getattr(settings, "ENABLE_STRIPE_CUSTOMER_JOBS", False):
+        log_event(logger, logging.DEBUG, "payment.stripe_customer.jobs_disabled", customer_id=customer_id)
+        return
+
+    try:
+        connection = django_rq.get_connection("default")
+        with span("redis"):
+            if not connection.set(PENDING_KEY.format(customer_id), "1", nx=True, ex=PENDING_TTL_SECONDS):
+                log_event(logger, logging.DEBUG, "payment.stripe_customer.coalesced", customer_id=customer_id)
+                return
+            django_rq.get_queue("default").enqueue(
+                "hr_payment.services.stripe_customers.provision_stripe_customer",
+                customer_id,
+                job_id=f"stripe-customer-{customer_id}",
+                retry=Retry(max=len(RETRY_INTERVALS), interval=RETRY_INTERVALS),
+            )
+    except Exception:
+        # The next save or checkout schedules it again; never fall back to calling Stripe inline.
+        log_event(logger, logging.WARNING, "payment.stripe_customer.enqueue_failed", customer_id=customer_id, exc_info=True)
+
+
+def provision_stripe_customer(customer_id: int) -> str | None:
+    """
+    RQ job: create the Stripe customer for `customer_id` unless it already
+    has one. Temporary Stripe failures are re-raised so RQ retries them
+    (the pending marker is kept meanwhile, so nothing else is enqueued).
+    """
+    retrying = False
+    try:
+        customer = Customer.objects.filter(pk=customer_id).first()
+        if customer is None:
+            return None
+        if customer.stripe_customer_id:
+            return customer.stripe_customer_id
+
+        try:
+            remote = get_gateway().create_customer(
+                email=customer.email,
+                name=(customer.full_name or None),
+                metadata={"hr_customer_id": str(customer.pk)},
+                idempotency_key=customer_idempotency_key(customer),
+            )
+        except PaymentTemporaryError as exc:
+            log_event(logger, logging.WARNING, "payment.stripe_customer.retry", customer_id=customer_id, error=str(exc))
+            retrying = True
+            raise
+        except PaymentError as exc:
+            log_event(logger, logging.ERROR, "payment.stripe_customer.failed", customer_id=customer_id, error=str(exc), error_type=type(exc).__name__)
+            raise
+
+        stripe_id = remote["id"]
+        if Customer.objects.filter(STRIPE_ID_UNSET, pk=customer_id).update(stripe_customer_id=stripe_id):
+            log_event(logger, logging.INFO, "payment.stripe_customer.provisioned", customer_id=customer_id, stripe_customer_id=stripe_id)
+            return stripe_id
+
+        # Someone else stored one first; with the shared idempotency key it is the same Stripe customer.
+        return Customer.objects.filter(pk=customer_id).values_list("stripe_customer_id", flat=True).first()
+    finally:
+        if not retrying and getattr(settings, "ENABLE_STRIPE_CUSTOMER_JOBS", False):
+            _release_pending(customer_id)
+
+
+def _release_pending(customer_id: int) -> None:
+    try:
+        with span("redis"):
+            django_rq.get_connection("default").delete(PENDING_KEY.format(customer_id))
+    except Exception:
+        log_event(logger, logging.WARNING, "payment.stripe_customer.release_failed", customer_id=customer_id, exc_info=True)
@@ -0,0 +1,342 @@
+# hr_payment/services/stripe_events.py
+
+"""
+Stripe event processing, shared by the webhook view and `manage.py
+stripe_catch_up`.
+
+Handlers register per event type with @handles. Before one runs, resolve()
+loads the PaymentAttempt and its Order in a single row-locked query (falling
+back to a locked Order lookup when no attempt matches), so handlers only
+apply state. record_and_process() wraps an event in its WebhookEvent row
+(payload trimmed to what the handlers read): duplicates of processed events
+are skipped, outcomes are stored for audit.
+
+catch_up() pages through the provider's event list since a point in time and
+applies whatever the webhook missed, skipping already-processed ids a page
+at a time.
+"""
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from hr_common.utils.unified_logging import log_event
+from hr_core.services.payments import get_gateway
+from hr_payment.models import PaymentAttempt, PaymentAttemptStatus, WebhookEvent
+from hr_payment.services.payment_state import (
+    PAYMENT_INTENT_SNAPSHOT_FIELDS,
+    SESSION_SNAPSHOT_FIELDS,
+    mark_checkout_draft_used,
+    payment_intent_snapshot,
+    session_snapshot,
+)
+from hr_shop.models import Order, PaymentStatus
+
+logger = logging.getLogger(__name__)
+
+PROCESSED = "processed"
+DUPLICATE = "duplicate"
+FAILED = "failed"
+
+PAGE_SIZE = 100
+
+
+@dataclass
+class Resolved:
+    attempt: PaymentAttempt | None
+    order: Order | None
+
+
+HANDLERS: dict[str, Callable[[dict, Resolved], None]] = {}
+
+
+def handles(*event_types: str):
+    def register(fn):
+        for event_type in event_types:
+            HANDLERS[event_type] = fn
+        return fn
+
+    return register
+
+
+# ------------------------------
+# Resolution
+# ------------------------------
+
+def _locked_attempts():
+    # Order is a non-null FK (inner join), so both rows are locked by the same statement.
+    return PaymentAttempt.objects.select_related("order").select_for_update(of=("self", "order"))
+
+
+def resolve(event_type: str, obj: dict) -> Resolved:
+    """
+    Lock and load the attempt/order an event's object refers to.
+    Must run inside a transaction.
+    """
+    if event_type.startswith("checkout.session."):
+        return _resolve_session(obj)
+    return _resolve_payment_intent(obj)
+
+
+def _resolve_session(session: dict) -> Resolved:
+    metadata = session.get("metadata") or {}
+    attempt_id = int(metadata["payment_attempt_id"]) if metadata.get("payment_attempt_id") else None
+    order_id = int(metadata["order_id"]) if metadata.get("order_id") else None
+    sid = session.get("id")
+
+    attempt = None
+    if attempt_id or sid:
+        match = (Q(pk=attempt_id) if attempt_id else Q()) | (Q(provider_session_id=sid) if sid else Q())
+        candidates = list(_locked_attempts().filter(match))
+        # The metadata id wins over the session id, as it did when these were two lookups.
+        attempt = next((a for a in candidates if a.pk == attempt_id), None) or next((a for a in candidates if a.provider_session_id == sid), None)
+
+    if attempt is not None and order_id in (None, attempt.order_id):
+        return Resolved(attempt, attempt.order)
+    order = Order.objects.select_for_update().filter(pk=order_id).first() if order_id else None
+    return Resolved(attempt, order)
+
+
+def _resolve_payment_intent(pi: dict) -> Resolved:
+    pid = pi.get("id")
+    if not pid:
+        return Resolved(None, None)
+
+    attempt = _locked_attempts().filter(provider_payment_intent_id=pid).first()
+    if attempt is not None:
+        return Resolved(attempt, attempt.order)
+    return Resolved(None, Order.objects.select_for_update().filter(stripe_payment_intent_id=pid).first())
+
+
+# ------------------------------
+# Handlers
+# ------------------------------
+
+@handles("checkout.session.completed")
+def _checkout_session_completed(session: dict, found: Resolved) -> None:
+    order_id = (session.get("metadata") or {}).get("order_id")
+    if not order_id:
+        return
+    if found.order is None:
+        raise Order.DoesNotExist(f"Order {order_id} from checkout session {session.get('id')} does not exist.")
+
+    order = found.order
+    sid = session.get("id")
+    pi = session.get("payment_intent")
+    if sid:
+        order.stripe_checkout_session_id = sid
+    if pi:
+        order.stripe_payment_intent_id = pi
+    order.payment_status = PaymentStatus.PAID
+    order.save(update_fields=["stripe_checkout_session_id", "stripe_payment_intent_id", "payment_status", "updated_at"])
+    mark_checkout_draft_used(order.id)
+
+    attempt = found.attempt
+    if attempt:
+        if sid:
+            attempt.provider_session_id = sid
+        if pi:
+            attempt.provider_payment_intent_id = pi
+        attempt.client_secret = session.get("client_secret") or attempt.client_secret
+        attempt.raw = session_snapshot(session)
+        attempt.save(update_fields=["provider_session_id", "provider_payment_intent_id", "client_secret", "raw", "updated_at"])
+        attempt.mark_final(PaymentAttemptStatus.SUCCEEDED)
+
+
+@handles("checkout.session.expired")
+def _checkout_session_expired(session: dict, found: Resolved) -> None:
+    attempt = found.attempt
+    if attempt and attempt.status not in (PaymentAttemptStatus.SUCCEEDED, PaymentAttemptStatus.FAILED):
+        attempt.raw = session_snapshot(session)
+        attempt.save(update_fields=["raw", "updated_at"])
+        attempt.mark_final(PaymentAttemptStatus.EXPIRED)
+
+
+@handles("payment_intent.succeeded")
+def _payment_intent_succeeded(pi: dict, found: Resolved) -> None:
+    order, attempt = found.order, found.attempt
+    if not order:
+        return
+
+    order.stripe_payment_intent_id = pi["id"]
+    order.payment_status = PaymentStatus.PAID
+    order.save(update_fields=["stripe_payment_intent_id", "payment_status", "updated_at"])
+    mark_checkout_draft_used(order.id)
+
+    if attempt and attempt.status != PaymentAttemptStatus.SUCCEEDED:
+        attempt.raw = payment_intent_snapshot(pi)
+        attempt.save(update_fields=["raw", "updated_at"])
+        attempt.mark_final(PaymentAttemptStatus.SUCCEEDED)
+
+
+@handles("payment_intent.payment_failed")
+def _payment_intent_failed(pi: dict, found: Resolved) -> None:
+    order, attempt = found.order, found.attempt
+    if not order:
+        return
+
+    order.stripe_payment_intent_id = pi["id"]
+    order.payment_status = PaymentStatus.FAILED
+    order.save(update_fields=["stripe_payment_intent_id", "payment_status", "updated_at"])
+
+    if attempt and attempt.status != PaymentAttemptStatus.SUCCEEDED:
+        last_err = pi.get("last_payment_error") or {}
+        attempt.raw = payment_intent_snapshot(pi, "last_payment_error")
+        attempt.save(update_fields=["raw", "updated_at"])
+        attempt.mark_final(PaymentAttemptStatus.FAILED, code=(last_err.get("code") or None), msg=(last_err.get("message") or None))
+
+
+@handles("payment_intent.canceled")
+def _payment_intent_canceled(pi: dict, found: Resolved) -> None:
+    order, attempt = found.order, found.attempt
+    if not order:
+        return
+
+    # Canceled is "not paid", but not "failed" either.
+    if order.payment_status != PaymentStatus.PAID:
+        order.payment_status = PaymentStatus.UNPAID
+        order.save(update_fields=["payment_status", "updated_at"])
+
+    if attempt and attempt.status not in (PaymentAttemptStatus.SUCCEEDED, PaymentAttemptStatus.FAILED):
+        attempt.raw = payment_intent_snapshot(pi)
+        attempt.save(update_fields=["raw", "updated_at"])
+        attempt.mark_final(PaymentAttemptStatus.CANCELED)
+
+
+# ------------------------------
+# Stored payloads
+# ------------------------------
+
+# What WebhookEvent.payload keeps of an event's object: the fields the handlers above read, so a
+# failed event can be re-run from its row. Everything else (line items, addresses, charges) is dropped.
+STORED_OBJECT_FIELDS = {
+    "checkout.session": ("object", *SESSION_SNAPSHOT_FIELDS, "payment_intent", "metadata"),
+    "payment_intent": ("object", *PAYMENT_INTENT_SNAPSHOT_FIELDS, "metadata", "last_payment_error"),
+}
+STORED_ERROR_FIELDS = ("code", "message", "type")
+
+
+def stored_payload(event: dict) -> dict:
+    obj = (event.get("data") or {}).get("object") or {}
+    kept = {key: obj.get(key) for key in STORED_OBJECT_FIELDS.get(obj.get("object"), ("object", "id")) if key in obj}
+    if isinstance(kept.get("last_payment_error"), dict):
+        kept["last_payment_error"] = {key: kept["last_payment_error"].get(key) for key in STORED_ERROR_FIELDS}
+    return {"id": event.get("id"), "type": event.get("type"), "created": event.get("created"), "livemode": event.get("livemode"), "data": {"object": kept}}
+
+
+# ------------------------------
+# Processing
+# ------------------------------
+
+def process_event(event: dict) -> bool:
+    """
+    Run the registered handler for `event`. Returns False for types nobody
+    handles. Must run inside a transaction (row locks).
+    """
+    event_type = event.get("type") or ""
+    handler = HANDLERS.get(event_type)
+    if handler is None:
+        return False
+    obj = (event.get("data") or {}).get("object") or {}
+    handler(obj, resolve(event_type, obj))
+    return True
+
+
+def record_and_process(event: dict, *, record: WebhookEvent | None = None, source: str = "webhook") -> str:
+    """
+    Process `event` once, keeping its WebhookEvent row up to date.
+    Returns PROCESSED, DUPLICATE (already processed) or FAILED (error
+    stored on the row and logged).
+    """
+    if record is None:
+        record, created = WebhookEvent.objects.get_or_create(event_id=event["id"], defaults={"type": event.get("type", ""), "payload": stored_payload(event)})
+        if not created and record.ok:
+            log_event(logger, logging.INFO, "payment.webhook.duplicate", event_id=event["id"], source=source)
+            return DUPLICATE
+
+    try:
+        with transaction.atomic():
+            process_event(event)
+    except Exception as exc:
+        log_event(logger, logging.ERROR, "payment.webhook.processing_failed", event_id=event["id"], source=source, error=str(exc), exc_info=True)
+        record.ok, record.processed_at, record.error = False, timezone.now(), str(exc)
+        record.save(update_fields=["ok", "processed_at", "error"])
+        return FAILED
+
+    record.ok, record.processed_at, record.error = True, timezone.now(), None
+    record.save(update_fields=["ok", "processed_at", "error"])
+    return PROCESSED
+
+
+# ------------------------------
+# Catch-up
+# ------------------------------
+
+def last_processed_at() -> datetime | None:
+    return WebhookEvent.objects.filter(ok=True).order_by("-received_at").values_list("received_at", flat=True).first()
+
+
+def iter_missed_events(since: datetime, types: list[str] | None = None):
+    """
+    Provider events created at or after `since`, oldest first.
+    """
+    gateway = get_gateway()
+    created_gte = int(since.timestamp())
+    types = list(types or HANDLERS)
+    pages, starting_after = [], None
+    while True:
+        page = gateway.list_events(created_gte=created_gte, types=types, starting_after=starting_after, limit=PAGE_SIZE)
+        data = page.get("data") or []
+        if data:
+            pages.append(data)
+        if not data or not page.get("has_more"):
+            break
+        starting_after = data[-1]["id"]
+    # The list comes newest first; apply in the order the events happened.
+    for data in reversed(pages):
+        yield from reversed(data)
+
+
+def catch_up(since: datetime, *, types: list[str] | None = None, dry_run: bool = False) -> dict:
+    """
+    Apply every handled event since `since` that has no processed
+    WebhookEvent. Per page: one query finds known ids, one bulk insert
+    records the new ones, then each missed event runs in its own
+    transaction. Returns counts {seen, applied, skipped, failed}.
+    """
+    counts = {"seen": 0, "applied": 0, "skipped": 0, "failed": 0}
+    page: list[dict] = []
+
+    def flush():
+        ids = [event["id"] for event in page]
+        known = WebhookEvent.objects.in_bulk(ids, field_name="event_id")
+        missed = [event for event in page if not (event["id"] in known and known[event["id"]].ok)]
+        counts["skipped"] += len(page) - len(missed)
+        if dry_run:
+            counts["applied"] += len(missed)
+            return
+
+        WebhookEvent.objects.bulk_create(
+            [WebhookEvent(event_id=event["id"], type=event.get("type", ""), payload=stored_payload(event)) for event in missed if event["id"] not in known], ignore_conflicts=True
+        )
+        records = WebhookEvent.objects.in_bulk([event["id"] for event in missed], field_name="event_id")
+        for event in missed:
+            status = record_and_process(event, record=records[event["id"]], source="catch_up")
+            counts["applied" if status == PROCESSED else "failed"] += 1
+
+    for event in iter_missed_events(since, types):
+        counts["seen"] += 1
+        page.append(event)
+        if len(page) == PAGE_SIZE:
+            flush()
+            page = []
+    if page:
+        flush()
+
+    log_event(logger, logging.INFO, "payment.webhook.catch_up", since=since.isoformat(), dry_run=dry_run, **counts)
+    return counts
@@ -0,0 +1,109 @@
+# hr_payment/services/webhook_retention.py
+
+"""
+Retention for payment audit data.
+
+Processed WebhookEvent rows older than WEBHOOK_EVENT_RETENTION_DAYS are
+written to gzipped JSONL files in WEBHOOK_EVENT_ARCHIVE_STORAGE (one file per
+batch, under WEBHOOK_EVENT_ARCHIVE_DIR/YYYY/MM/DD/) and then deleted, keeping
+the table that every webhook hits down to recent events. Failed events stay until
+they are resolved. PaymentAttempt.raw snapshots are cleared once the attempt
+has been final for PAYMENT_ATTEMPT_RAW_RETENTION_DAYS.
+
+Archives carry full Stripe payloads, so they never go to default (public
+media) storage: archive_storage() refuses a filesystem location under
+MEDIA_ROOT.
+
+Run by `manage.py prune_webhook_events` (RQ job or inline).
+"""
+
+import gzip
+import json
+import logging
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, Storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from hr_common.utils.unified_logging import log_event
+from hr_payment.models import PaymentAttempt, WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+ARCHIVED_FIELDS = ("event_id", "type", "payload", "received_at", "processed_at")
+
+
+def archive_storage() -> Storage:
+    spec = settings.WEBHOOK_EVENT_ARCHIVE_STORAGE
+    storage = import_string(spec["BACKEND"])(**spec.get("OPTIONS", {}))
+    if isinstance(storage, FileSystemStorage) and Path(storage.location).resolve().is_relative_to(Path(settings.MEDIA_ROOT).resolve()):
+        raise ImproperlyConfigured("WEBHOOK_EVENT_ARCHIVE_STORAGE must not be inside MEDIA_ROOT; archives contain customer data.")
+    return storage
+
+
+def prune(*, batch_size: int = BATCH_SIZE, dry_run: bool = False) -> dict:
+    """
+    RQ job: archive and delete old processed events, then expire old
+    attempt snapshots. Returns counts {archived, files, attempts_cleared}.
+    """
+    now = timezone.now()
+    counts = archive_processed_events(before=now - timedelta(days=settings.WEBHOOK_EVENT_RETENTION_DAYS), batch_size=batch_size, dry_run=dry_run)
+    counts["attempts_cleared"] = clear_attempt_snapshots(before=now - timedelta(days=settings.PAYMENT_ATTEMPT_RAW_RETENTION_DAYS), batch_size=batch_size, dry_run=dry_run)
+    log_event(logger, logging.INFO, "payment.webhook.pruned", dry_run=dry_run, **counts)
+    return counts
+
+
+def archive_processed_events(*, before, batch_size: int = BATCH_SIZE, dry_run: bool = False) -> dict:
+    qs = WebhookEvent.objects.filter(ok=True, received_at__lt=before).order_by("received_at", "pk")
+    if dry_run:
+        return {"archived": qs.count(), "files": 0}
+
+    counts = {"archived": 0, "files": 0}
+    while True:
+        rows = list(qs.values("pk", *ARCHIVED_FIELDS)[:batch_size])
+        if not rows:
+            return counts
+        # Written before the delete: a crash in between re-archives the batch next run rather than losing it.
+        name = _write_archive(rows)
+        with transaction.atomic():
+            WebhookEvent.objects.filter(pk__in=[row["pk"] for row in rows]).delete()
+        counts["archived"] += len(rows)
+        counts["files"] += 1
+        log_event(logger, logging.INFO, "payment.webhook.archived", file=name, events=len(rows))
+
+
+def _write_archive(rows: list[dict]) -> str:
+    first, last = rows[0], rows[-1]
+    lines = (json.dumps({key: row[key] for key in ARCHIVED_FIELDS}, cls=DjangoJSONEncoder, separators=(",", ":")) for row in rows)
+    body = gzip.compress(("\n".join(lines) + "\n").encode("utf-8"))
+    name = f"{settings.WEBHOOK_EVENT_ARCHIVE_DIR}/{first['received_at']:%Y/%m/%d}/{first['received_at']:%H%M%S}-{first['pk']}-{last['pk']}.jsonl.gz"
+    return archive_storage().save(name, ContentFile(body))
+
+
+def clear_attempt_snapshots(*, before, batch_size: int = BATCH_SIZE, dry_run: bool = False) -> int:
+    qs = PaymentAttempt.objects.filter(finalized_at__lt=before, raw__isnull=False)
+    if dry_run:
+        return qs.count()
+
+    cleared = 0
+    while True:
+        pks = list(qs.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return cleared
+        cleared += PaymentAttempt.objects.filter(pk__in=pks).update(raw=None)
+
+
+def read_archive(name: str) -> list[dict]:
+    """
+    The events in one archive file, for inspection or replay.
+    """
+    with archive_storage().open(name, "rb") as fh:
+        return [json.loads(line) for line in gzip.decompress(fh.read()).decode("utf-8").splitlines() if line]
@@ -0,0 +1,173 @@
+# hr_payment/tests/test_gateway.py
+
+# Tests for the payment gateway layer (hr_core.services.payments) and the
+# checkout views that go through it.
+#
+# Strategy:
+#   - View tests run with PAYMENT_PROVIDER=MOCK; the in-memory MockGateway
+#     plays Stripe, so no SDK patching and no network.
+#   - StripeGateway tests patch the SDK resource calls only to check the
+#     error translation; the shared HTTP client is inspected directly.
+
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+import stripe
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+
+from hr_core.services.payments import (
+    MockGateway,
+    PaymentAuthError,
+    PaymentInvalidRequest,
+    PaymentTemporaryError,
+    StripeGateway,
+    WebhookVerificationError,
+    get_gateway,
+    reset_gateways,
+)
+from hr_core.services.payments.stripe_config import TimedRequestsClient, build_http_client
+from hr_payment.models import PaymentAttempt, PaymentAttemptStatus
+from hr_shop.models import PaymentStatus
+from hr_shop.views.checkout import _stripe_session_result
+from tests.factories import OrderFactory
+
+LINE_ITEMS = [{"price_data": {"currency": "usd", "product_data": {"name": "Order"}, "unit_amount": 2999}, "quantity": 1}]
+
+
+@pytest.fixture
+def mock_gateway():
+    reset_gateways()
+    with override_settings(PAYMENT_PROVIDER="MOCK", MOCK_GATEWAY_ALLOW_UNSIGNED_WEBHOOKS=True):
+        yield get_gateway()
+    reset_gateways()
+
+
+# ---------------------------------------------------------------------------
+# MockGateway
+# ---------------------------------------------------------------------------
+
+class TestMockGateway:
+    def test_session_round_trip_and_completion(self):
+        gateway = MockGateway()
+        sess = gateway.create_checkout_session(line_items=LINE_ITEMS, metadata={"order_id": "7"}, ui_mode="embedded", customer_email="a@example.com")
+
+        assert sess["amount_total"] == 2999
+        assert sess["status"] == "open" and sess["client_secret"]
+        assert gateway.retrieve_checkout_session(sess["id"]) == sess
+
+        event = gateway.complete_session(sess["id"])
+        paid = event["data"]["object"]
+        assert event["type"] == "checkout.session.completed"
+        assert paid["payment_status"] == "paid"
+        assert gateway.retrieve_payment_intent(paid["payment_intent"])["status"] == "succeeded"
+
+    def test_idempotency_key_returns_first_object(self):
+        gateway = MockGateway()
+        first = gateway.create_customer(email="a@example.com", idempotency_key="k1")
+        again = gateway.create_customer(email="a@example.com", idempotency_key="k1")
+        other = gateway.create_customer(email="a@example.com")
+
+        assert first["id"] == again["id"] != other["id"]
+        assert len(gateway.customers) == 2
+
+    def test_unknown_ids_raise_invalid_request(self):
+        gateway = MockGateway()
+        with pytest.raises(PaymentInvalidRequest):
+            gateway.retrieve_checkout_session("cs_missing")
+        with pytest.raises(PaymentInvalidRequest):
+            gateway.retrieve_payment_intent("pi_missing")
+
+    @override_settings(DEBUG=False, MOCK_GATEWAY_ALLOW_UNSIGNED_WEBHOOKS=False)
+    def test_unsigned_webhook_refused_without_opt_in(self):
+        request = RequestFactory().post("/", b'{"id": "evt_x"}', content_type="application/json")
+        with pytest.raises(WebhookVerificationError):
+            MockGateway().verify_webhook(request)
+
+    def test_unknown_provider_is_refused(self):
+        reset_gateways()
+        with override_settings(PAYMENT_PROVIDER="STRPIE"), pytest.raises(ImproperlyConfigured):
+            get_gateway()
+
+
+# ---------------------------------------------------------------------------
+# StripeGateway
+# ---------------------------------------------------------------------------
+
+class TestStripeGateway:
+    @pytest.mark.parametrize(("sdk_error", "expected"), [
+        (stripe.error.APIConnectionError("down"), PaymentTemporaryError),
+        (stripe.error.RateLimitError("slow down"), PaymentTemporaryError),
+        (stripe.error.AuthenticationError("bad key"), PaymentAuthError),
+        (stripe.error.InvalidRequestError("No such checkout.session", "id"), PaymentInvalidRequest),
+    ])
+    def test_sdk_errors_are_translated(self, monkeypatch, sdk_error, expected):
+        monkeypatch.setenv("STRIPE_SECRET_KEY", "sk_test_fake")
+        with patch("stripe.checkout.Session.retrieve", side_effect=sdk_error):
+            with pytest.raises(expected):
+                StripeGateway().retrieve_checkout_session("cs_test_1")
+
+    def test_http_client_shares_one_session_across_threads(self, settings):
+        settings.STRIPE_CONNECT_TIMEOUT = 2.0
+        settings.STRIPE_READ_TIMEOUT = 9.0
+        client = build_http_client()
+        seen = []
+
+        def grab():
+            # What RequestsClient resolves per thread on its first request.
+            seen.append(client._session)
+
+        threads = [threading.Thread(target=grab) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert isinstance(client, TimedRequestsClient)
+        assert client._timeout == (2.0, 9.0)
+        assert seen[0] is not None and all(s is seen[0] for s in seen)
+
+
+# ---------------------------------------------------------------------------
+# Views through the gateway
+# ---------------------------------------------------------------------------
+
+@pytest.mark.django_db
+class TestCheckoutThroughMockGateway:
+    def test_session_created_then_reused(self, client, django_user_model, mock_gateway):
+        user = django_user_model.objects.create_user(username="buyer", email="buyer@example.com", password="pw")
+        order = OrderFactory(user=user)
+        client.force_login(user)
+        url = reverse("hr_payment:checkout_stripe_session", args=[order.id])
+
+        created = client.post(url).json()
+        reused = client.post(url).json()
+
+        assert created["sessionId"] in mock_gateway.sessions
+        assert reused["sessionId"] == created["sessionId"]
+        assert len(mock_gateway.sessions) == 1
+        order.refresh_from_db()
+        assert order.payment_status == PaymentStatus.PENDING
+
+    def test_webhook_completes_order(self, client, django_user_model, mock_gateway):
+        user = django_user_model.objects.create_user(username="buyer", email="buyer@example.com", password="pw")
+        order = OrderFactory(user=user)
+        client.force_login(user)
+        sid = client.post(reverse("hr_payment:checkout_stripe_session", args=[order.id])).json()["sessionId"]
+
+        event = mock_gateway.complete_session(sid)
+        resp = client.post(reverse("hr_payment:stripe-webhook"), json.dumps(event), content_type="application/json")
+
+        assert resp.status_code == 200
+        order.refresh_from_db()
+        assert order.payment_status == PaymentStatus.PAID
+        assert PaymentAttempt.objects.get(order=order).status == PaymentAttemptStatus.SUCCEEDED
+        assert _stripe_session_result(sid)[0] == "paid"
+
+    def test_webhook_rejects_bad_signature(self, client, mock_gateway):
+        mock_gateway.webhook_secret = "whsec_test"
+        resp = client.post(reverse("hr_payment:stripe-webhook"), b'{"id": "evt_x"}', content_type="application/json", HTTP_STRIPE_SIGNATURE="t=1,v1=bad")
+        assert resp.status_code == 400
@@ -0,0 +1,187 @@
+# hr_payment/tests/test_stripe_catalog.py
+
+# Tests for the Stripe price-catalog mirror and checkout line items.
+#
+# Strategy:
+#   - PAYMENT_PROVIDER=MOCK; the MockGateway keeps Products/Prices in memory.
+#   - ENABLE_STRIPE_CATALOG_SYNC stays off so factory saves do not try to
+#     reach Redis; sync_variants() is called directly.
+#   - The drain job runs against `FakeRedis`, a set-only stand-in for the
+#     django_rq connection, with the queue mocked.
+
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+from hr_core.services.payments import PaymentTemporaryError, get_gateway, reset_gateways
+from hr_payment.models import StripePriceMap, StripeProductMap
+from hr_payment.services.stripe_catalog import DIRTY_KEY, PENDING_KEY, _mark_dirty, checkout_line_items, drain_dirty_variants, sync_variants
+from hr_shop.models import OrderItem
+from tests.factories import OrderFactory, ProductVariantFactory
+
+
+@pytest.fixture
+def mock_gateway():
+    reset_gateways()
+    with override_settings(PAYMENT_PROVIDER="MOCK", ENABLE_STRIPE_CATALOG_SYNC=False):
+        yield get_gateway()
+    reset_gateways()
+
+
+class FakeRedis:
+    def __init__(self):
+        self.sets: dict[str, set] = {}
+        self.keys: dict[str, str] = {}
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(int(m) for m in members)
+
+    def spop(self, key, count):
+        members = self.sets.get(key, set())
+        return [members.pop() for _ in range(min(count, len(members)))]
+
+    def scard(self, key):
+        return len(self.sets.get(key, ()))
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.keys:
+            return False
+        self.keys[key] = value
+        return True
+
+    def delete(self, key):
+        self.keys.pop(key, None)
+
+
+@pytest.fixture
+def redis():
+    connection = FakeRedis()
+    queue = MagicMock()
+    with (
+        patch("hr_payment.services.stripe_catalog.django_rq.get_connection", return_value=connection),
+        patch("hr_payment.services.stripe_catalog.django_rq.get_queue", return_value=queue),
+    ):
+        connection.queue = queue
+        yield connection
+
+
+@pytest.mark.django_db
+class TestCatalogSync:
+    def test_first_sync_creates_products_and_prices(self, mock_gateway):
+        variant = ProductVariantFactory(price=Decimal("19.99"))
+        sibling = ProductVariantFactory(product=variant.product, price=Decimal("24.00"))
+
+        counts = sync_variants()
+
+        assert counts == {"products": 1, "prices": 2, "unchanged": 0, "failed": 0}
+        product_map = StripeProductMap.objects.get(product=variant.product)
+        assert mock_gateway.products[product_map.stripe_product_id]["name"] == variant.product.name
+        price = mock_gateway.prices[StripePriceMap.objects.get(variant=sibling).stripe_price_id]
+        assert (price["product"], price["unit_amount"]) == (product_map.stripe_product_id, 2400)
+
+        assert sync_variants() == {"products": 0, "prices": 0, "unchanged": 2, "failed": 0}
+
+    def test_price_change_replaces_and_deactivates_old_price(self, mock_gateway):
+        variant = ProductVariantFactory(price=Decimal("10.00"))
+        sync_variants()
+        old_id = StripePriceMap.objects.get(variant=variant).stripe_price_id
+
+        variant.price = Decimal("12.50")
+        variant.save()
+        sync_variants([variant.pk])
+
+        mapping = StripePriceMap.objects.get(variant=variant)
+        assert mapping.stripe_price_id != old_id
+        assert mapping.unit_amount == 1250
+        assert mock_gateway.prices[old_id]["active"] is False
+
+    def test_command_reports_counts(self, mock_gateway):
+        ProductVariantFactory()
+        out = StringIO()
+        call_command("sync_stripe_catalog", stdout=out)
+        assert "1 prices created/updated" in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestDrain:
+    def test_drain_syncs_dirty_variants_and_releases_marker(self, mock_gateway, redis):
+        variant = ProductVariantFactory()
+        _mark_dirty([variant.pk])
+        _mark_dirty([variant.pk])
+
+        assert redis.queue.enqueue.call_count == 1
+        assert "job_id" not in redis.queue.enqueue.call_args.kwargs
+        assert drain_dirty_variants()["prices"] == 1
+        assert PENDING_KEY not in redis.keys
+        assert StripePriceMap.objects.filter(variant=variant).exists()
+
+    def test_failed_variants_are_requeued_and_job_retried(self, mock_gateway, redis):
+        ok, broken = ProductVariantFactory(), ProductVariantFactory()
+        _mark_dirty([ok.pk, broken.pk])
+        create_price = mock_gateway.create_price
+
+        def flaky(**kwargs):
+            if kwargs["metadata"]["hr_variant_id"] == str(broken.pk):
+                raise PaymentTemporaryError("Stripe unavailable")
+            return create_price(**kwargs)
+
+        with patch.object(mock_gateway, "create_price", side_effect=flaky), pytest.raises(PaymentTemporaryError):
+            drain_dirty_variants()
+
+        assert redis.sets[DIRTY_KEY] == {broken.pk}
+        assert PENDING_KEY in redis.keys
+
+        drain_dirty_variants()
+        assert StripePriceMap.objects.filter(variant=broken).exists()
+        assert redis.scard(DIRTY_KEY) == 0
+
+    def test_unexpected_error_puts_the_batch_back(self, mock_gateway, redis):
+        variant = ProductVariantFactory()
+        _mark_dirty([variant.pk])
+
+        with patch("hr_payment.services.stripe_catalog._sync_variants", side_effect=RuntimeError("db gone")), pytest.raises(RuntimeError):
+            drain_dirty_variants()
+
+        assert redis.sets[DIRTY_KEY] == {variant.pk}
+        assert PENDING_KEY in redis.keys
+
+
+@pytest.mark.django_db
+class TestCheckoutLineItems:
+    def test_synced_variants_use_price_ids_and_others_inline(self, mock_gateway):
+        synced = ProductVariantFactory(price=Decimal("10.00"))
+        sync_variants([synced.pk])
+        unsynced = ProductVariantFactory(price=Decimal("5.00"))
+        order = OrderFactory(total=Decimal("25.00"))
+        OrderItem.objects.create(order=order, variant=synced, quantity=2, unit_price=Decimal("10.00"))
+        OrderItem.objects.create(order=order, variant=unsynced, quantity=1, unit_price=Decimal("5.00"))
+
+        lines = checkout_line_items(order)
+
+        assert lines[0] == {"price": StripePriceMap.objects.get(variant=synced).stripe_price_id, "quantity": 2}
+        assert lines[1]["price_data"]["unit_amount"] == 500
+        assert lines[1]["price_data"]["product_data"]["name"] == str(unsynced)
+        session = mock_gateway.create_checkout_session(line_items=lines)
+        assert session["amount_total"] == 2500
+
+    def test_stale_price_and_remainder(self, mock_gateway):
+        variant = ProductVariantFactory(price=Decimal("10.00"))
+        sync_variants([variant.pk])
+        order = OrderFactory(total=Decimal("13.00"))
+        # Charged at the price in effect when the order was placed, not the synced one.
+        OrderItem.objects.create(order=order, variant=variant, quantity=1, unit_price=Decimal("9.00"))
+
+        lines = checkout_line_items(order)
+
+        assert lines[0]["price_data"] == {"currency": "usd", "unit_amount": 900, "product": StripeProductMap.objects.get().stripe_product_id}
+        assert lines[1]["price_data"]["unit_amount"] == 400
+
+    def test_order_without_items_falls_back_to_single_line(self, mock_gateway):
+        order = OrderFactory(total=Decimal("29.99"))
+        assert checkout_line_items(order) == [
+            {"price_data": {"currency": "usd", "product_data": {"name": f"Hella Reptilian Order #{order.pk}"}, "unit_amount": 2999}, "quantity": 1}
+        ]
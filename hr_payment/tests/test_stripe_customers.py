@@ -0,0 +1,132 @@
+# hr_payment/tests/test_stripe_customers.py
+
+# Tests for ahead-of-checkout Stripe customer provisioning.
+#
+# Strategy:
+#   - PAYMENT_PROVIDER=MOCK; the MockGateway records created customers and
+#     honours idempotency keys like Stripe does.
+#   - ENABLE_STRIPE_CUSTOMER_JOBS is on and django_rq is patched: the
+#     on_commit callback only enqueues, and `run_jobs` executes the captured
+#     jobs the way the RQ worker would.
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+from hr_core.services.payments import get_gateway, reset_gateways
+from hr_payment.services.stripe_customers import customer_idempotency_key, provision_stripe_customer
+from hr_shop.models import Customer
+from hr_shop.services.customers import attach_customer_to_user
+from tests.factories import CustomerFactory, OrderFactory
+
+
+@pytest.fixture
+def mock_gateway():
+    reset_gateways()
+    with override_settings(PAYMENT_PROVIDER="MOCK", ENABLE_STRIPE_CUSTOMER_JOBS=True):
+        yield get_gateway()
+    reset_gateways()
+
+
+@pytest.fixture
+def queue():
+    connection = MagicMock()
+    connection.set.return_value = True
+    queue = MagicMock()
+    with (
+        patch("hr_payment.services.stripe_customers.django_rq.get_connection", return_value=connection),
+        patch("hr_payment.services.stripe_customers.django_rq.get_queue", return_value=queue),
+    ):
+        yield queue
+
+
+def run_jobs(queue):
+    for call in queue.enqueue.call_args_list:
+        assert call.args[0] == "hr_payment.services.stripe_customers.provision_stripe_customer"
+        provision_stripe_customer(*call.args[1:])
+
+
+@pytest.mark.django_db
+class TestProvisioning:
+    def test_created_after_commit_for_saved_info(self, mock_gateway, queue, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            customer = CustomerFactory(wants_saved_info=True)
+
+        assert mock_gateway.customers == {}
+        run_jobs(queue)
+
+        customer.refresh_from_db()
+        assert customer.stripe_customer_id in mock_gateway.customers
+        assert mock_gateway.customers[customer.stripe_customer_id]["metadata"] == {"hr_customer_id": str(customer.pk)}
+
+    def test_guest_without_saved_info_is_skipped(self, mock_gateway, queue, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            customer = CustomerFactory(wants_saved_info=False)
+
+        assert callbacks == []
+        assert Customer.objects.get(pk=customer.pk).stripe_customer_id is None
+
+    def test_signup_attach_schedules_provisioning(self, mock_gateway, queue, django_user_model, django_capture_on_commit_callbacks):
+        customer = CustomerFactory(email="member@example.com")
+        user = django_user_model.objects.create_user(username="member", email="member@example.com", password="pw")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            attach_customer_to_user(user)
+        run_jobs(queue)
+
+        customer.refresh_from_db()
+        assert customer.user_id == user.id
+        assert customer.stripe_customer_id in mock_gateway.customers
+
+    def test_signup_attach_provisions_blank_stripe_id(self, mock_gateway, queue, django_user_model, django_capture_on_commit_callbacks):
+        customer = CustomerFactory(email="blank@example.com")
+        Customer.objects.filter(pk=customer.pk).update(stripe_customer_id="")
+        user = django_user_model.objects.create_user(username="blank", email="blank@example.com", password="pw")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            attach_customer_to_user(user)
+        run_jobs(queue)
+
+        customer.refresh_from_db()
+        assert customer.stripe_customer_id in mock_gateway.customers
+
+    def test_repeated_runs_coalesce_to_one_stripe_customer(self, mock_gateway, queue):
+        customer = CustomerFactory()
+        # Two workers racing past the "already has an id" check send the same idempotency key.
+        first = mock_gateway.create_customer(email=customer.email, idempotency_key=customer_idempotency_key(customer))
+
+        assert provision_stripe_customer(customer.pk) == first["id"]
+        assert provision_stripe_customer(customer.pk) == first["id"]
+        assert len(mock_gateway.customers) == 1
+
+    def test_checkout_reads_existing_id_without_creating(self, client, mock_gateway, django_user_model):
+        user = django_user_model.objects.create_user(username="buyer", email="buyer@example.com", password="pw")
+        order = OrderFactory(user=user, customer=CustomerFactory(stripe_customer_id="cus_existing"))
+        client.force_login(user)
+
+        sid = client.post(reverse("hr_payment:checkout_stripe_session", args=[order.id])).json()["sessionId"]
+
+        assert mock_gateway.customers == {}
+        assert mock_gateway.sessions[sid]["customer"] == "cus_existing"
+
+    def test_checkout_never_calls_stripe_for_customers(self, client, mock_gateway, queue, django_user_model, django_capture_on_commit_callbacks):
+        user = django_user_model.objects.create_user(username="buyer", email="buyer@example.com", password="pw")
+        order = OrderFactory(user=user, customer=CustomerFactory())
+        client.force_login(user)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            sid = client.post(reverse("hr_payment:checkout_stripe_session", args=[order.id])).json()["sessionId"]
+
+        assert mock_gateway.customers == {}
+        assert mock_gateway.sessions[sid]["customer_email"] == order.email
+        assert [call.args[1] for call in queue.enqueue.call_args_list] == [order.customer_id]
+
+    def test_nothing_is_provisioned_when_jobs_are_disabled(self, mock_gateway, queue, django_capture_on_commit_callbacks):
+        with override_settings(ENABLE_STRIPE_CUSTOMER_JOBS=False), django_capture_on_commit_callbacks(execute=True):
+            customer = CustomerFactory(wants_saved_info=True)
+
+        queue.enqueue.assert_not_called()
+        assert mock_gateway.customers == {}
+        assert Customer.objects.get(pk=customer.pk).stripe_customer_id is None
@@ -0,0 +1,135 @@
+# hr_payment/tests/test_stripe_events.py
+
+# Tests for the Stripe event registry, attempt/order pre-resolution and the
+# stripe_catch_up command.
+#
+# Strategy:
+#   - Resolution and handlers are exercised through process_event() inside
+#     a transaction, with payloads from the conftest builders.
+#   - Catch-up runs with PAYMENT_PROVIDER=MOCK; events the webhook "missed"
+#     are emitted on the MockGateway, which serves them from list_events().
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.test import override_settings
+from django.utils import timezone
+
+from hr_core.services.payments import get_gateway, reset_gateways
+from hr_payment.models import PaymentAttemptStatus, WebhookEvent
+from hr_payment.services.stripe_events import HANDLERS, catch_up, process_event, resolve
+from hr_payment.tests.conftest import WebhookEventFactory, make_checkout_session_event, make_payment_intent_event
+from hr_shop.models import PaymentStatus
+
+
+@pytest.fixture
+def mock_gateway():
+    reset_gateways()
+    with override_settings(PAYMENT_PROVIDER="MOCK"):
+        yield get_gateway()
+    reset_gateways()
+
+
+def _session(event: dict) -> dict:
+    return event["data"]["object"]
+
+
+@pytest.mark.django_db
+class TestRegistry:
+    def test_every_handled_type_is_registered(self):
+        assert set(HANDLERS) == {
+            "checkout.session.completed",
+            "checkout.session.expired",
+            "payment_intent.succeeded",
+            "payment_intent.payment_failed",
+            "payment_intent.canceled",
+        }
+
+    def test_unhandled_type_is_ignored(self):
+        with transaction.atomic():
+            assert process_event({"id": "evt_x", "type": "charge.refunded", "data": {"object": {"id": "ch_1"}}}) is False
+
+
+@pytest.mark.django_db
+class TestResolve:
+    def test_attempt_and_order_load_in_one_query(self, pending_attempt, django_assert_num_queries):
+        event = make_checkout_session_event(order_id=pending_attempt.order_id, attempt_id=pending_attempt.pk, session_id=pending_attempt.provider_session_id)
+
+        with transaction.atomic(), django_assert_num_queries(1):
+            found = resolve(event["type"], _session(event))
+            assert found.order.pk == pending_attempt.order_id
+
+        assert found.attempt == pending_attempt
+
+    def test_session_id_used_when_metadata_attempt_is_unknown(self, pending_attempt):
+        event = make_checkout_session_event(order_id=pending_attempt.order_id, attempt_id=999999, session_id=pending_attempt.provider_session_id)
+
+        with transaction.atomic():
+            found = resolve(event["type"], _session(event))
+
+        assert found.attempt == pending_attempt
+
+    def test_payment_intent_falls_back_to_order(self, unpaid_order):
+        unpaid_order.stripe_payment_intent_id = "pi_orphan"
+        unpaid_order.save(update_fields=["stripe_payment_intent_id"])
+        event = make_payment_intent_event(payment_intent_id="pi_orphan")
+
+        with transaction.atomic():
+            found = resolve(event["type"], event["data"]["object"])
+
+        assert found.attempt is None and found.order == unpaid_order
+
+
+@pytest.mark.django_db
+class TestCatchUp:
+    def test_applies_missed_events_and_skips_processed_ones(self, mock_gateway, pending_attempt):
+        order = pending_attempt.order
+        seen = WebhookEventFactory(ok=True)
+        missed = make_checkout_session_event(order_id=order.pk, attempt_id=pending_attempt.pk, session_id=pending_attempt.provider_session_id)
+        mock_gateway.emit(missed["type"], _session(missed))
+        mock_gateway.events.append({**mock_gateway.events[0], "id": seen.event_id})
+
+        out = StringIO()
+        call_command("stripe_catch_up", stdout=out)
+
+        assert "2 seen, 1 applied, 1 already processed, 0 failed" in out.getvalue()
+        order.refresh_from_db()
+        pending_attempt.refresh_from_db()
+        assert order.payment_status == PaymentStatus.PAID
+        assert pending_attempt.status == PaymentAttemptStatus.SUCCEEDED
+        assert WebhookEvent.objects.get(event_id=mock_gateway.events[0]["id"]).ok is True
+
+    def test_pages_are_applied_oldest_first(self, mock_gateway, pending_attempt, monkeypatch):
+        monkeypatch.setattr("hr_payment.services.stripe_events.PAGE_SIZE", 1)
+        start = int(timezone.now().timestamp()) - 60
+        completed = make_checkout_session_event(order_id=pending_attempt.order_id, attempt_id=pending_attempt.pk, session_id=pending_attempt.provider_session_id)
+        expired = make_checkout_session_event(
+            event_type="checkout.session.expired", order_id=pending_attempt.order_id, attempt_id=pending_attempt.pk, session_id=pending_attempt.provider_session_id
+        )
+        mock_gateway.emit(completed["type"], _session(completed), created=start)
+        mock_gateway.emit(expired["type"], _session(expired), created=start + 30)
+
+        counts = catch_up(timezone.now() - timedelta(minutes=5))
+
+        assert counts == {"seen": 2, "applied": 2, "skipped": 0, "failed": 0}
+        assert list(WebhookEvent.objects.order_by("pk").values_list("type", flat=True)) == ["checkout.session.completed", "checkout.session.expired"]
+        pending_attempt.refresh_from_db()
+        assert pending_attempt.status == PaymentAttemptStatus.SUCCEEDED
+
+    def test_dry_run_changes_nothing(self, mock_gateway, pending_attempt):
+        event = make_checkout_session_event(order_id=pending_attempt.order_id, attempt_id=pending_attempt.pk, session_id=pending_attempt.provider_session_id)
+        mock_gateway.emit(event["type"], _session(event))
+
+        counts = catch_up(timezone.now() - timedelta(minutes=5), dry_run=True)
+
+        assert counts["applied"] == 1
+        assert not WebhookEvent.objects.exists()
+        pending_attempt.order.refresh_from_db()
+        assert pending_attempt.order.payment_status == PaymentStatus.PENDING
+
+    def test_requires_since_without_history(self, mock_gateway):
+        with pytest.raises(CommandError, match="--since"):
+            call_command("stripe_catch_up")
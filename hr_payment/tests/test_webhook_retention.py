@@ -0,0 +1,131 @@
+# hr_payment/tests/test_webhook_retention.py
+
+# Tests for WebhookEvent payload trimming, archival and pruning.
+#
+# Strategy:
+#   - WEBHOOK_EVENT_ARCHIVE_STORAGE and MEDIA_ROOT point at separate
+#     tmp_path directories; archives are read back with read_archive() and
+#     the media directory must stay empty.
+#   - received_at / finalized_at are backdated with queryset updates.
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from hr_payment.models import PaymentAttemptStatus, WebhookEvent
+from hr_payment.services.stripe_events import process_event, record_and_process, stored_payload
+from hr_payment.services.webhook_retention import prune, read_archive
+from hr_payment.tests.conftest import PaymentAttemptFactory, WebhookEventFactory, make_checkout_session_event, make_payment_intent_event
+from hr_shop.models import PaymentStatus
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    return tmp_path / "media"
+
+
+@pytest.fixture
+def archive_storage(settings, tmp_path, media_root):
+    location = tmp_path / "private"
+    settings.WEBHOOK_EVENT_ARCHIVE_STORAGE = {"BACKEND": "django.core.files.storage.FileSystemStorage", "OPTIONS": {"location": str(location)}}
+    settings.WEBHOOK_EVENT_RETENTION_DAYS = 45
+    settings.PAYMENT_ATTEMPT_RAW_RETENTION_DAYS = 180
+    return location
+
+
+def _backdate(days: int, **filters):
+    WebhookEvent.objects.filter(**filters).update(received_at=timezone.now() - timedelta(days=days))
+
+
+class TestStoredPayload:
+    def test_session_keeps_only_handler_fields(self):
+        event = make_checkout_session_event(order_id=1, attempt_id=2)
+        event["data"]["object"].update(client_secret="cs_secret", customer_details={"address": {"line1": "1 Main St"}}, line_items={"data": [{}]})
+
+        stored = stored_payload(event)["data"]["object"]
+
+        assert stored["metadata"] == {"order_id": "1", "payment_attempt_id": "2"}
+        assert stored["payment_intent"] == "pi_test_abc123"
+        assert not {"client_secret", "customer_details", "line_items"} & set(stored)
+
+    def test_payment_error_is_reduced(self):
+        event = make_payment_intent_event(last_payment_error={"code": "card_declined", "message": "Declined", "payment_method": {"card": {"last4": "4242"}}})
+
+        assert stored_payload(event)["data"]["object"]["last_payment_error"] == {"code": "card_declined", "message": "Declined", "type": None}
+
+    @pytest.mark.django_db
+    def test_failed_event_can_be_replayed_from_its_row(self, pending_attempt):
+        event = make_checkout_session_event(order_id=pending_attempt.order_id, attempt_id=pending_attempt.pk, session_id=pending_attempt.provider_session_id)
+        record_and_process(event)
+
+        with transaction.atomic():
+            process_event(WebhookEvent.objects.get(event_id=event["id"]).payload)
+
+        pending_attempt.refresh_from_db()
+        assert pending_attempt.order.payment_status == PaymentStatus.PAID
+        assert pending_attempt.status == PaymentAttemptStatus.SUCCEEDED
+
+
+@pytest.mark.django_db
+class TestPrune:
+    def test_archives_old_processed_events_only(self, archive_storage):
+        old = WebhookEventFactory.create_batch(3, ok=True, payload={"id": "x"})
+        WebhookEventFactory(ok=True, event_id="evt_recent")
+        WebhookEventFactory(ok=False, event_id="evt_failed_old")
+        _backdate(60, event_id__in=[e.event_id for e in old] + ["evt_failed_old"])
+
+        counts = prune(batch_size=2)
+
+        assert counts == {"archived": 3, "files": 2, "attempts_cleared": 0}
+        assert set(WebhookEvent.objects.values_list("event_id", flat=True)) == {"evt_recent", "evt_failed_old"}
+        files = sorted(p.relative_to(archive_storage).as_posix() for p in archive_storage.rglob("*.jsonl.gz"))
+        archived = [row["event_id"] for name in files for row in read_archive(name)]
+        assert sorted(archived) == sorted(e.event_id for e in old)
+
+    def test_archives_never_touch_public_media(self, archive_storage, media_root):
+        WebhookEventFactory(ok=True, payload={"id": "x", "customer_email": "buyer@example.com"})
+        _backdate(60)
+
+        with patch("django.core.files.storage.default_storage.save") as public_save:
+            assert prune()["files"] == 1
+
+        public_save.assert_not_called()
+        assert list(archive_storage.rglob("*.jsonl.gz"))
+        assert not media_root.exists() or not any(media_root.rglob("*"))
+
+    def test_archive_storage_inside_media_root_is_refused(self, settings, archive_storage, media_root):
+        settings.WEBHOOK_EVENT_ARCHIVE_STORAGE = {"BACKEND": "django.core.files.storage.FileSystemStorage", "OPTIONS": {"location": str(media_root / "archive")}}
+        WebhookEventFactory(ok=True)
+        _backdate(60)
+
+        with pytest.raises(ImproperlyConfigured):
+            prune()
+        assert WebhookEvent.objects.count() == 1
+
+    def test_clears_old_attempt_snapshots(self, archive_storage):
+        stale = PaymentAttemptFactory(status=PaymentAttemptStatus.SUCCEEDED, raw={"id": "cs_1"}, finalized_at=timezone.now() - timedelta(days=200))
+        fresh = PaymentAttemptFactory(status=PaymentAttemptStatus.SUCCEEDED, raw={"id": "cs_2"}, finalized_at=timezone.now())
+
+        assert prune()["attempts_cleared"] == 1
+
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        assert stale.raw is None and fresh.raw == {"id": "cs_2"}
+
+    def test_command_dry_run_changes_nothing(self, archive_storage):
+        WebhookEventFactory(ok=True)
+        _backdate(60)
+
+        out = StringIO()
+        call_command("prune_webhook_events", "--dry-run", stdout=out)
+
+        assert "Would archive 1 webhook event(s)" in out.getvalue()
+        assert WebhookEvent.objects.count() == 1
+        assert not list(archive_storage.rglob("*.gz"))
@@ -5,21 +5,22 @@ from __future__ import annotations
 import logging
 from decimal import Decimal, ROUND_HALF_UP
 
-import stripe
 from django.conf import settings
 from django.db import transaction
 from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 
-from hr_common.security import secrets
 from hr_common.utils.http.htmx import hx_trigger
 from hr_common.utils.unified_logging import log_event
+from hr_core.services.payments import PaymentError, WebhookVerificationError, get_gateway
 from hr_core.utils.urls import build_external_absolute_url
-from hr_payment.models import PaymentAttempt, PaymentAttemptStatus, WebhookEvent
-from hr_payment.services.payment_state import mark_checkout_draft_used
+from hr_payment.models import PaymentAttempt, PaymentAttemptStatus
+from hr_payment.services.payment_state import session_snapshot
+from hr_payment.services.stripe_catalog import checkout_line_items
+from hr_payment.services.stripe_customers import schedule_stripe_customer
+from hr_payment.services.stripe_events import FAILED, record_and_process
 from hr_shop.models import CheckoutDraft, Order, PaymentStatus
 from hr_shop.tokens.order_receipt_token import generate_order_receipt_token
 from hr_shop.views.checkout import _validate_guest_checkout
@@ -80,8 +81,7 @@ def checkout_stripe_session(request, order_id: int):
             header_keys=list(request.headers.keys())
         )
 
-    stripe.api_key = secrets.read_secret('STRIPE_SECRET_KEY')
-
+    gateway = get_gateway()
     order = get_object_or_404(Order, pk=int(order_id))
 
     user = getattr(request, 'user', None)
@@ -132,7 +132,7 @@ def checkout_stripe_session(request, order_id: int):
 
     if existing_attempt and existing_attempt.provider_session_id:
         try:
-            sess = stripe.checkout.Session.retrieve(existing_attempt.provider_session_id)
+            sess = gateway.retrieve_checkout_session(existing_attempt.provider_session_id)
             if sess and sess.get("status") == "open" and sess.get("client_secret"):
                 # Keep DB in sync
                 dirty_attempt = False
@@ -140,18 +140,7 @@ def checkout_stripe_session(request, order_id: int):
                     existing_attempt.client_secret = sess.get("client_secret")
                     dirty_attempt = True
 
-                existing_attempt.raw = {
-                    "id":             sess['id'],
-                    "livemode":       sess['livemode'],
-                    "amount_total":   sess['amount_total'],
-                    "currency":       sess['currency'],
-                    "status":         sess['status'],
-                    "payment_status": sess['payment_status'],
-                    "expires_at":     sess['expires_at'],
-                    "customer_email": sess['customer_email'],
-                    "ui_mode":        sess['ui_mode'],
-                    "return_url":     sess['return_url'],
-                }
+                existing_attempt.raw = session_snapshot(sess)
 
                 if existing_attempt.status != PaymentAttemptStatus.PENDING:
                     existing_attempt.status = PaymentAttemptStatus.PENDING
@@ -169,7 +158,7 @@ def checkout_stripe_session(request, order_id: int):
                     "sessionId": sess["id"]
                 })
 
-        except stripe.error.StripeError as exc:
+        except PaymentError as exc:
             log_event(logger, logging.WARNING, "payment.checkout.session_reuse_failed",
                 order_id=order.id,
                 session_id=existing_attempt.provider_session_id,
@@ -203,32 +192,30 @@ def checkout_stripe_session(request, order_id: int):
             "ui_mode": "embedded",
             "mode": "payment",
             "payment_method_types": ["card"],
-            "line_items": [{
-                "price_data": {
-                    "currency": "usd",
-                    "product_data": {"name": f"Hella Reptilian Order #{order.id}"},
-                    "unit_amount": amount_cents},
-                "quantity": 1}],
+            "line_items": checkout_line_items(order),
             "metadata": {
                 "order_id": str(order.id),
                 "payment_attempt_id": str(attempt.id)},
             "return_url": return_url
         }
 
-        if attach_customer:
-            stripe_customer_id = _get_or_create_stripe_customer_id(customer=order.customer, email=order.email)
+        # Provisioned ahead of time (hr_payment.services.stripe_customers); never created on this path.
+        stripe_customer_id = order.customer.stripe_customer_id if attach_customer else None
+        if stripe_customer_id:
             session_kwargs["customer"] = stripe_customer_id
             session_kwargs["customer_update"] = {"address": "auto", "shipping": "auto"}
         else:
             session_kwargs["customer_email"] = order.email
+            if attach_customer:
+                schedule_stripe_customer(order.customer_id)
 
         try:
-            sess = stripe.checkout.Session.create(**session_kwargs)
-        except stripe.error.StripeError as exc:
+            sess = gateway.create_checkout_session(**session_kwargs)
+        except PaymentError as exc:
             log_event(logger, logging.ERROR, "payment.checkout.session_create_failed",
                 order_id=order.id,
                 attempt_id=attempt.id,
-                attach_customer=attach_customer,
+                attach_customer=bool(stripe_customer_id),
                 error=str(exc),
                 error_type=getattr(exc, "__class__", type(exc)).__name__,
                 customer_id=getattr(order, "customer_id", None)
@@ -237,18 +224,7 @@ def checkout_stripe_session(request, order_id: int):
 
         attempt.provider_session_id = sess.get("id")
         attempt.client_secret = sess.get("client_secret")
-        attempt.raw = {
-            "id":             sess['id'],
-            "livemode":       sess['livemode'],
-            "amount_total":   sess['amount_total'],
-            "currency":       sess['currency'],
-            "status":         sess['status'],
-            "payment_status": sess['payment_status'],
-            "expires_at":     sess['expires_at'],
-            "customer_email": sess['customer_email'],
-            "ui_mode":        sess['ui_mode'],
-            "return_url":     sess['return_url'],
-        }
+        attempt.raw = session_snapshot(sess)
         attempt.status = PaymentAttemptStatus.PENDING
         attempt.save(update_fields=["provider_session_id", "client_secret", "raw", "status", "updated_at"])
 
@@ -258,7 +234,7 @@ def checkout_stripe_session(request, order_id: int):
         order.save(update_fields=["stripe_checkout_session_id", "payment_status", "updated_at"])
 
         log_event(logger, logging.INFO, "payment.checkout.session_created",
-            order_id=order.id, attempt_id=attempt.id, session_id=sess.get("id"), attach_customer=attach_customer)
+            order_id=order.id, attempt_id=attempt.id, session_id=sess.get("id"), attach_customer=bool(stripe_customer_id))
 
         return JsonResponse({"clientSecret": sess.get("client_secret"), "sessionId": sess.get("id"), "reused": False})
 
@@ -266,285 +242,13 @@ def checkout_stripe_session(request, order_id: int):
 @csrf_exempt
 @require_POST
 def stripe_webhook(request):
-    stripe.api_key = secrets.read_secret('STRIPE_SECRET_KEY')
-    payload = request.body
-    sig_header = request.META.get("HTTP_STRIPE_SIGNATURE", "")
-
     try:
-        event = stripe.Webhook.construct_event(
-            payload=payload,
-            sig_header=sig_header,
-            secret=secrets.read_secret('STRIPE_WEBHOOK_SECRET')
-        )
-    except stripe.error.SignatureVerificationError:
-        log_event(logger, logging.WARNING, "payment.webhook.invalid_signature", signature_present=bool(sig_header))
+        event = get_gateway().verify_webhook(request)
+    except WebhookVerificationError:
+        log_event(logger, logging.WARNING, "payment.webhook.invalid_signature", signature_present=bool(request.META.get("HTTP_STRIPE_SIGNATURE")))
         return HttpResponse(status=400)
 
-    # idempotency/audit
-    obj, created = WebhookEvent.objects.get_or_create(
-        event_id=event["id"],
-        defaults={
-            "type": event.get("type", ""),
-            "payload": event
-        }
-    )
-    if not created and obj.ok:
-        log_event(logger, logging.INFO, "payment.webhook.duplicate", event_id=event.get("id"))
-        return HttpResponse(status=200)
-
-    try:
-        with transaction.atomic():
-            _process_stripe_event(event)
-        obj.ok = True
-        obj.processed_at = timezone.now()
-        obj.error = None
-        obj.save(update_fields=["ok", "processed_at", "error"])
-    except Exception as e:
-        log_event(logger, logging.ERROR, "payment.webhook.processing_failed", event_id=event.get("id"), error=str(e), exc_info=True)
-        obj.ok = False
-        obj.processed_at = timezone.now()
-        obj.error = str(e)
-        obj.save(update_fields=["ok", "processed_at", "error"])
+    # Handlers live in hr_payment.services.stripe_events; a 500 makes Stripe redeliver.
+    if record_and_process(event) == FAILED:
         return HttpResponse(status=500)
-
     return HttpResponse(status=200)
-
-
-def _get_or_create_stripe_customer_id(*, customer, email: str) -> str:
-    if customer.stripe_customer_id:
-        return customer.stripe_customer_id
-
-    stripe_customer = stripe.Customer.create(email=email, name=(customer.full_name or None), metadata={"hr_customer_id": str(customer.id)})
-
-    customer.stripe_customer_id = stripe_customer["id"]
-    customer.save(update_fields=["stripe_customer_id", "updated_at"])
-    return stripe_customer["id"]
-
-
-def _process_stripe_event(event: dict) -> None:
-    etype = event.get("type")
-    data_obj = (event.get("data") or {}).get("object") or {}
-
-    if etype == "checkout.session.completed":
-        _handle_checkout_session_completed(data_obj)
-        return
-
-    if etype == "checkout.session.expired":
-        _handle_checkout_session_expired(data_obj)
-        return
-
-    if etype == "payment_intent.succeeded":
-        _handle_payment_intent_succeeded(data_obj)
-        return
-
-    if etype == "payment_intent.payment_failed":
-        _handle_payment_intent_failed(data_obj)
-        return
-
-    if etype == "payment_intent.canceled":
-        _handle_payment_intent_canceled(data_obj)
-        return
-
-
-def _find_attempt_for_session(session: dict) -> PaymentAttempt | None:
-    metadata = session.get("metadata") or {}
-    attempt_id = metadata.get("payment_attempt_id")
-
-    if attempt_id:
-        a = PaymentAttempt.objects.select_for_update().filter(pk=int(attempt_id)).first()
-        if a:
-            return a
-
-    sid = session.get("id")
-    if sid:
-        return PaymentAttempt.objects.select_for_update().filter(provider_session_id=sid).first()
-
-    return None
-
-
-def _handle_checkout_session_completed(session: dict) -> None:
-    metadata = session.get("metadata") or {}
-    order_id = metadata.get("order_id")
-
-    if not order_id:
-        return
-
-    order = Order.objects.select_for_update().get(pk=int(order_id))
-    sid = session.get("id")
-    pi = session.get("payment_intent")
-
-    if sid:
-        order.stripe_checkout_session_id = sid
-    if pi:
-        order.stripe_payment_intent_id = pi
-
-    order.payment_status = PaymentStatus.PAID
-    order.save(update_fields=["stripe_checkout_session_id", "stripe_payment_intent_id", "payment_status", "updated_at"])
-    mark_checkout_draft_used(order.id)
-
-    attempt = _find_attempt_for_session(session)
-    if attempt:
-        if sid:
-            attempt.provider_session_id = sid
-        if pi:
-            attempt.provider_payment_intent_id = pi
-
-        attempt.client_secret = session.get("client_secret") or attempt.client_secret
-        attempt.raw = {
-            "id":             session['id'],
-            "livemode":       session['livemode'],
-            "amount_total":   session['amount_total'],
-            "currency":       session['currency'],
-            "status":         session['status'],
-            "payment_status": session['payment_status'],
-            "expires_at":     session['expires_at'],
-            "customer_email": session['customer_email'],
-            "ui_mode":        session['ui_mode'],
-            "return_url":     session['return_url'],
-        }
-        attempt.save(update_fields=["provider_session_id", "provider_payment_intent_id", "client_secret", "raw", "updated_at"])
-        attempt.mark_final(PaymentAttemptStatus.SUCCEEDED)
-
-
-def _handle_checkout_session_expired(session: dict) -> None:
-    attempt = _find_attempt_for_session(session)
-    if attempt and attempt.status not in (PaymentAttemptStatus.SUCCEEDED, PaymentAttemptStatus.FAILED):
-        attempt.raw = {
-            "id":             session['id'],
-            "livemode":       session['livemode'],
-            "amount_total":   session['amount_total'],
-            "currency":       session['currency'],
-            "status":         session['status'],
-            "payment_status": session['payment_status'],
-            "expires_at":     session['expires_at'],
-            "customer_email": session['customer_email'],
-            "ui_mode":        session['ui_mode'],
-            "return_url":     session['return_url'],
-        }
-
-        attempt.save(update_fields=["raw", "updated_at"])
-        attempt.mark_final(PaymentAttemptStatus.EXPIRED)
-
-
-def _handle_payment_intent_succeeded(pi: dict) -> None:
-    pid = pi.get("id")
-    if not pid:
-        return
-
-    attempt = PaymentAttempt.objects.select_for_update().filter(provider_payment_intent_id=pid).first()
-    order = attempt.order if attempt else Order.objects.select_for_update().filter(stripe_payment_intent_id=pid).first()
-    if not order:
-        return
-
-    order.stripe_payment_intent_id = pid
-    order.payment_status = PaymentStatus.PAID
-    order.save(update_fields=["stripe_payment_intent_id", "payment_status", "updated_at"])
-    mark_checkout_draft_used(order.id)
-
-    if attempt and attempt.status != PaymentAttemptStatus.SUCCEEDED:
-        attempt.raw = {
-            "id":       pi.get("id"),
-            "livemode": pi.get("livemode"),
-            "amount":   pi.get("amount"),
-            "currency": pi.get("currency"),
-            "status":   pi.get("status")
-        }
-        # attempt.raw = {
-        #     "id":             pi['id'],
-        #     "livemode":       pi['livemode'],
-        #     "amount_total":   pi['amount_total'],
-        #     "currency":       pi['currency'],
-        #     "status":         pi['status'],
-        #     "payment_status": pi['payment_status'],
-        #     "expires_at":     pi['expires_at'],
-        #     "customer_email": pi['customer_email'],
-        #     "ui_mode":        pi['ui_mode'],
-        #     "return_url":     pi['return_url'],
-        # }
-        attempt.save(update_fields=["raw", "updated_at"])
-        attempt.mark_final(PaymentAttemptStatus.SUCCEEDED)
-
-
-def _handle_payment_intent_failed(pi: dict) -> None:
-    pid = pi.get("id")
-    if not pid:
-        return
-
-    attempt = PaymentAttempt.objects.select_for_update().filter(provider_payment_intent_id=pid).first()
-    order = attempt.order if attempt \
-        else Order.objects.select_for_update().filter(stripe_payment_intent_id=pid).first()
-    if not order:
-        return
-
-    order.stripe_payment_intent_id = pid
-    order.payment_status = PaymentStatus.FAILED
-    order.save(update_fields=["stripe_payment_intent_id", "payment_status", "updated_at"])
-
-    if attempt and attempt.status != PaymentAttemptStatus.SUCCEEDED:
-        last_err = pi.get("last_payment_error") or {}
-        # attempt.raw = {
-        #     "id":             pi['id'],
-        #     "livemode":       pi['livemode'],
-        #     "amount_total":   pi['amount_total'],
-        #     "currency":       pi['currency'],
-        #     "status":         pi['status'],
-        #     "payment_status": pi['payment_status'],
-        #     "expires_at":     pi['expires_at'],
-        #     "customer_email": pi['customer_email'],
-        #     "ui_mode":        pi['ui_mode'],
-        #     "return_url":     pi['return_url'],
-        # }
-        attempt.raw = {
-            "id":                 pi.get("id"),
-            "livemode":           pi.get("livemode"),
-            "amount":             pi.get("amount"),
-            "currency":           pi.get("currency"),
-            "status":             pi.get("status"),
-            "last_payment_error": pi.get("last_payment_error")
-        }
-        attempt.save(update_fields=["raw", "updated_at"])
-        attempt.mark_final(
-            PaymentAttemptStatus.FAILED,
-            code=(last_err.get("code") or None),
-            msg=(last_err.get("message") or None)
-        )
-
-
-def _handle_payment_intent_canceled(pi: dict) -> None:
-    pid = pi.get("id")
-    if not pid:
-        return
-
-    attempt = PaymentAttempt.objects.select_for_update().filter(provider_payment_intent_id=pid).first()
-    order = attempt.order if attempt else Order.objects.select_for_update().filter(stripe_payment_intent_id=pid).first()
-    if not order:
-        return
-
-    # Canceled is "not paid", but not "failed" either.
-    if order.payment_status != PaymentStatus.PAID:
-        order.payment_status = PaymentStatus.UNPAID
-        order.save(update_fields=["payment_status", "updated_at"])
-
-    if attempt and attempt.status not in (PaymentAttemptStatus.SUCCEEDED, PaymentAttemptStatus.FAILED):
-        # attempt.raw = {
-        #     "id":             pi['id'],
-        #     "livemode":       pi['livemode'],
-        #     "amount_total":   pi['amount_total'],
-        #     "currency":       pi['currency'],
-        #     "status":         pi['status'],
-        #     "payment_status": pi['payment_status'],
-        #     "expires_at":     pi['expires_at'],
-        #     "customer_email": pi['customer_email'],
-        #     "ui_mode":        pi['ui_mode'],
-        #     "return_url":     pi['return_url'],
-        # }
-        attempt.raw = {
-            "id":       pi.get("id"),
-            "livemode": pi.get("livemode"),
-            "amount":   pi.get("amount"),
-            "currency": pi.get("currency"),
-            "status":   pi.get("status"),
-        }
-
-        attempt.save(update_fields=["raw", "updated_at"])
-        attempt.mark_final(PaymentAttemptStatus.CANCELED)
@@ -39,7 +39,7 @@ class Cart:
         Yield cart items with attached ProductVariant objects and line totals.
         """
         variant_ids = [int(v_id) for v_id in self.cart.keys()]
-        variants = ProductVariant.objects.filter(id__in=variant_ids).select_related("product")
+        variants = ProductVariant.objects.filter(id__in=variant_ids).select_related("product", "image")
 
         variants_map = {v.id: v for v in variants}
         for variant_id_str, data in self.cart.items():
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:54
+
+from django.db import migrations
+
+import hr_storage.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hr_shop", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="productimage",
+            name="image",
+            field=hr_storage.fields.ContentAddressedImageField(upload_to="variants/"),
+        ),
+    ]
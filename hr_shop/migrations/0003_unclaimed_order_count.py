@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:44
+
+from django.db import migrations, models
+from django.db.models import Count
+
+import hr_common.db.fields
+
+
+def backfill_counts(apps, schema_editor):
+    Order = apps.get_model("hr_shop", "Order")
+    UnclaimedOrderCount = apps.get_model("hr_shop", "UnclaimedOrderCount")
+    rows = Order.objects.filter(user__isnull=True).exclude(email="").values("email").annotate(n=Count("pk"))
+    UnclaimedOrderCount.objects.bulk_create([UnclaimedOrderCount(email=row["email"], count=row["n"]) for row in rows], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hr_shop", "0002_alter_productimage_image"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UnclaimedOrderCount",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("email", hr_common.db.fields.NormalizedEmailField(max_length=254, unique=True)),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
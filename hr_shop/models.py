@@ -45,14 +45,16 @@ from functools import cached_property
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.db import models
-from django.db.models import Min, Q
+from django.db.models import Max, Min, Q
 from django.utils import timezone
 from phonenumber_field.modelfields import PhoneNumberField
 
 from hr_common.db.fields import NormalizedEmailField
+from hr_common.db.positions import assign_positions, next_position, reorder
 from hr_common.db.slug import sync_slug_from_source
 from hr_common.models import Address
 from hr_common.utils.email import normalize_email
+from hr_storage.fields import ContentAddressedImageField
 
 
 def max_per_purchase(product):
@@ -85,6 +87,12 @@ class Product(models.Model):
         """
         Returns the display variant if set, otherwise the first variant available.
         """
+        if "variants" in getattr(self, "_prefetched_objects_cache", {}):
+            # Listing pages prefetch variants; pick from the cache instead of
+            # issuing two queries per product.
+            variants = sorted(self.variants.all(), key=lambda v: v.pk)
+            return next((v for v in variants if v.is_display_variant), variants[0] if variants else None)
+
         display_variant = self.variants.filter(is_display_variant=True).first()
         if display_variant:
             return display_variant
@@ -127,20 +135,22 @@ class ProductOptionType(models.Model):
         ordering = ["position", "id"]
 
     def save(self, *args, **kwargs):
-        # Autopopulate position if blank/zero, compacting gaps per product.
+        # Autopopulate position if blank/zero: append after the current max per product.
         if self.position in (0, None):
-            existing = ProductOptionType.objects.filter(product=self.product).exclude(id=self.id).values_list("position", flat=True)
-            used = set(existing)
-            pos = 1
-            while pos in used:
-                pos += 1
-            self.position = pos
+            self.position = next_position(ProductOptionType.objects.filter(product_id=self.product_id), exclude_pk=self.pk)
 
         super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.product.name} - {self.name}"
 
+    @classmethod
+    def reorder(cls, product, ordered_ids):
+        """
+        Rewrite positions (1..n) for a product's option types in the given id order.
+        """
+        return reorder(cls.objects.filter(product=product), ordered_ids)
+
 
 class ProductOptionValue(models.Model):
     """
@@ -158,20 +168,22 @@ class ProductOptionValue(models.Model):
         ordering = ["position", "id"]
 
     def save(self, *args, **kwargs):
-        # Autopopulate position if blank/zero, compacting gaps per option_type.
+        # Autopopulate position if blank/zero: append after the current max per option_type.
         if self.position in (0, None):
-            existing = ProductOptionValue.objects.filter(option_type=self.option_type).exclude(id=self.id).values_list("position", flat=True)
-            used = set(existing)
-            pos = 1
-            while pos in used:
-                pos += 1
-            self.position = pos
+            self.position = next_position(ProductOptionValue.objects.filter(option_type_id=self.option_type_id), exclude_pk=self.pk)
 
         super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.option_type.name}: {self.name}"
 
+    @classmethod
+    def reorder(cls, option_type, ordered_ids):
+        """
+        Rewrite positions (1..n) for an option type's values in the given id order.
+        """
+        return reorder(cls.objects.filter(option_type=option_type), ordered_ids)
+
 
 # ==========================
 # Reusable templates
@@ -201,26 +213,53 @@ class OptionTypeTemplate(models.Model):
         Create a ProductOptionType + ProductOptionValue set for this product,
         using this template as the source.
         """
-        new_code = self.code
-        if code_suffix:
-            new_code = f"{self.code}-{code_suffix}"
+        return self.clone_to_products([product], include_values=include_values, code_suffix=code_suffix)[0]
+
+    def clone_to_products(self, products, *, include_values=True, code_suffix=None):
+        """
+        Clone this template onto many products at once.
+
+        Existing codes and max positions are read with one query each for the
+        whole batch, option types and values are bulk-created with positions
+        assigned in memory. Returns the new ProductOptionTypes in product order.
+        """
+        products = list(products)
+        if not products:
+            return []
+
+        product_ids = [p.pk for p in products]
+        base_code = f"{self.code}-{code_suffix}" if code_suffix else self.code
 
-        base_code = new_code
-        counter = 1
-        while ProductOptionType.objects.filter(product=product, code=new_code).exists():
-            counter += 1
-            new_code = f"{base_code}-{counter}"
+        taken = {}
+        for product_id, code in ProductOptionType.objects.filter(product_id__in=product_ids, code__startswith=base_code).values_list("product_id", "code"):
+            taken.setdefault(product_id, set()).add(code)
 
-        new_type = ProductOptionType.objects.create(product=product, name=self.name, code=new_code, position=0, active=True)  # save() will autoincrement position per product
+        max_positions = dict(ProductOptionType.objects.filter(product_id__in=product_ids).values("product_id").annotate(_max=Max("position")).values_list("product_id", "_max"))
+
+        new_types = []
+        for product in products:
+            used = taken.get(product.pk, set())
+            new_code = base_code
+            counter = 1
+            while new_code in used:
+                counter += 1
+                new_code = f"{base_code}-{counter}"
+
+            position = (max_positions.get(product.pk) or 0) + 1
+            new_types.append(ProductOptionType(product=product, name=self.name, code=new_code, position=position, active=True))
+
+        new_types = ProductOptionType.objects.bulk_create(new_types)
 
         if include_values:
-            templates = self.values.all()
+            templates = list(self.values.all())
             new_values = []
-            for v in templates:
-                new_values.append(ProductOptionValue(option_type=new_type, name=v.name, code=v.code, position=0, active=v.active))  # save() will autoincrement
+            for new_type in new_types:
+                new_values.extend(
+                    assign_positions(ProductOptionValue(option_type=new_type, name=v.name, code=v.code, active=v.active) for v in templates)
+                )
             ProductOptionValue.objects.bulk_create(new_values)
 
-        return new_type
+        return new_types
 
 
 class OptionValueTemplate(models.Model):
@@ -253,7 +292,7 @@ class ProductImage(models.Model):
     A reusable image. One ProductImage can be shared by many variants.
     """
 
-    image = models.ImageField(upload_to="variants/")
+    image = ContentAddressedImageField(upload_to="variants/")
     alt_text = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -454,6 +493,13 @@ class Order(models.Model):
     def __str__(self):
         return f"Order {self.id} ({self.order_status})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The email the row was loaded with; hr_shop.signals recounts it too when the order moves to another address.
+        instance._loaded_email = instance.__dict__.get("email")
+        return instance
+
     def can_edit_shipping(self) -> bool:
         return self.payment_status in (PaymentStatus.PENDING, PaymentStatus.FAILED, PaymentStatus.UNPAID)
 
@@ -478,6 +524,22 @@ class OrderItem(models.Model):
         return f"{self.quantity} x {self.variant.sku}"
 
 
+class UnclaimedOrderCount(models.Model):
+    """
+    Guest orders (Order.user unset) per email, denormalized for the account
+    sidebar badge. Kept up to date by hr_shop.services.unclaimed_orders; no
+    row means zero.
+    """
+
+    email: str
+    email = NormalizedEmailField(unique=True)
+    count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.email}: {self.count}"
+
+
 # ==========================
 # Email Confirmation
 # ==========================
@@ -3,6 +3,7 @@
 from django.db import transaction
 
 # from hr_common.utils.email import normalize_email
+from hr_payment.services.stripe_customers import STRIPE_ID_UNSET, schedule_stripe_customer
 from hr_shop.models import Customer
 
 
@@ -40,5 +41,9 @@ def attach_customer_to_user(user) -> int:
         return 0
 
     qs = Customer.objects.filter(email=email, user__isnull=True)
+    customer_ids = list(qs.filter(STRIPE_ID_UNSET).values_list("pk", flat=True))
     updated = qs.update(user=user)
+    # .update() skips post_save; account holders get a Stripe customer before their first checkout.
+    for customer_id in customer_ids:
+        schedule_stripe_customer(customer_id)
     return updated
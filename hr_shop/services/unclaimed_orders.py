@@ -0,0 +1,42 @@
+# hr_shop/services/unclaimed_orders.py
+
+"""
+Per-email count of unclaimed (guest) orders, read by the account sidebar,
+orders modal and settings on every `accessChanged` reload.
+
+Reads are a single unique-key lookup on UnclaimedOrderCount. Writes recount
+one email from Order after the changing transaction commits, so a missed or
+doubled signal can never leave the badge drifting: the next change for that
+email corrects it. Triggered by Order post_save/post_delete
+(hr_shop.signals) and by the bulk claim in account_submit_claim_unclaimed_orders,
+which updates with a queryset and sends no signals.
+"""
+
+from django.db import transaction
+
+from hr_common.utils.email import normalize_email
+from hr_shop.models import Order, UnclaimedOrderCount
+
+
+def unclaimed_order_count(email: str | None) -> int:
+    if not email:
+        return 0
+    return UnclaimedOrderCount.objects.filter(email=normalize_email(email)).values_list("count", flat=True).first() or 0
+
+
+def refresh_unclaimed_order_count(*emails: str | None) -> None:
+    """
+    Recount the given emails once the current transaction commits.
+    """
+    normalized = {normalize_email(email) for email in emails if email}
+    if normalized:
+        transaction.on_commit(lambda: recount_unclaimed_orders(normalized))
+
+
+def recount_unclaimed_orders(emails) -> None:
+    for email in emails:
+        count = Order.objects.filter(user__isnull=True, email__iexact=email).count()
+        if count:
+            UnclaimedOrderCount.objects.update_or_create(email=email, defaults={"count": count})
+        else:
+            UnclaimedOrderCount.objects.filter(email=email).delete()
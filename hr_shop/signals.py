@@ -1,11 +1,14 @@
 # hr_shop/signals.py
 
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from hr_core.image_batch import schedule_image_variants
-from hr_shop.models import ProductImage
+from hr_payment.services.stripe_catalog import schedule_catalog_sync
+from hr_payment.services.stripe_customers import schedule_stripe_customer, wants_stripe_customer
+from hr_shop.models import Customer, Order, Product, ProductImage, ProductVariant
+from hr_shop.services.unclaimed_orders import refresh_unclaimed_order_count
 
 
 @receiver(post_save, sender=ProductImage)
@@ -18,3 +21,39 @@ def enqueue_variant_image_variants(sender, instance: ProductImage, **kwargs):
         return
 
     schedule_image_variants("variant", instance.image.name)
+
+
+@receiver(post_save, sender=Customer)
+def provision_stripe_customer_ahead_of_checkout(sender, instance: Customer, **kwargs):
+    if wants_stripe_customer(instance):
+        schedule_stripe_customer(instance.pk)
+
+
+@receiver(post_save, sender=Product)
+def sync_product_to_stripe(sender, instance: Product, **kwargs):
+    schedule_catalog_sync(instance.variants.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=ProductVariant)
+def sync_variant_to_stripe(sender, instance: ProductVariant, **kwargs):
+    schedule_catalog_sync([instance.pk])
+
+
+@receiver(post_save, sender=Order)
+def refresh_unclaimed_count_on_save(sender, instance: Order, created: bool, update_fields=None, **kwargs):
+    previous_email = getattr(instance, "_loaded_email", None)
+    instance._loaded_email = instance.email
+    if created:
+        if instance.user_id is None:
+            refresh_unclaimed_order_count(instance.email)
+        return
+    # Payment/status saves pass update_fields without user/email and cannot change the count.
+    if update_fields is None or {"user", "email"} & set(update_fields):
+        # An order moved to another address leaves the old one's count behind otherwise.
+        refresh_unclaimed_order_count(instance.email, previous_email)
+
+
+@receiver(post_delete, sender=Order)
+def refresh_unclaimed_count_on_delete(sender, instance: Order, **kwargs):
+    if instance.user_id is None:
+        refresh_unclaimed_order_count(instance.email)
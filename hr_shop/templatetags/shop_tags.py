@@ -8,6 +8,6 @@ register = template.Library()
 @register.simple_tag
 def get_display_variant(product):
     """
-    Returns the product's display variant.
+    Returns the product's display variant (see Product.display_variant).
     """
-    return product.variants.filter(is_display_variant=True).first() or product.variants.first()
+    return product.display_variant
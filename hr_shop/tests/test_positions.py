@@ -0,0 +1,82 @@
+# hr_shop/tests/test_positions.py
+
+# Tests for option type/value position allocation and template cloning.
+
+import pytest
+
+from hr_shop.models import OptionTypeTemplate, OptionValueTemplate, ProductOptionType, ProductOptionValue
+from tests.factories import ProductFactory
+
+
+@pytest.fixture
+def size_template(db):
+    tmpl = OptionTypeTemplate.objects.create(name="Size", code="size")
+    for i, code in enumerate(("s", "m", "l"), start=1):
+        OptionValueTemplate.objects.create(option_type=tmpl, name=code.upper(), code=code, position=i)
+    return tmpl
+
+
+class TestAutoPosition:
+    def test_new_option_types_append_after_max(self, product):
+        a = ProductOptionType.objects.create(product=product, name="Size", code="size")
+        b = ProductOptionType.objects.create(product=product, name="Color", code="color")
+
+        assert (a.position, b.position) == (1, 2)
+
+    def test_explicit_position_is_kept(self, product):
+        ot = ProductOptionType.objects.create(product=product, name="Size", code="size", position=7)
+
+        assert ot.position == 7
+
+    def test_values_are_positioned_per_option_type(self, product):
+        ot = ProductOptionType.objects.create(product=product, name="Size", code="size")
+        other = ProductOptionType.objects.create(product=product, name="Color", code="color")
+        ProductOptionValue.objects.create(option_type=other, name="Black", code="black")
+
+        v = ProductOptionValue.objects.create(option_type=ot, name="XL", code="xl")
+
+        assert v.position == 1
+
+
+class TestCloneToProducts:
+    def test_clone_assigns_contiguous_value_positions(self, size_template, product):
+        new_type = size_template.clone_to_product(product)
+
+        positions = list(new_type.values.order_by("position").values_list("code", "position"))
+        assert positions == [("s", 1), ("m", 2), ("l", 3)]
+
+    def test_clone_appends_type_and_avoids_code_collision(self, size_template, product):
+        ProductOptionType.objects.create(product=product, name="Size", code="size")
+
+        new_type = size_template.clone_to_product(product)
+
+        assert new_type.code == "size-2"
+        assert new_type.position == 2
+
+    def test_clone_to_many_products(self, size_template, db):
+        products = ProductFactory.create_batch(3)
+
+        new_types = size_template.clone_to_products(products)
+
+        assert [t.product_id for t in new_types] == [p.pk for p in products]
+        assert ProductOptionValue.objects.filter(option_type__in=new_types).count() == 9
+        assert not ProductOptionValue.objects.filter(option_type__in=new_types, position=0).exists()
+
+
+class TestReorder:
+    def test_reorder_rewrites_positions_in_given_order(self, size_template, product):
+        new_type = size_template.clone_to_product(product)
+        small, medium, large = new_type.values.order_by("position")
+
+        ProductOptionValue.reorder(new_type, [large.pk, small.pk, medium.pk])
+
+        assert list(new_type.values.order_by("position").values_list("code", flat=True)) == ["l", "s", "m"]
+
+    def test_reorder_appends_unlisted_rows(self, product):
+        a = ProductOptionType.objects.create(product=product, name="A", code="a")
+        b = ProductOptionType.objects.create(product=product, name="B", code="b")
+        c = ProductOptionType.objects.create(product=product, name="C", code="c")
+
+        ProductOptionType.reorder(product, [c.pk])
+
+        assert list(product.option_types.order_by("position").values_list("pk", flat=True)) == [c.pk, a.pk, b.pk]
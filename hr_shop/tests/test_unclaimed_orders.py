@@ -0,0 +1,82 @@
+# hr_shop/tests/test_unclaimed_orders.py
+
+# Tests for the denormalized unclaimed-order counter (UnclaimedOrderCount).
+#
+# Strategy:
+#   - Counts are recounted in on_commit callbacks, so every write runs under
+#     django_capture_on_commit_callbacks(execute=True).
+#   - The claim view is driven through the test client; it bulk-updates and
+#     has to refresh the counter itself.
+
+import pytest
+from django.urls import reverse
+
+from hr_shop.models import Order, UnclaimedOrderCount
+from hr_shop.services.unclaimed_orders import unclaimed_order_count
+from tests.factories import CustomerFactory, OrderFactory
+
+EMAIL = "guest@example.com"
+
+
+@pytest.fixture
+def guest_orders(db, django_capture_on_commit_callbacks):
+    customer = CustomerFactory(email=EMAIL)
+    with django_capture_on_commit_callbacks(execute=True):
+        return OrderFactory.create_batch(3, customer=customer)
+
+
+@pytest.mark.django_db
+class TestCounter:
+    def test_created_guest_orders_are_counted(self, guest_orders):
+        assert unclaimed_order_count(EMAIL) == 3
+        assert unclaimed_order_count("Guest@Example.com ") == 3
+        assert unclaimed_order_count("nobody@example.com") == 0
+
+    def test_claim_and_delete_update_the_count(self, guest_orders, django_user_model, django_capture_on_commit_callbacks):
+        user = django_user_model.objects.create_user(username="guest", email=EMAIL, password="pw")
+        first, second, third = guest_orders
+
+        with django_capture_on_commit_callbacks(execute=True):
+            first.user = user
+            first.save(update_fields=["user", "updated_at"])
+        assert unclaimed_order_count(EMAIL) == 2
+
+        with django_capture_on_commit_callbacks(execute=True):
+            second.delete()
+        assert unclaimed_order_count(EMAIL) == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            third.delete()
+        assert not UnclaimedOrderCount.objects.filter(email=EMAIL).exists()
+
+    def test_email_change_recounts_both_addresses(self, guest_orders, django_capture_on_commit_callbacks):
+        order = Order.objects.get(pk=guest_orders[0].pk)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            order.email = "other@example.com"
+            order.save()
+        assert unclaimed_order_count(EMAIL) == 2
+        assert unclaimed_order_count("other@example.com") == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            order.email = "third@example.com"
+            order.save(update_fields=["email", "updated_at"])
+        assert unclaimed_order_count("other@example.com") == 0
+        assert unclaimed_order_count("third@example.com") == 1
+
+    def test_payment_saves_do_not_recount(self, guest_orders, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks() as callbacks:
+            guest_orders[0].save(update_fields=["payment_status", "updated_at"])
+        assert callbacks == []
+
+    def test_claim_view_refreshes_badge(self, client, guest_orders, django_user_model, django_capture_on_commit_callbacks, django_assert_num_queries):
+        user = django_user_model.objects.create_user(username="guest", email=EMAIL, password="pw")
+        client.force_login(user)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            resp = client.post(reverse("hr_access:account_submit_claim_unclaimed_orders"), {"order_ids": [guest_orders[0].pk, guest_orders[1].pk]})
+
+        assert resp.status_code == 204
+        assert unclaimed_order_count(EMAIL) == 1
+        with django_assert_num_queries(1):
+            unclaimed_order_count(EMAIL)
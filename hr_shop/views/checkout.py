@@ -8,7 +8,6 @@ from decimal import Decimal, ROUND_HALF_UP
 from enum import Enum
 from typing import Any
 
-import stripe
 from django.conf import settings
 from django.contrib import messages
 from django.core.cache import cache
@@ -26,6 +25,7 @@ from hr_common.security import secrets
 from hr_common.utils.email import normalize_email
 from hr_common.utils.http.htmx import hx_load_modal, hx_trigger, merge_hx_trigger_after_settle
 from hr_common.utils.unified_logging import log_event
+from hr_core.services.payments import PaymentAuthError, PaymentError, PaymentInvalidRequest, PaymentTemporaryError, get_gateway
 from hr_core.utils.urls import build_external_absolute_url
 from hr_email.service import EmailProviderError, send_app_email
 from hr_payment.services.payment_state import mark_checkout_draft_used
@@ -453,11 +453,9 @@ def _stripe_session_payment_intent_id(session_id: str) -> str | None:
     if not session_id:
         return None
 
-    stripe.api_key = secrets.read_secret('STRIPE_SECRET_KEY')
-
     try:
-        sess = stripe.checkout.Session.retrieve(session_id)
-    except stripe.error.StripeError:
+        sess = get_gateway().retrieve_checkout_session(session_id)
+    except PaymentError:
         return None
 
     return sess.get("payment_intent")
@@ -478,14 +476,7 @@ def _stripe_session_result(session_id: str | None) -> tuple[str, str | None, str
     if not session_id:
         return StripePaymentOutcome(StripePaymentResult.UNKNOWN, "Missing checkout session id for this order.", "missing_session_id").as_tuple()
 
-    stripe.api_key = secrets.read_secret('STRIPE_SECRET_KEY')
-
-    InvalidRequestError   = stripe.error.InvalidRequestError
-    AuthenticationError   = stripe.error.AuthenticationError
-    StripePermissionError = stripe.error.PermissionError
-    APIConnectionError    = stripe.error.APIConnectionError
-    RateLimitError        = stripe.error.RateLimitError
-    StripeError           = stripe.error.StripeError
+    gateway = get_gateway()
 
     def _temporary(where: str, err: Exception) -> StripePaymentOutcome:
         log_event(logger, logging.INFO, "stripe.session.temporary_issue", where=where, session_id=session_id, error=str(err))
@@ -500,15 +491,15 @@ def _stripe_session_result(session_id: str | None) -> tuple[str, str | None, str
         return StripePaymentOutcome(StripePaymentResult.UNKNOWN, "Payment processor error.", "stripe_error")
 
     try:
-        sess = stripe.checkout.Session.retrieve(session_id)
-    except InvalidRequestError as e:
+        sess = gateway.retrieve_checkout_session(session_id)
+    except PaymentInvalidRequest as e:
         log_event(logger, logging.WARNING, "stripe.session.invalid", session_id=session_id, error=str(e))
         return StripePaymentOutcome(StripePaymentResult.UNKNOWN, "Invalid checkout session.", "invalid_session").as_tuple()
-    except (APIConnectionError, RateLimitError) as e:
+    except PaymentTemporaryError as e:
         return _temporary("retrieve_session", e).as_tuple()
-    except (AuthenticationError, StripePermissionError) as e:
+    except PaymentAuthError as e:
         return _hard_auth("retrieve_session", e).as_tuple()
-    except StripeError as e:
+    except PaymentError as e:
         return _generic("retrieve_session", e).as_tuple()
 
     sess_status = (sess.get("status") or "").lower()  # open, complete, expired
@@ -544,15 +535,15 @@ def _stripe_session_result(session_id: str | None) -> tuple[str, str | None, str
         return StripePaymentOutcome(StripePaymentResult.UNKNOWN).as_tuple()
 
     try:
-        pi = stripe.PaymentIntent.retrieve(pi_id)
-    except InvalidRequestError as e:
+        pi = gateway.retrieve_payment_intent(pi_id)
+    except PaymentInvalidRequest as e:
         log_event(logger, logging.WARNING, "stripe.payment_intent.invalid", payment_intent_id=pi_id, session_id=session_id, error=str(e))
         return StripePaymentOutcome(StripePaymentResult.UNKNOWN, "Invalid payment intent.", "invalid_payment_intent").as_tuple()
-    except (APIConnectionError, RateLimitError) as e:
+    except PaymentTemporaryError as e:
         return _temporary("retrieve_payment_intent", e).as_tuple()
-    except (AuthenticationError, StripePermissionError) as e:
+    except PaymentAuthError as e:
         return _hard_auth("retrieve_payment_intent", e).as_tuple()
-    except StripeError as e:
+    except PaymentError as e:
         return _generic("retrieve_payment_intent", e).as_tuple()
 
     pi_status = (pi.get("status") or "").lower()
@@ -1274,7 +1265,7 @@ def checkout_create_order(request):
     log_event(logger, logging.INFO, "checkout.order.create.created",
               order_id=order.id, customer_id=customer.id, draft_id=draft.id if draft else None, item_count=len(items), total=str(order.total))
 
-    return reverse('hr_shop:checkout_pay', args=[order.id])
+    return hx_load_modal(reverse("hr_shop:checkout_pay", args=[order.id]))
 
 
 @require_GET
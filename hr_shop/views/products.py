@@ -13,6 +13,7 @@ from django.views.decorators.http import require_GET, require_POST
 
 from hr_common.utils.http.htmx import hx_trigger
 from hr_common.utils.unified_logging import log_event
+from hr_core.fragment_cache import cached_fragment
 from hr_shop.models import Product
 from hr_shop.utils.image_resolver import (
     PreviewImagePayload,
@@ -54,6 +55,7 @@ def _parse_selected_value_ids_from_post(request: HttpRequest) -> list[int]:
 
 
 @require_GET
+@cached_fragment("shop.product", private=True)
 def get_product_modal_partial(request: HttpRequest, product_slug: str):
     """
     Returns modal HTML intended to swap into #modal-content.
@@ -74,7 +76,7 @@ def get_product_modal_partial(request: HttpRequest, product_slug: str):
             opt.default_value_id = mapping.get(opt.id)
 
     variants_data: list[dict[str, object]] = []
-    for v in product.variants.filter(active=True).prefetch_related("option_values", "image"):
+    for v in product.variants.filter(active=True).select_related("image").prefetch_related("option_values"):
         img_payload = resolve_variant_preview_image_payload(v, fallback_alt=product.name)
 
         variants_data.append({
@@ -82,7 +84,7 @@ def get_product_modal_partial(request: HttpRequest, product_slug: str):
             "slug": v.slug,
             "price": str(v.price),
             "image_url": img_payload["url"],
-            "option_value_ids": list(v.option_values.values_list("id", flat=True))
+            "option_value_ids": [ov.id for ov in v.option_values.all()]
         })
 
     context = {
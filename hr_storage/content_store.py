@@ -0,0 +1,87 @@
+# hr_storage/content_store.py
+
+import hashlib
+import logging
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+
+from hr_storage.models import MediaBlob
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _hash_and_spool(upload, spool) -> tuple[str, int]:
+    """
+    Single pass over the upload: update sha256 and copy each chunk into `spool`.
+    """
+    h = hashlib.sha256()
+    size = 0
+
+    chunks = upload.chunks(CHUNK_SIZE) if hasattr(upload, "chunks") else iter(lambda: upload.read(CHUNK_SIZE), b"")
+    for chunk in chunks:
+        h.update(chunk)
+        spool.write(chunk)
+        size += len(chunk)
+
+    spool.seek(0)
+    return h.hexdigest(), size
+
+
+def content_addressed_name(field_file, sha: str) -> str:
+    """
+    Deterministic storage name for `sha`, honouring the field's upload_to.
+    Keeps the original (lowercased) extension so the variant pipeline can
+    still find sources by stem.
+    """
+    _, ext = os.path.splitext(field_file.name or "")
+    ext = (ext or "").lower() or ".bin"
+    return field_file.field.generate_filename(field_file.instance, f"{sha}{ext}")
+
+
+def store_content_addressed(field_file) -> bool:
+    """
+    Store a newly assigned upload under <upload_to>/<sha256><ext>, or reuse the
+    existing object when those bytes were stored before.
+
+    The upload is read once: hashed while it is spooled to a temp file, and
+    that temp file is what gets handed to storage on a miss. Existence is
+    checked against MediaBlob, so re-uploading the same artwork costs no
+    storage I/O. Returns True if a new object was written.
+    """
+    if not field_file:
+        return False
+
+    # Only newly assigned uploads; committed names are already in storage.
+    if getattr(field_file, "_committed", True):
+        return False
+
+    try:
+        upload = field_file.file
+    except Exception:
+        return False
+
+    max_memory = getattr(settings, "FILE_UPLOAD_MAX_MEMORY_SIZE", 2621440)
+    created = False
+
+    with tempfile.SpooledTemporaryFile(max_size=max_memory) as spool:
+        sha, size = _hash_and_spool(upload, spool)
+        name = content_addressed_name(field_file, sha)
+
+        if not MediaBlob.objects.filter(name=name).exists():
+            storage = field_file.storage
+            # Objects stored before the index existed: adopt rather than suffix-duplicate.
+            if not storage.exists(name):
+                name = storage.save(name, File(spool, name=name))
+                created = True
+            MediaBlob.objects.get_or_create(name=name, defaults={"sha256": sha, "size": size})
+
+    logger.debug("media_store.resolved", extra={"name": name, "created": created})
+
+    field_file.name = name
+    field_file._committed = True
+    return created
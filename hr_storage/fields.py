@@ -3,6 +3,7 @@
 from django.conf import settings
 from django.db import models
 
+from hr_storage.content_store import store_content_addressed
 from hr_storage.storage_backends import PrivateMediaStorage
 
 
@@ -11,3 +12,14 @@ class PrivateFileField(models.FileField):
         if hasattr(settings, "AWS_PRIVATE_MEDIA_LOCATION"):
             storage = PrivateMediaStorage()
         super().__init__(verbose_name, name, upload_to, storage, **kwargs)
+
+
+class ContentAddressedImageField(models.ImageField):
+    """
+    ImageField that stores uploads by content hash (see hr_storage.content_store).
+    Duplicate uploads resolve to the existing object instead of a suffixed copy.
+    """
+
+    def pre_save(self, model_instance, add):
+        store_content_addressed(getattr(model_instance, self.attname))
+        return super().pre_save(model_instance, add)
@@ -0,0 +1,21 @@
+# hr_storage/models.py
+
+from django.db import models
+
+
+class MediaBlob(models.Model):
+    """
+    Local index of content-addressed uploads.
+
+    One row per stored object, keyed by its deterministic storage name
+    (<upload_to>/<sha256><ext>). Lets the upload path answer "do we already
+    have these bytes?" without a storage round trip (HEAD on S3).
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return self.name
@@ -0,0 +1 @@
+# hr_storage/tests/__init__.py
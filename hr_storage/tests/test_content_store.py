@@ -0,0 +1,55 @@
+# hr_storage/tests/test_content_store.py
+
+import hashlib
+import tempfile
+from unittest.mock import patch
+
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from hr_shop.models import ProductImage
+from hr_storage.models import MediaBlob
+
+PAYLOAD = b"not-really-a-png-but-bytes-are-bytes"
+
+
+def _upload(name="Shirt Front.PNG", content=PAYLOAD):
+    return SimpleUploadedFile(name, content, content_type="image/png")
+
+
+class ContentAddressedStoreTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+        self.addCleanup(self.override.disable)
+
+    def test_upload_is_stored_under_content_hash(self):
+        img = ProductImage.objects.create(image=_upload())
+
+        sha = hashlib.sha256(PAYLOAD).hexdigest()
+        self.assertEqual(img.image.name, f"variants/{sha}.png")
+        self.assertTrue(img.image.storage.exists(img.image.name))
+        self.assertTrue(MediaBlob.objects.filter(name=img.image.name, sha256=sha, size=len(PAYLOAD)).exists())
+
+    def test_reupload_of_same_bytes_costs_no_storage_io(self):
+        first = ProductImage.objects.create(image=_upload())
+
+        with patch.object(FileSystemStorage, "exists") as exists, patch.object(FileSystemStorage, "save") as save:
+            second = ProductImage.objects.create(image=_upload(name="renamed.png"))
+
+        exists.assert_not_called()
+        save.assert_not_called()
+        self.assertEqual(second.image.name, first.image.name)
+        self.assertEqual(MediaBlob.objects.count(), 1)
+
+    def test_unindexed_existing_object_is_adopted_not_duplicated(self):
+        first = ProductImage.objects.create(image=_upload())
+        MediaBlob.objects.all().delete()
+
+        second = ProductImage.objects.create(image=_upload())
+
+        self.assertEqual(second.image.name, first.image.name)
+        self.assertEqual(MediaBlob.objects.count(), 1)
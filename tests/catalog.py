@@ -0,0 +1,79 @@
+# tests/catalog.py
+
+# Bulk-seeded catalog for query-budget tests. Sized so per-row query bugs
+# (N+1 in loops, per-item template lookups) dominate the query count instead
+# of hiding behind a handful of fixtures. Uses bulk_create throughout, so
+# slugs are set explicitly (Model.save() is what normally derives them).
+
+from dataclasses import dataclass
+from datetime import time, timedelta
+
+from django.utils import timezone
+
+from hr_bulletin.models import Post
+from hr_live.models import Act, Show, Venue
+from hr_shop.models import Product, ProductImage, ProductVariant
+
+PRODUCTS = 300
+VARIANTS_PER_PRODUCT = 3
+VENUES = 25
+ACTS = 40
+SHOWS = 400
+POSTS = 200
+
+
+@dataclass
+class Catalog:
+    products: list
+    variants: list
+    shows: list
+    posts: list
+
+
+def seed_large_catalog() -> Catalog:
+    images = ProductImage.objects.bulk_create(ProductImage(image=f"variants/seed-{i}.jpg", alt_text=f"Seed {i}") for i in range(PRODUCTS))
+
+    products = Product.objects.bulk_create(
+        Product(name=f"Seed Product {i}", slug=f"seed-product-{i}", description="Seeded for query budgets.", active=True) for i in range(PRODUCTS)
+    )
+    variants = ProductVariant.objects.bulk_create(
+        ProductVariant(
+            product=product,
+            sku=f"SEED-{p:04d}-{v}",
+            slug=f"seed-product-{p}-v{v}",
+            name=f"Variant {v}",
+            price="24.00",
+            is_display_variant=(v == 0),
+            image=images[p],
+            active=True,
+        )
+        for p, product in enumerate(products)
+        for v in range(VARIANTS_PER_PRODUCT)
+    )
+
+    venues = Venue.objects.bulk_create(Venue(name=f"Seed Venue {i}", slug=f"seed-venue-{i}") for i in range(VENUES))
+    acts = Act.objects.bulk_create(Act(name=f"Seed Act {i}") for i in range(ACTS))
+
+    today = timezone.localdate()
+    shows = Show.objects.bulk_create(
+        Show(
+            venue=venues[i % VENUES],
+            date=today + timedelta(days=i - SHOWS // 2),
+            time=time(20, 0),
+            slug=f"seed-show-{i}",
+            status="published",
+        )
+        for i in range(SHOWS)
+    )
+    Lineup = Show.lineup.through
+    Lineup.objects.bulk_create(
+        Lineup(show_id=show.pk, act_id=acts[(i + k) % ACTS].pk) for i, show in enumerate(shows) for k in range(3)
+    )
+
+    now = timezone.now()
+    posts = Post.objects.bulk_create(
+        Post(title=f"Seed Post {i}", slug=f"seed-post-{i}", body="Seeded body. " * 30, status="published", publish_at=now - timedelta(hours=i))
+        for i in range(POSTS)
+    )
+
+    return Catalog(products=products, variants=variants, shows=shows, posts=posts)
@@ -3,6 +3,9 @@
 
 import pytest
 
+from tests.catalog import seed_large_catalog
+from tests.query_budget import query_budget as _query_budget
+
 
 @pytest.fixture(autouse=True)
 def mock_secrets(monkeypatch):
@@ -24,3 +27,21 @@ def test_settings(settings):
     """Ensure dangerous external integrations are always disabled in tests."""
     settings.STRIPE_LIVE_MODE = False
     settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+
+@pytest.fixture
+def large_catalog(db):
+    """Hundreds of products/variants, shows and posts (see tests/catalog.py)."""
+    return seed_large_catalog()
+
+
+@pytest.fixture
+def query_budget(db):
+    """
+    Context manager checking the queries run inside it against
+    tests/query_budgets.json:
+
+        with query_budget("shop.product_modal"):
+            client.get(url)
+    """
+    return _query_budget
@@ -0,0 +1,110 @@
+# tests/query_budget.py
+
+# Query-budget harness for hot views.
+#
+# Budgets live in tests/query_budgets.json (committed, versioned). A check
+# fails when a view runs more queries than its budget, or when one SQL
+# statement shape repeats DUPLICATE_THRESHOLD+ times (the N+1 signature)
+# unless that shape is listed under the view's "allow_duplicates".
+#
+# After an intentional change, re-record with:
+#   UPDATE_QUERY_BUDGETS=1 python -m pytest tests/test_query_budgets.py
+
+import json
+import os
+import re
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+BUDGETS_PATH = Path(__file__).with_name("query_budgets.json")
+BUDGETS_VERSION = 1
+DUPLICATE_THRESHOLD = 3
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN \((?:\s*(?:\?|%s)\s*,?)+\)", re.IGNORECASE)
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Collapse literals and IN-lists so the same statement issued for different
+    rows compares equal.
+    """
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    return _IN_LIST_RE.sub("IN (...)", sql)
+
+
+@dataclass
+class QueryReport:
+    name: str
+    statements: list[str] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def duplicates(self, threshold: int = DUPLICATE_THRESHOLD) -> dict[str, int]:
+        shapes = Counter(normalize_sql(sql) for sql in self.statements)
+        return {shape: n for shape, n in shapes.items() if n >= threshold}
+
+
+def load_budgets() -> dict:
+    data = json.loads(BUDGETS_PATH.read_text(encoding="utf-8"))
+    if data.get("version") != BUDGETS_VERSION:
+        raise AssertionError(f"{BUDGETS_PATH.name} is version {data.get('version')}, expected {BUDGETS_VERSION}; re-record with UPDATE_QUERY_BUDGETS=1")
+    return data
+
+
+def _record_budget(report: QueryReport) -> None:
+    try:
+        data = load_budgets()
+    except (FileNotFoundError, AssertionError):
+        data = {"version": BUDGETS_VERSION, "budgets": {}}
+    entry = data["budgets"].setdefault(report.name, {})
+    entry["queries"] = report.count
+    entry.setdefault("allow_duplicates", [])
+    data["budgets"] = dict(sorted(data["budgets"].items()))
+    BUDGETS_PATH.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def check_budget(report: QueryReport) -> None:
+    if os.environ.get("UPDATE_QUERY_BUDGETS"):
+        _record_budget(report)
+        return
+
+    budget = load_budgets()["budgets"].get(report.name)
+    if budget is None:
+        pytest.fail(f"No query budget recorded for {report.name!r}; run with UPDATE_QUERY_BUDGETS=1")
+
+    problems = []
+    if report.count > budget["queries"]:
+        problems.append(f"{report.count} queries, budget is {budget['queries']}")
+
+    allowed = {normalize_sql(s) for s in budget.get("allow_duplicates", [])}
+    for shape, n in report.duplicates().items():
+        if shape not in allowed:
+            problems.append(f"possible N+1: statement ran {n}x: {shape[:300]}")
+
+    if problems:
+        listing = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(report.statements, start=1))
+        pytest.fail(f"Query budget exceeded for {report.name!r}:\n- " + "\n- ".join(problems) + f"\nQueries:\n{listing}")
+
+
+@contextmanager
+def query_budget(name: str):
+    """
+    Record every query run inside the block and check it against the
+    budget stored for `name`.
+    """
+    report = QueryReport(name)
+    with CaptureQueriesContext(connection) as ctx:
+        yield report
+    report.statements = [q["sql"] for q in ctx.captured_queries]
+    check_budget(report)
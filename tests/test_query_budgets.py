@@ -0,0 +1,80 @@
+# tests/test_query_budgets.py
+
+# Query budgets for the hot public views, measured against a large seeded
+# catalog (tests/catalog.py) so per-row queries show up as budget overruns or
+# duplicate-statement failures. Budgets: tests/query_budgets.json.
+
+import pytest
+from django.core.cache import cache
+
+from hr_core.srcset_registry import registry
+from hr_shop.cart import CART_SESSION_KEY
+
+HTMX = {"HTTP_HX_REQUEST": "true"}
+
+
+@pytest.fixture(autouse=True)
+def cold_caches(settings):
+    # No collectstatic in tests: resolve static URLs without the manifest.
+    settings.STORAGES = {**settings.STORAGES, "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}}
+    # Budgets describe a cold process; warm caches would hide regressions.
+    cache.clear()
+    registry.clear()
+    yield
+    registry.clear()
+
+
+def fill_cart(client, variants, n=5):
+    session = client.session
+    session[CART_SESSION_KEY] = {str(v.pk): {"quantity": 1, "price": str(v.price)} for v in variants[:n]}
+    session.save()
+
+
+class TestPublicPages:
+    def test_index(self, client, large_catalog, query_budget):
+        with query_budget("site.index"):
+            resp = client.get("/")
+        assert resp.status_code == 200
+
+    def test_bulletin_feed(self, client, large_catalog, query_budget):
+        with query_budget("bulletin.list"):
+            resp = client.get("/bulletin/")
+        assert resp.status_code == 200
+
+    def test_bulletin_feed_partial(self, client, large_catalog, query_budget):
+        with query_budget("bulletin.list_partial"):
+            resp = client.get("/bulletin/list/?page=2", **HTMX)
+        assert resp.status_code == 200
+
+    def test_live_upcoming(self, client, large_catalog, query_budget):
+        with query_budget("live.upcoming"):
+            resp = client.get("/live/", **HTMX)
+        assert resp.status_code == 200
+
+    def test_live_past(self, client, large_catalog, query_budget):
+        with query_budget("live.past"):
+            resp = client.get("/live/past/", **HTMX)
+        assert resp.status_code == 200
+
+
+class TestShop:
+    def test_product_modal(self, client, large_catalog, query_budget):
+        product = large_catalog.products[150]
+
+        with query_budget("shop.product_modal"):
+            resp = client.get(f"/shop/{product.slug}/modal/", **HTMX)
+        assert resp.status_code == 200
+
+    def test_cart_modal(self, client, large_catalog, query_budget):
+        fill_cart(client, large_catalog.variants)
+
+        with query_budget("shop.cart_modal"):
+            resp = client.get("/shop/cart/", **HTMX)
+        assert resp.status_code == 200
+
+    def test_checkout_details(self, client, large_catalog, query_budget):
+        fill_cart(client, large_catalog.variants)
+
+        with query_budget("shop.checkout_details"):
+            resp = client.get("/shop/checkout/details/", **HTMX)
+        assert resp.status_code == 200